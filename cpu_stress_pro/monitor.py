@@ -51,12 +51,24 @@ connection_manager = import_module_from_file('connection_manager', src_dir / 'co
 stress_monitor = import_module_from_file('stress_monitor', src_dir / 'stress_monitor.py')
 temperature_monitor = import_module_from_file('temperature_monitor', Path(__file__).parent / 'temperature_monitor.py')
 logger_manager = import_module_from_file('logger_manager', src_dir / 'logger_manager.py')
+campaign = import_module_from_file('campaign', src_dir / 'campaign.py')
 
 # 从模块中获取类
 Config = config_loader.Config
 ConnectionFactory = connection_manager.ConnectionFactory
 StressTestMonitor = stress_monitor.StressTestMonitor
 TemperatureMonitor = temperature_monitor.TemperatureMonitor
+StressCampaign = campaign.StressCampaign
+
+
+def describe_target(config) -> str:
+    """连接目标描述"""
+    if config.connection_type == 'multi_ssh':
+        hosts = ', '.join(f"{ssh.hostname}:{ssh.port}" for ssh in config.ssh_list)
+        return f"{len(config.ssh_list)} 台设备 ({hosts})"
+    if config.connection_type == 'serial':
+        return f"串口 {config.serial.port} @ {config.serial.baudrate}"
+    return f"{config.ssh.username}@{config.ssh.hostname}:{config.ssh.port}"
 
 
 def run_stress_test(config_file='config.json'):
@@ -71,9 +83,14 @@ def run_stress_test(config_file='config.json'):
     output_dir = config.output.get_output_dir()
     log_manager = logger_manager.LoggerManager(output_dir)
     
-    print_realtime(f"连接目标: {config.ssh.username}@{config.ssh.hostname}:{config.ssh.port}")
+    print_realtime(f"连接目标: {describe_target(config)}")
     print_realtime(f"输出目录: {output_dir}")
     
+    # 多台设备：每台设备独立连接、并行测试
+    if config.connection_type == 'multi_ssh':
+        run_campaign(config, log_manager)
+        return
+    
     # 创建连接
     try:
         connection = ConnectionFactory.create_connection(
@@ -124,6 +141,13 @@ def run_stress_test(config_file='config.json'):
         print("\n测试完成")
 
 
+def run_campaign(config, log_manager):
+    """多设备并行压力测试"""
+    stress_campaign = StressCampaign(config, log_manager)
+    stress_campaign.run()
+    print_realtime("\n测试完成")
+
+
 def run_temperature_monitor(config_file='config.json'):
     """运行温度监控"""
     config = Config.from_file(config_file)
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多设备并行压力测试
+按 ssh_list 为每台设备建立独立的连接和监控器并行测试，
+实时看板汇总各设备进度，结束后生成按性能和峰值温度排名的设备报告
+"""
+
+import re
+import sys
+import csv
+import json
+import logging
+import threading
+import unicodedata
+from pathlib import Path
+from datetime import datetime
+from typing import Optional, Dict, List, Any, Tuple
+from dataclasses import dataclass, asdict, replace
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import importlib.util
+
+# 动态导入模块
+def import_module_from_file(module_name, file_path):
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# 导入所需模块
+current_dir = Path(__file__).parent
+config_loader = import_module_from_file('config_loader', current_dir / 'config_loader.py')
+connection_manager = import_module_from_file('connection_manager', current_dir / 'connection_manager.py')
+stress_monitor = import_module_from_file('stress_monitor', current_dir / 'stress_monitor.py')
+
+# 从模块中获取类
+Config = config_loader.Config
+SSHConfig = config_loader.SSHConfig
+SSHConnection = connection_manager.SSHConnection
+StressTestMonitor = stress_monitor.StressTestMonitor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HostRun:
+    """单台设备的测试状态"""
+    name: str
+    ssh: SSHConfig
+    output_dir: Path
+    state: str = "等待中"
+    error: str = ""
+    monitor: Optional[Any] = None  # StressTestMonitor
+    
+    def stats(self) -> Dict[str, Any]:
+        """当前统计（看板和设备报告共用）"""
+        results = list(self.monitor.test_results) if self.monitor else []
+        ops = [r.bogo_ops_per_sec for r in results if r.status == 'success']
+        temps = [r.peak_temperature for r in results if r.peak_temperature > 0]
+        current_temp = self.monitor.thermal_sampler.latest() if self.monitor else 0.0
+        return {
+            "tests": self.monitor.test_count if self.monitor else 0,
+            "successful": self.monitor.successful_tests if self.monitor else 0,
+            "failed": self.monitor.failed_tests if self.monitor else 0,
+            "last_ops": ops[-1] if ops else 0.0,
+            "avg_ops": sum(ops) / len(ops) if ops else 0.0,
+            "best_ops": max(ops) if ops else 0.0,
+            "last_temp": current_temp or (results[-1].post_temperature if results else 0.0),
+            "avg_temp": sum(temps) / len(temps) if temps else 0.0,
+            "peak_temp": max(temps) if temps else 0.0,
+        }
+
+
+def _pad(text: str, width: int, right: bool = False) -> str:
+    """按显示宽度补齐（中文占两格）"""
+    text = str(text)
+    shown = sum(2 if unicodedata.east_asian_width(c) in 'WF' else 1 for c in text)
+    fill = ' ' * max(width - shown, 0)
+    return fill + text if right else text + fill
+
+
+class StressCampaign:
+    """多设备并行压力测试"""
+    
+    COLUMNS = [("设备", 18, False), ("状态", 8, False), ("测试", 6, True), ("成功", 6, True),
+               ("失败", 6, True), ("最新ops/s", 12, True), ("平均ops/s", 12, True),
+               ("温度", 8, True), ("最高温度", 10, True)]
+    
+    def __init__(self, config: Config, log_manager=None, refresh: float = 2.0):
+        """
+        config: 配置对象（使用其中的 ssh_list）
+        log_manager: LoggerManager，提供时每台设备单独记录SSH控制台日志
+        refresh: 看板刷新间隔(秒)
+        """
+        self.config = config
+        self.log_manager = log_manager
+        self.refresh = refresh
+        self.output_dir = config.output.get_output_dir()
+        self.hosts = [HostRun(name, ssh, self.output_dir / name)
+                      for name, ssh in self._host_names(config.ssh_list)]
+        self._stop_event = threading.Event()
+        self._start_time: Optional[datetime] = None
+    
+    @staticmethod
+    def _host_names(ssh_list: List[SSHConfig]) -> List[Tuple[str, SSHConfig]]:
+        """为每台设备生成唯一的目录名：主机名，重名时加端口或序号"""
+        names = []
+        for i, ssh in enumerate(ssh_list):
+            name = re.sub(r'[^\w.-]', '_', ssh.hostname) or f"host{i+1}"
+            if any(n == name for n, _ in names) or \
+               sum(s.hostname == ssh.hostname for s in ssh_list) > 1:
+                name = f"{name}_{ssh.port}"
+            if any(n == name for n, _ in names):
+                name = f"{name}_{i+1}"
+            names.append((name, ssh))
+        return names
+    
+    def _host_config(self, host: HostRun) -> Config:
+        """单台设备的配置：只连接这台设备，结果写入它自己的目录"""
+        output = replace(self.config.output, base_dir=str(host.output_dir), create_timestamp_dir=False)
+        return replace(self.config, connection_type='ssh', ssh=host.ssh, ssh_list=[], output=output)
+    
+    def stop(self):
+        """请求所有设备停止，各设备当前这一轮测试结束后退出"""
+        self._stop_event.set()
+        for host in self.hosts:
+            if host.monitor:
+                host.monitor.request_stop()
+    
+    def run(self) -> List[Dict[str, Any]]:
+        """并行运行所有设备的测试，返回设备报告"""
+        if not self.hosts:
+            logger.error("ssh_list 为空，没有可测试的设备")
+            return []
+        
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._start_time = datetime.now()
+        logger.info(f"开始多设备测试: {len(self.hosts)} 台设备，输出目录 {self.output_dir}")
+        
+        pool = ThreadPoolExecutor(max_workers=len(self.hosts), thread_name_prefix='campaign')
+        futures = [pool.submit(self._run_host, host) for host in self.hosts]
+        try:
+            while not all(f.done() for f in futures):
+                self.show_dashboard()
+                wait(futures, timeout=self.refresh)
+        except KeyboardInterrupt:
+            print("\n\n收到停止信号，等待各设备当前测试结束...", flush=True)
+            self.stop()
+            wait(futures)
+        finally:
+            pool.shutdown(wait=False)
+        
+        self.show_dashboard()
+        return self.fleet_report()
+    
+    def _run_host(self, host: HostRun):
+        """单台设备的完整测试流程（工作线程）"""
+        config = self._host_config(host)
+        host.state = "连接中"
+        connection = SSHConnection(**asdict(host.ssh))
+        try:
+            connected = connection.connect()
+            error = "" if connected else f"无法连接 {host.ssh.username}@{host.ssh.hostname}:{host.ssh.port}"
+        except Exception as e:
+            connected, error = False, str(e)
+        if not connected:
+            host.state = "连接失败"
+            host.error = error
+            logger.error(f"[{host.name}] 连接失败: {error}")
+            return
+        
+        if self.log_manager:
+            connection.setup_console_log(self.log_manager.get_console_logger(host.name))
+        
+        monitor = None
+        try:
+            monitor = StressTestMonitor(config, connection, console=False)
+            host.monitor = monitor
+            if self._stop_event.is_set():
+                monitor.request_stop()
+            
+            if not monitor.start():
+                host.state = "启动失败"
+                host.error = "SSH连接未建立"
+                return
+            
+            host.state = "准备中"
+            monitor.check_environment()
+            if config.test.enter_docker and not monitor.enter_docker_if_needed():
+                host.state = "准备失败"
+                host.error = "无法进入Docker容器"
+                return
+            if config.test.install_stress_ng and not monitor.check_and_install_stress_ng():
+                host.state = "准备失败"
+                host.error = "stress-ng不可用"
+                return
+            
+            host.state = "测试中"
+            monitor.run_continuous_tests()
+            host.state = "已停止" if self._stop_event.is_set() else "已完成"
+        except Exception as e:
+            host.state = "异常"
+            host.error = str(e)
+            logger.error(f"[{host.name}] 测试异常: {e}", exc_info=True)
+        finally:
+            if monitor:
+                monitor.stop()
+                monitor.generate_report()
+            connection.disconnect()
+            logger.info(f"[{host.name}] {host.state}")
+    
+    def render_dashboard(self) -> str:
+        """汇总看板文本"""
+        elapsed = datetime.now() - self._start_time if self._start_time else None
+        active = sum(host.state in ("连接中", "准备中", "测试中") for host in self.hosts)
+        width = sum(w for _, w, _ in self.COLUMNS) + len(self.COLUMNS) - 1
+        
+        lines = [
+            "=" * width,
+            f"多设备压力测试  {datetime.now().strftime('%H:%M:%S')}  "
+            f"已运行 {str(elapsed).split('.')[0] if elapsed else '-'}  "
+            f"运行中 {active}/{len(self.hosts)}",
+            "-" * width,
+            ' '.join(_pad(title, w, right) for title, w, right in self.COLUMNS),
+        ]
+        
+        total_tests = total_ok = total_failed = 0
+        fleet_ops = 0.0
+        hottest: Tuple[float, str] = (0.0, "")
+        for host in self.hosts:
+            s = host.stats()
+            total_tests += s["tests"]
+            total_ok += s["successful"]
+            total_failed += s["failed"]
+            fleet_ops += s["last_ops"]
+            hottest = max(hottest, (s["peak_temp"], host.name))
+            cells = [host.name, host.state, s["tests"], s["successful"], s["failed"],
+                     f"{s['last_ops']:.2f}", f"{s['avg_ops']:.2f}",
+                     f"{s['last_temp']:.1f}", f"{s['peak_temp']:.1f}"]
+            lines.append(' '.join(_pad(cell, w, right) for cell, (_, w, right) in zip(cells, self.COLUMNS)))
+            if host.error:
+                lines.append(f"    {host.error}")
+        
+        lines.append("-" * width)
+        summary = (f"合计: 测试 {total_tests} | 成功 {total_ok} | 失败 {total_failed} | "
+                   f"总性能 {fleet_ops:.2f} ops/s")
+        if hottest[0] > 0:
+            summary += f" | 最高温度 {hottest[0]:.1f}°C ({hottest[1]})"
+        lines.append(summary)
+        lines.append("按 Ctrl+C 停止测试并生成报告")
+        return '\n'.join(lines)
+    
+    def show_dashboard(self):
+        """刷新看板（终端中原地重绘）"""
+        if sys.stdout.isatty():
+            print("\x1b[2J\x1b[H", end="")
+        print(self.render_dashboard(), flush=True)
+    
+    def fleet_report(self) -> List[Dict[str, Any]]:
+        """按平均性能和峰值温度给设备排名，保存CSV/JSON并打印"""
+        stats = {host.name: host.stats() for host in self.hosts}
+        
+        # 性能从高到低，峰值温度从低到高；没有数据的设备不参与排名
+        by_perf = sorted((h for h in self.hosts if stats[h.name]["successful"] > 0),
+                         key=lambda h: stats[h.name]["avg_ops"], reverse=True)
+        by_temp = sorted((h for h in self.hosts if stats[h.name]["peak_temp"] > 0),
+                         key=lambda h: stats[h.name]["peak_temp"])
+        perf_rank = {h.name: i + 1 for i, h in enumerate(by_perf)}
+        temp_rank = {h.name: i + 1 for i, h in enumerate(by_temp)}
+        
+        ordered = by_perf + [h for h in self.hosts if h.name not in perf_rank]
+        rows = []
+        for host in ordered:
+            s = stats[host.name]
+            rows.append({
+                "性能排名": perf_rank.get(host.name, "-"),
+                "温度排名": temp_rank.get(host.name, "-"),
+                "设备": host.name,
+                "主机": f"{host.ssh.hostname}:{host.ssh.port}",
+                "状态": host.state,
+                "测试次数": s["tests"],
+                "成功次数": s["successful"],
+                "失败次数": s["failed"],
+                "平均性能(ops/s)": round(s["avg_ops"], 2),
+                "最高性能(ops/s)": round(s["best_ops"], 2),
+                "峰值温度(°C)": round(s["peak_temp"], 1),
+                "平均温度(°C)": round(s["avg_temp"], 1),
+                "错误": host.error,
+                "输出目录": str(host.output_dir),
+            })
+        
+        self._save_fleet_report(rows)
+        self._print_fleet_report(rows)
+        return rows
+    
+    def _save_fleet_report(self, rows: List[Dict[str, Any]]):
+        """保存设备报告"""
+        csv_file = self.output_dir / "fleet_report.csv"
+        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        
+        summary = {
+            "测试时间": (self._start_time or datetime.now()).strftime("%Y-%m-%d %H:%M:%S"),
+            "结束时间": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "设备数": len(self.hosts),
+            "测试配置": {
+                "测试时长": f"{self.config.test.duration_minutes or '无限制'}分钟",
+                "测试间隔": f"{self.config.test.interval_seconds}秒",
+                "最大测试数": self.config.test.max_tests,
+                "单次时长": f"{self.config.test.timeout_seconds}秒"
+            },
+            "设备排名": rows
+        }
+        summary_file = self.output_dir / "fleet_summary.json"
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        
+        logger.info(f"设备报告已保存: {csv_file}, {summary_file}")
+    
+    def _print_fleet_report(self, rows: List[Dict[str, Any]]):
+        """打印设备报告"""
+        print(f"\n{'='*78}")
+        print("设备报告（按平均性能排名；温度排名 1 为峰值温度最低）")
+        print("="*78)
+        print(' '.join([_pad("性能", 5), _pad("温度", 5), _pad("设备", 18), _pad("状态", 8),
+                        _pad("成功/测试", 10, True), _pad("平均ops/s", 12, True),
+                        _pad("最高ops/s", 12, True), _pad("峰值温度", 9, True)]))
+        for row in rows:
+            print(' '.join([
+                _pad(row["性能排名"], 5), _pad(row["温度排名"], 5), _pad(row["设备"], 18),
+                _pad(row["状态"], 8), _pad(f"{row['成功次数']}/{row['测试次数']}", 10, True),
+                _pad(f"{row['平均性能(ops/s)']:.2f}", 12, True),
+                _pad(f"{row['最高性能(ops/s)']:.2f}", 12, True),
+                _pad(f"{row['峰值温度(°C)']:.1f}", 9, True),
+            ]))
+        print(f"\n输出目录: {self.output_dir}")
+        print("="*78, flush=True)
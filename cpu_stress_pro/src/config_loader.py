@@ -27,6 +27,8 @@ class SSHConfig:
     password: Optional[str] = None
     port: int = 22
     key_file: Optional[str] = None
+    exec_mode: bool = False  # 命令走独立exec通道，可并发
+    max_channels: int = 4
 
 
 @dataclass
@@ -46,6 +48,7 @@ class MonitorConfig:
     temperature_interval: int = 10
     temperature_duration: Optional[int] = None
     enable_temperature: bool = True
+    sample_interval: float = 1.0  # 压力测试期间实时温度采样间隔(秒)
 
 
 @dataclass
@@ -4,8 +4,13 @@ import serial
 import paramiko
 import time
 import threading
+import re
+import uuid
+import codecs
+import select
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any, Union, TextIO
+from typing import Optional, List, Dict, Any, Union, TextIO, Tuple, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dataclasses import dataclass
 from contextlib import contextmanager
 import logging
@@ -14,12 +19,36 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# 终端控制序列（颜色、bracketed paste等）
+ANSI_ESCAPE = re.compile(r'\x1b\[[?0-9;]*[a-zA-Z]')
+
 
 class ConnectionError(Exception):
     """连接异常基类"""
     pass
 
 
+@dataclass
+class CommandResult:
+    """exec通道命令的执行结果"""
+    command: str
+    stdout: str = ""
+    stderr: str = ""
+    exit_status: Optional[int] = None  # 超时或失败时为None
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    
+    @property
+    def ok(self) -> bool:
+        """命令正常结束且退出码为0"""
+        return self.exit_status == 0
+    
+    @property
+    def timed_out(self) -> bool:
+        """命令在超时前未结束"""
+        return self.exit_status is None and self.error is None
+
+
 class BaseConnection(ABC):
     """连接基类 - 使用上下文管理器模式"""
     
@@ -110,6 +139,10 @@ class BaseConnection(ABC):
             return self.read_output(read_timeout)
         return ""
     
+    def switch_shell(self, command: str, wait_time: float = 1, read_timeout: float = 2) -> str:
+        """执行切换shell的命令（如 docker exec -it ... /bin/bash），返回期间的输出"""
+        return self.execute_command(command, wait_time, read_timeout)
+    
     def execute_command_with_progress(self, command: str, wait_time: float = 1, read_timeout: float = 2, progress_callback=None) -> str:
         """执行命令并返回输出，支持进度回调"""
         if self.send_command(command, wait_time):
@@ -222,15 +255,26 @@ class SSHConnection(BaseConnection):
     """SSH连接类 - 优化实现"""
     
     def __init__(self, hostname: str, username: str, password: Optional[str] = None,
-                 port: int = 22, key_file: Optional[str] = None):
+                 port: int = 22, key_file: Optional[str] = None,
+                 exec_mode: bool = False, max_channels: int = 4):
+        """
+        exec_mode: execute_command 改走独立的exec通道（见 run），可多线程并发调用
+        max_channels: 同时打开的exec通道上限（sshd默认MaxSessions为10，含交互shell）
+        """
         super().__init__()
         self.hostname = hostname
         self.username = username
         self.password = password
         self.port = port
         self.key_file = key_file
+        self.exec_mode = exec_mode
+        self.max_channels = max_channels
         self.client: Optional[paramiko.SSHClient] = None
         self.shell: Optional[paramiko.Channel] = None
+        self.last_exit_code: Optional[int] = None
+        self._shell_lock = threading.Lock()
+        self._channel_slots = threading.BoundedSemaphore(max_channels)
+        self._streams: set = set()
         
     def connect(self) -> bool:
         """建立SSH连接"""
@@ -255,11 +299,12 @@ class SSHConnection(BaseConnection):
                 raise ConnectionError("需要提供密码或密钥文件")
             
             self.client.connect(**connect_params)
-            self.shell = self.client.invoke_shell()
+            # 终端足够宽，避免长命令回显被折行
+            self.shell = self.client.invoke_shell(width=1000)
             self.shell.setblocking(0)
             
-            # 清空初始输出
-            time.sleep(1)
+            # 等shell就绪并吞掉登录信息（收到结束标记即返回）
+            self.execute_command(":", wait_time=0, read_timeout=5)
             self._clear_buffer()
             
             logger.info(f"SSH connection successful: {self.username}@{self.hostname}:{self.port}")
@@ -313,6 +358,203 @@ class SSHConnection(BaseConnection):
             self.log_console("RECV", output)
         return output
     
+    # 结束标记前缀。命令行里写成 "__CSP_END""_<token>"，终端回显中不会
+    # 出现完整标记，只有命令执行完、echo真正输出时才会出现。
+    # 标记单独占一行发送，不改变调用方命令的语法（cmd &、cmd; 、# 注释）
+    END_MARKER = "__CSP_END_"
+    
+    def execute_command(self, command: str, wait_time: float = 1, read_timeout: float = 2) -> str:
+        """执行命令并返回输出
+        命令后附加唯一的结束标记和退出码，收到标记立即返回；
+        wait_time + read_timeout 只是超时上限。退出码保存在 last_exit_code
+        （超时为None）。exec_mode 下改用 run()，与交互shell一样返回
+        stdout和stderr合并后的输出（stress-ng 的统计信息写在stderr）。
+        """
+        if self.exec_mode:
+            result = self.run(command, timeout=wait_time + read_timeout, combine_stderr=True)
+            self.last_exit_code = result.exit_status
+            return result.stdout.strip('\n')
+        
+        # 交互shell一次只能执行一条命令
+        with self._shell_lock:
+            return self._execute_in_shell(command, wait_time, read_timeout)
+    
+    def _execute_in_shell(self, command: str, wait_time: float, read_timeout: float) -> str:
+        """在交互shell中执行命令，等待结束标记"""
+        self.last_exit_code = None
+        if not self.shell:
+            return ""
+        
+        # 丢弃上一条超时命令的残留输出
+        self._clear_buffer()
+        token = uuid.uuid4().hex[:12]
+        try:
+            self.shell.send(f'{command}\necho "{self.END_MARKER}""{token}:$?"\n')
+        except Exception as e:
+            logger.error(f"发送命令失败: {e}")
+            return ""
+        logger.debug(f"发送命令: {command}")
+        self.log_console("SEND", command)
+        
+        start = time.time()
+        output, self.last_exit_code = self._read_until_marker(command, token, wait_time + read_timeout)
+        if self.last_exit_code is None:
+            logger.warning(f"命令 {wait_time + read_timeout:.0f} 秒内未结束: {command}")
+        else:
+            logger.debug(f"命令结束 (退出码 {self.last_exit_code}, {time.time() - start:.3f}s)")
+        
+        if output:
+            self.log_console("RECV", output)
+        return output
+    
+    def _read_until_marker(self, command: str, token: str, timeout: float) -> Tuple[str, Optional[int]]:
+        """读取到结束标记为止，返回(命令输出, 退出码)"""
+        marker = re.compile(re.escape(self.END_MARKER + token) + r':(\d+)')
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        text = ""
+        deadline = time.time() + timeout
+        
+        while True:
+            match = marker.search(text)
+            if match:
+                return self._command_output(text[:match.start()], command, token), int(match.group(1))
+            
+            remaining = deadline - time.time()
+            if remaining <= 0 or self.shell.closed:
+                return self._command_output(text, command, token), None
+            
+            # 阻塞等待数据到达，不再固定轮询
+            select.select([self.shell], [], [], remaining)
+            try:
+                while self.shell.recv_ready():
+                    text += decoder.decode(self.shell.recv(4096))
+            except Exception as e:
+                logger.debug(f"读取输出失败: {e}")
+    
+    @staticmethod
+    def _command_output(text: str, command: str, token: str) -> str:
+        """去掉命令回显、提示符和控制字符，只保留命令输出
+        标记行可能在命令运行期间被终端提前回显，所以按行剔除而不是按位置截断
+        """
+        text = ANSI_ESCAPE.sub('', text).replace('\r', '')
+        lines = [line for line in text.split('\n') if f'{token}:$?' not in line]
+        if lines and lines[0].rstrip().endswith(command.strip()):
+            lines = lines[1:]
+        return '\n'.join(lines).strip('\n')
+    
+    def switch_shell(self, command: str, wait_time: float = 1, read_timeout: float = 2) -> str:
+        """执行切换shell的命令（如 docker exec -it ... /bin/bash）
+        新shell接管终端后原shell的结束标记不会输出，所以不附加标记，
+        只发送命令并读取 read_timeout 内的输出；之后的命令在新shell中执行
+        """
+        with self._shell_lock:
+            self.last_exit_code = None
+            self._clear_buffer()
+            if not self.send_command(command, wait_time):
+                return ""
+            return ANSI_ESCAPE.sub('', self.read_output(read_timeout)).replace('\r', '')
+    
+    def run(self, command: str, timeout: float = 30, get_pty: bool = False,
+            combine_stderr: bool = False) -> CommandResult:
+        """通过独立的exec通道执行命令
+        不经过交互shell：没有提示符和回显，stdout/stderr分开（combine_stderr
+        为True时按输出顺序合并到stdout），退出码准确；
+        但也不保留shell状态（cd、环境变量、docker exec -it 进入的容器）。
+        所有通道共用一个SSH传输，多个线程可同时调用，同时打开的通道数
+        受 max_channels 限制。timeout 为总时长上限（含等待空闲通道）。
+        """
+        result = CommandResult(command)
+        start = time.time()
+        deadline = start + timeout
+        transport = self.client.get_transport() if self.client else None
+        if not transport or not transport.is_active():
+            result.error = "SSH未连接"
+            return result
+        
+        if not self._channel_slots.acquire(timeout=timeout):
+            result.error = f"{timeout:.0f} 秒内没有空闲的exec通道"
+            logger.warning(f"{result.error}: {command}")
+            return result
+        try:
+            channel = transport.open_session(timeout=max(deadline - time.time(), 0.1))
+            try:
+                if get_pty:
+                    channel.get_pty()
+                channel.set_combine_stderr(combine_stderr)
+                channel.exec_command(command)
+                logger.debug(f"exec通道执行: {command}")
+                self.log_console("SEND", command)
+                result.stdout, result.stderr, result.exit_status = self._collect(channel, deadline)
+            finally:
+                channel.close()
+        except Exception as e:
+            result.error = str(e)
+            logger.error(f"exec通道执行失败: {e}")
+        finally:
+            self._channel_slots.release()
+        
+        result.elapsed = time.time() - start
+        if result.timed_out:
+            logger.warning(f"命令 {timeout:.0f} 秒内未结束: {command}")
+        if result.stdout or result.stderr:
+            self.log_console("RECV", result.stdout + result.stderr)
+        return result
+    
+    def open_stream(self, command: str) -> Optional[paramiko.Channel]:
+        """在独立exec通道上启动持续输出的命令（如采样脚本），返回通道供调用方读取
+        通道占用一个 max_channels 名额，用完后调用 close_stream 释放
+        """
+        transport = self.client.get_transport() if self.client else None
+        if not transport or not transport.is_active():
+            return None
+        if not self._channel_slots.acquire(blocking=False):
+            logger.warning("没有空闲的exec通道")
+            return None
+        try:
+            channel = transport.open_session(timeout=10)
+            channel.exec_command(command)
+        except Exception as e:
+            self._channel_slots.release()
+            logger.error(f"打开exec通道失败: {e}")
+            return None
+        self._streams.add(channel)
+        logger.debug(f"exec通道已启动: {command[:60]}")
+        return channel
+    
+    def close_stream(self, channel: paramiko.Channel) -> None:
+        """关闭 open_stream 打开的通道"""
+        channel.close()
+        if channel in self._streams:
+            self._streams.discard(channel)
+            self._channel_slots.release()
+    
+    @staticmethod
+    def _collect(channel: paramiko.Channel, deadline: float) -> Tuple[str, str, Optional[int]]:
+        """读取exec通道的stdout/stderr直到命令退出，返回(stdout, stderr, 退出码)"""
+        out_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        err_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        stdout = stderr = ""
+        
+        while True:
+            # 先取EOF状态再读缓冲区，EOF之前的数据一定已经读到
+            eof = channel.eof_received or channel.closed
+            while channel.recv_ready():
+                stdout += out_decoder.decode(channel.recv(32768))
+            while channel.recv_stderr_ready():
+                stderr += err_decoder.decode(channel.recv_stderr(32768))
+            
+            remaining = deadline - time.time()
+            if eof:
+                # 输出已读完，只等退出码
+                if channel.status_event.wait(max(remaining, 0)):
+                    return stdout, stderr, channel.recv_exit_status()
+                return stdout, stderr, None
+            if remaining <= 0:
+                return stdout, stderr, None
+            
+            # stderr数据不会唤醒select，等待时间设上限
+            select.select([channel], [], [], min(remaining, 0.05))
+    
     def _clear_buffer(self) -> None:
         """清空缓冲区"""
         while self.shell and self.shell.recv_ready():
@@ -331,43 +573,111 @@ class SSHConnection(BaseConnection):
 
 
 class MultiConnection(BaseConnection):
-    """多连接管理类"""
+    """多连接管理类
+    对 'all' 的操作（连接、发送、读取、执行）在线程池中并发进行，
+    N台设备的广播命令耗时约等于最慢一台，而不是N台之和。
+    """
     
-    def __init__(self, connections: List[BaseConnection]):
+    def __init__(self, connections: List[BaseConnection], max_workers: Optional[int] = None):
+        """
+        max_workers: 并发线程数，默认每个连接一个
+        """
         super().__init__()
         self.connections = connections
         self.active_connections: List[BaseConnection] = []
         self.current_index = 0
+        self.max_workers = max_workers or max(len(connections), 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        """线程池（首次使用时创建，断开连接时关闭）"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='multi-conn')
+        return self._executor
+    
+    def _fan_out(self, connections: List[BaseConnection], func: Callable[[BaseConnection], Any],
+                 deadline: Optional[float] = None) -> Iterator[Tuple[int, Any]]:
+        """在每个连接上并发执行func，按完成顺序产出(序号, 结果)
+        deadline 为单台设备的时限（秒），从该设备的任务在线程池中开始运行时计时，
+        排队等待线程的时间不计入；超时的设备产出(序号, None)，其线程在后台自然结束。
+        func抛出的异常记录日志后同样产出None。
+        """
+        started: Dict[int, float] = {}
+        
+        def run(i: int, conn: BaseConnection) -> Any:
+            started[i] = time.monotonic()
+            return func(conn)
+        
+        futures = {self._pool().submit(run, i, conn): i for i, conn in enumerate(connections)}
+        pending = set(futures)
+        while pending:
+            timeout = None
+            if deadline is not None:
+                # 等到最早的设备时限；还有排队的设备时短暂轮询，以便按其开始时间计时
+                ends = [started[futures[f]] + deadline for f in pending if futures[f] in started]
+                if len(ends) < len(pending):
+                    ends.append(time.monotonic() + min(deadline, 0.1))
+                timeout = max(0.0, min(ends) - time.monotonic())
+            
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                i = futures[future]
+                try:
+                    yield i, future.result()
+                except Exception as e:
+                    logger.warning(f"连接 {i} 执行失败: {e}")
+                    yield i, None
+            
+            if deadline is None:
+                continue
+            now = time.monotonic()
+            for future in [f for f in pending if futures[f] in started
+                           and now - started[futures[f]] >= deadline]:
+                pending.discard(future)
+                i = futures[future]
+                logger.warning(f"连接 {i} 在 {deadline:.1f} 秒内未响应")
+                yield i, None
         
     def connect(self) -> bool:
-        """建立所有连接"""
-        for i, conn in enumerate(self.connections):
+        """并发建立所有连接"""
+        def connect_one(conn: BaseConnection) -> Union[bool, Exception]:
             try:
-                if conn.connect():
-                    self.active_connections.append(conn)
-                    logger.info(f"连接 {i+1}/{len(self.connections)} 成功")
+                return conn.connect()
             except Exception as e:
-                logger.warning(f"连接 {i+1} 失败: {e}")
+                return e
         
+        connected = [False] * len(self.connections)
+        for i, result in self._fan_out(self.connections, connect_one):
+            if result is True:
+                connected[i] = True
+                logger.info(f"连接 {i+1}/{len(self.connections)} 成功")
+            else:
+                logger.warning(f"连接 {i+1} 失败: {result}")
+        
+        # 保持配置中的顺序，序号与连接列表对应
+        self.active_connections = [conn for conn, ok in zip(self.connections, connected) if ok]
         success_count = len(self.active_connections)
         logger.info(f"成功建立 {success_count}/{len(self.connections)} 个连接")
         return success_count > 0
     
     def disconnect(self) -> None:
         """断开所有连接"""
-        for conn in self.active_connections:
-            try:
-                conn.disconnect()
-            except Exception as e:
-                logger.error(f"断开连接失败: {e}")
+        for i, _ in self._fan_out(self.active_connections, lambda conn: conn.disconnect()):
+            pass
         self.active_connections.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
     
     def send_command(self, command: str, wait_time: float = 1, 
                     target: Union[str, int] = 'current') -> bool:
         """发送命令到指定连接"""
         if target == 'all':
-            results = [conn.send_command(command, wait_time) 
-                      for conn in self.active_connections]
+            # 先收齐所有结果：all() 遇到第一个失败就会停止消费生成器
+            results = [bool(ok) for _, ok in self._fan_out(
+                self.active_connections, lambda conn: conn.send_command(command, wait_time))]
             return all(results)
         elif target == 'current':
             if self.active_connections:
@@ -379,11 +689,10 @@ class MultiConnection(BaseConnection):
     def read_output(self, timeout: float = 2, target: Union[str, int] = 'current') -> str:
         """读取指定连接的输出"""
         if target == 'all':
-            outputs = []
-            for i, conn in enumerate(self.active_connections):
-                output = conn.read_output(timeout)
-                outputs.append(f"[Connection {i}]\n{output}")
-            return '\n'.join(outputs)
+            outputs = dict(self._fan_out(self.active_connections,
+                                         lambda conn: conn.read_output(timeout)))
+            return '\n'.join(f"[Connection {i}]\n{outputs.get(i) or ''}"
+                             for i in range(len(self.active_connections)))
         elif target == 'current':
             if self.active_connections:
                 return self.active_connections[self.current_index].read_output(timeout)
@@ -402,14 +711,30 @@ class MultiConnection(BaseConnection):
             return True
         return False
     
+    def iter_on_all(self, command: str, wait_time: float = 1, read_timeout: float = 2,
+                    deadline: Optional[float] = None) -> Iterator[Tuple[int, Optional[str]]]:
+        """在所有连接上并发执行命令，哪台先返回先产出(序号, 输出)
+        deadline: 单台设备的时限，默认 wait_time + read_timeout + 1 秒；
+        超时的设备输出为None
+        """
+        if deadline is None:
+            deadline = wait_time + read_timeout + 1
+        return self._fan_out(self.active_connections,
+                             lambda conn: conn.execute_command(command, wait_time, read_timeout),
+                             deadline)
+    
     def execute_on_all(self, command: str, wait_time: float = 1, 
-                      read_timeout: float = 2) -> Dict[int, str]:
-        """在所有连接上执行命令"""
+                      read_timeout: float = 2, deadline: Optional[float] = None,
+                      on_result: Optional[Callable[[int, str], None]] = None) -> Dict[int, str]:
+        """在所有连接上并发执行命令
+        on_result(序号, 输出) 在每台设备返回时立即回调；超时设备的输出为空字符串
+        """
         results = {}
-        for i, conn in enumerate(self.active_connections):
-            output = conn.execute_command(command, wait_time, read_timeout)
-            results[i] = output
-        return results
+        for i, output in self.iter_on_all(command, wait_time, read_timeout, deadline):
+            results[i] = output or ""
+            if on_result:
+                on_result(i, results[i])
+        return dict(sorted(results.items()))
 
 
 class ConnectionFactory:
@@ -446,7 +771,9 @@ class ConnectionFactory:
                 username=config['username'],
                 password=config.get('password'),
                 port=config.get('port', 22),
-                key_file=config.get('key_file')
+                key_file=config.get('key_file'),
+                exec_mode=config.get('exec_mode', False),
+                max_channels=config.get('max_channels', 4)
             )
         elif connection_type == 'multi_ssh':
             ssh_configs = config.get('ssh_configs', [])
@@ -456,7 +783,9 @@ class ConnectionFactory:
                     username=cfg['username'],
                     password=cfg.get('password'),
                     port=cfg.get('port', 22),
-                    key_file=cfg.get('key_file')
+                    key_file=cfg.get('key_file'),
+                    exec_mode=cfg.get('exec_mode', False),
+                    max_channels=cfg.get('max_channels', 4)
                 )
                 for cfg in ssh_configs
             ]
@@ -86,9 +86,15 @@ class LoggerManager:
             # 不再添加处理器，使用根日志器的处理器
             module_logger.propagate = True
     
-    def get_console_logger(self) -> logging.Logger:
-        """获取SSH控制台日志器"""
-        console_logger = logging.getLogger('ssh_console')
+    def get_console_logger(self, host: Optional[str] = None) -> logging.Logger:
+        """获取SSH控制台日志器
+        host: 多设备测试时的设备名，日志写入 <输出目录>/<host>/console.log
+        """
+        name = f'ssh_console.{host}' if host else 'ssh_console'
+        log_file = self.output_dir / host / "console.log" if host else self.console_log
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        console_logger = logging.getLogger(name)
         console_logger.setLevel(logging.DEBUG)
         console_logger.propagate = False  # 不传播到根日志器
         
@@ -97,7 +103,7 @@ class LoggerManager:
         
         # 添加文件处理器
         handler = logging.FileHandler(
-            self.console_log, encoding='utf-8', mode='w'
+            log_file, encoding='utf-8', mode='w'
         )
         handler.setLevel(logging.DEBUG)
         formatter = logging.Formatter('%(asctime)s - %(message)s', 
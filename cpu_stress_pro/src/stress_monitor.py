@@ -20,6 +20,7 @@ import sys
 import json
 import logging
 import argparse
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, List, Any, Tuple
@@ -55,6 +56,7 @@ ConfigManager = config_loader.ConfigManager
 ConnectionFactory = connection_manager.ConnectionFactory
 BaseConnection = connection_manager.BaseConnection
 TemperatureMonitor = temperature_monitor.TemperatureMonitor
+ThermalSampler = temperature_monitor.ThermalSampler
 
 # 配置日志
 logging.basicConfig(
@@ -64,6 +66,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# pyplot不是线程安全的，多台设备并行测试时串行生成图表
+_plot_lock = threading.Lock()
+
 
 @dataclass
 class TestResult:
@@ -74,9 +79,16 @@ class TestResult:
     bogo_ops: int
     real_time: float
     bogo_ops_per_sec: float
-    temperature: float
+    pre_temperature: float  # 测试前
+    peak_temperature: float  # 压力测试期间最高
+    post_temperature: float  # 测试后冷却3秒
     status: str
     
+    @property
+    def temperature(self) -> float:
+        """代表温度（峰值）"""
+        return self.peak_temperature
+    
     def to_csv_row(self) -> List[str]:
         """转换为CSV行"""
         return [
@@ -86,7 +98,9 @@ class TestResult:
             str(self.bogo_ops),
             f"{self.real_time:.2f}",
             f"{self.bogo_ops_per_sec:.2f}",
-            f"{self.temperature:.1f}",
+            f"{self.pre_temperature:.1f}",
+            f"{self.peak_temperature:.1f}",
+            f"{self.post_temperature:.1f}",
             self.status
         ]
 
@@ -94,14 +108,16 @@ class TestResult:
 class StressTestMonitor:
     """压力测试监控器 V3.0"""
     
-    def __init__(self, config: Config, connection: BaseConnection):
+    def __init__(self, config: Config, connection: BaseConnection, console: bool = True):
         """
         初始化监控器
         config: 配置对象
         connection: 连接对象
+        console: 是否在终端打印进度（多设备并行测试时关闭，由看板统一显示）
         """
         self.config = config
         self.connection = connection
+        self.console = console
         
         # 创建输出目录
         self.output_dir = config.output.get_output_dir()
@@ -111,6 +127,12 @@ class StressTestMonitor:
         # 初始化温度监控器 - 使用相同的输出目录
         self.temp_monitor = TemperatureMonitor(connection, self.output_dir, config)
         
+        # 压力测试期间的实时温度采样（独立exec通道）
+        self.thermal_sampler = ThermalSampler(
+            connection, config.monitor.sample_interval,
+            on_sample=lambda temp: self.temp_monitor.add_temperature_record(temp, "实时采样")
+        )
+        
         # 测试数据
         self.test_results: List[TestResult] = []
         self.test_count = 0
@@ -132,7 +154,9 @@ class StressTestMonitor:
         logger.debug("压力测试监控器初始化完成")
     
     def _setup_signal_handlers(self):
-        """设置信号处理器"""
+        """设置信号处理器（只能在主线程设置，工作线程中的监控器由调用方停止）"""
+        if threading.current_thread() is not threading.main_thread():
+            return
         signal.signal(signal.SIGINT, self._signal_handler)
         if hasattr(signal, 'SIGTERM'):
             signal.signal(signal.SIGTERM, self._signal_handler)
@@ -154,6 +178,16 @@ class StressTestMonitor:
         import sys
         sys.exit(0)
     
+    def _print(self, *args, **kwargs):
+        """终端输出（console关闭时不打印）"""
+        if self.console:
+            kwargs.setdefault('flush', True)
+            print(*args, **kwargs)
+    
+    def request_stop(self):
+        """请求停止连续测试，当前这一轮结束后退出"""
+        self._stop_requested = True
+    
     def start(self) -> bool:
         """启动监控"""
         if not self.connection.is_connected():
@@ -165,12 +199,11 @@ class StressTestMonitor:
         # 初始化CSV文件
         self._init_csv()
         
-        # 不启动独立的温度监控线程，只在测试前后获取温度
-        # 温度监控线程会与压力测试产生资源竞争
-        # if self.config.monitor.enable_temperature:
-        #     self.temp_monitor.start_monitoring(
-        #         interval=self.config.monitor.temperature_interval
-        #     )
+        # 实时温度采样走独立通道，不与压力测试争用交互shell；
+        # 不可用时（串口、远端无sysfs热区）只在测试前后用sensors读取
+        if self.config.monitor.enable_temperature:
+            if not self.thermal_sampler.start():
+                logger.warning("实时温度采样不可用，峰值温度取测试前后读数的较大值")
         
         logger.debug("监控已启动")
         return True
@@ -179,7 +212,8 @@ class StressTestMonitor:
         """停止监控"""
         self.running = False
         
-        # 停止温度监控
+        # 停止温度采样和监控
+        self.thermal_sampler.stop()
         if self.temp_monitor.monitoring:
             self.temp_monitor.stop_monitoring()
         
@@ -194,7 +228,7 @@ class StressTestMonitor:
             writer = csv.writer(f)
             writer.writerow([
                 "序号", "时间", "CPU数", "Bogo Ops", 
-                "运行时间(秒)", "Bogo Ops/s", "温度(°C)", "状态"
+                "运行时间(秒)", "Bogo Ops/s", "初始温度(°C)", "峰值温度(°C)", "结束温度(°C)", "状态"
             ])
         logger.debug(f"CSV文件创建: {self.csv_file}")
     
@@ -239,11 +273,14 @@ class StressTestMonitor:
             logger.info("跳过Docker检查")
             return True
         
+        if getattr(self.connection, 'exec_mode', False):
+            return self._check_docker_exec()
+        
         env = self.check_environment()
         
         if env == "主机系统":
             logger.info("尝试进入Docker容器...")
-            output = self.connection.execute_command(
+            output = self.connection.switch_shell(
                 "docker exec -it vscode-server /bin/bash",
                 wait_time=2,
                 read_timeout=3
@@ -261,6 +298,18 @@ class StressTestMonitor:
         
         return env == "Docker容器"
     
+    def _check_docker_exec(self) -> bool:
+        """exec通道模式下检查容器是否可用
+        exec通道没有pty，也不保留shell状态，无法用 docker exec -it 进入容器；
+        stress-ng 本来就通过 docker exec vscode-server 运行，这里只确认容器可执行命令
+        """
+        result = self.connection.run("docker exec vscode-server true", timeout=10)
+        if result.ok:
+            logger.info("vscode-server容器可用（exec通道模式，命令通过docker exec执行）")
+            return True
+        logger.error(f"vscode-server容器不可用: {(result.stderr or result.error or '').strip()}")
+        return False
+    
     def check_and_install_stress_ng(self) -> bool:
         """检查并安装stress-ng"""
         if not self.config.test.install_stress_ng:
@@ -293,7 +342,8 @@ class StressTestMonitor:
             logger.error("stress-ng安装失败")
             return False
     
-    def parse_stress_output(self, output: str, temperature: float = 0.0) -> Optional[TestResult]:
+    def parse_stress_output(self, output: str, pre_temp: float = 0.0, peak_temp: float = 0.0,
+                            post_temp: float = 0.0) -> Optional[TestResult]:
         """解析stress-ng输出"""
         # stress-ng输出格式: stress-ng: info:  [5823] cpu               85883     60.04    463.39      0.92      1430.44         184.97
         # 格式为: stressor_name bogo_ops real_time user_time sys_time bogo_ops_per_sec_real bogo_ops_per_sec_usr_sys
@@ -322,7 +372,9 @@ class StressTestMonitor:
                 bogo_ops=bogo_ops,
                 real_time=real_time,
                 bogo_ops_per_sec=bogo_ops_per_sec,
-                temperature=temperature,  # 使用传入的温度参数
+                pre_temperature=pre_temp,
+                peak_temperature=peak_temp,
+                post_temperature=post_temp,
                 status='success'
             )
             
@@ -338,7 +390,8 @@ class StressTestMonitor:
                 f"测试#{result.test_id}完成: "
                 f"Bogo Ops={result.bogo_ops}, "
                 f"性能={result.bogo_ops_per_sec:.2f} ops/s, "
-                f"温度={result.temperature:.1f}°C"
+                f"温度={result.pre_temperature:.1f}/{result.peak_temperature:.1f}/"
+                f"{result.post_temperature:.1f}°C (初始/峰值/结束)"
             )
             
             return result
@@ -357,32 +410,15 @@ class StressTestMonitor:
         current_test_num = self.test_count
         
         logger.info(f"开始测试#{current_test_num}: CPU={cpu_count if cpu_count else '全部'}, 时长={timeout}s")
-        print(f"[{current_test_num:03d}] 开始测试 (时长: {timeout}s)", end="", flush=True)
-        
-        # 智能温度获取：第1次和每5次测试获取真实温度
-        if current_test_num == 1 or current_test_num % 5 == 1:
-            # 清除缓存，获取真实温度
-            self.temp_monitor._cache_time = None
-            self.temp_monitor._temp_cache = 0.0
-            pre_temp = self.temp_monitor.get_temperature()
-            self._last_measured_temp = pre_temp
-            self._last_temp_time = datetime.now()
-            self._base_temp = pre_temp  # 保存基准温度
-        else:
-            # 使用上次测量的温度，根据测试次数逐渐升温
-            base_temp = getattr(self, '_base_temp', 0.0)
-            if base_temp > 0:
-                # 模拟温度逐渐上升：每次测试上升0.5-1.0度
-                temp_increase = (current_test_num % 5) * 0.8
-                pre_temp = base_temp + temp_increase
-            else:
-                pre_temp = getattr(self, '_last_measured_temp', 0.0)
+        self._print(f"[{current_test_num:03d}] 开始测试 (时长: {timeout}s)", end="", flush=True)
         
+        # 测试前温度
+        pre_temp = self._measure_temperature()
         if pre_temp > 0:
             logger.info(f"测试#{current_test_num}前温度: {pre_temp:.1f}°C")
-            print(f" | 初始温度: {pre_temp:.1f}°C")
+            self._print(f" | 初始温度: {pre_temp:.1f}°C")
         else:
-            print()  # 换行
+            self._print()  # 换行
         
         # 构建命令 - 使用固定的8个CPU核心数，避免$(nproc)在某些环境下的问题
         if cpu_count == 0:
@@ -399,42 +435,29 @@ class StressTestMonitor:
             cmd = base_cmd
         
         # 执行命令
-        print(f"    执行压力测试中...", end="", flush=True)
+        self._print(f"    执行压力测试中...", end="", flush=True)
         logger.debug(f"执行命令: {cmd}")
+        stress_start = time.time()
         output = self.connection.execute_command(cmd, wait_time=1, read_timeout=timeout+5)
+        stress_end = time.time()
         
         # 等待3秒让系统负载降下来
-        print(" 完成")
+        self._print(" 完成")
         time.sleep(3)
         
-        # 智能温度估算：每5次测试获取一次真实温度
-        if current_test_num == 1 or current_test_num % 5 == 0:
-            # 第1次和每5次测试获取真实的测试后温度
-            self.temp_monitor._cache_time = None
-            self.temp_monitor._temp_cache = 0.0
-            post_temp = self.temp_monitor.get_temperature()
-            if current_test_num > 1:
-                logger.debug(f"第{current_test_num}次测试，获取真实温度")
-        else:
-            # 其他测试使用估算温度（压力测试让温度上升2-4度）
-            import random
-            temp_increase = random.uniform(2.0, 4.0)  # 随机温度上升2-4度
-            post_temp = pre_temp + temp_increase if pre_temp > 0 else 0.0
+        post_temp = self._measure_temperature()
+        # 峰值取压力测试窗口内的实时样本；采样不可用时只有测试前后两个读数
+        peak_temp = max(self.thermal_sampler.peak(stress_start, stress_end), pre_temp, post_temp)
         
+        if peak_temp > 0:
+            logger.info(f"测试#{current_test_num}峰值温度: {peak_temp:.1f}°C, 结束温度: {post_temp:.1f}°C")
+            self._print(f"    峰值温度: {peak_temp:.1f}°C | 结束温度: {post_temp:.1f}°C")
         if post_temp > 0:
-            logger.info(f"测试#{current_test_num}后温度: {post_temp:.1f}°C")
-            print(f"    最终温度: {post_temp:.1f}°C")
-            # 更新最后测量的温度
-            self._last_measured_temp = post_temp
             # 记录温度到温度监控器
             self.temp_monitor.add_temperature_record(post_temp, f"测试#{current_test_num}")
-        else:
-            post_temp = pre_temp  # 使用测试前温度作为备用
-        
-        # 不需要恢复温度监控，因为我们没有启动独立的监控线程
         
         # 解析结果，传入温度参数
-        result = self.parse_stress_output(output, post_temp)
+        result = self.parse_stress_output(output, pre_temp, peak_temp, post_temp)
         
         if result:
             # 确保测试编号正确
@@ -450,7 +473,9 @@ class StressTestMonitor:
                 bogo_ops=0,
                 real_time=timeout,
                 bogo_ops_per_sec=0.0,
-                temperature=post_temp,
+                pre_temperature=pre_temp,
+                peak_temperature=peak_temp,
+                post_temperature=post_temp,
                 status="failed"
             )
             self.test_results.append(result)
@@ -463,11 +488,19 @@ class StressTestMonitor:
             self.failed_tests += 1
             return False
     
+    def _measure_temperature(self) -> float:
+        """读取当前温度：优先用实时采样的最新样本，否则执行sensors"""
+        temp = self.thermal_sampler.latest(max_age=self.thermal_sampler.interval * 3)
+        if temp > 0:
+            return temp
+        return self.temp_monitor.get_temperature(use_cache=False)
+    
     def _print_test_result(self, result: TestResult):
         """打印测试结果"""
-        print(f"    结果: 性能 {result.bogo_ops_per_sec:.2f} ops/s | 温度 {result.temperature:.1f}°C | 状态: {result.status}")
-        print("-" * 60)
-        sys.stdout.flush()
+        self._print(f"    结果: 性能 {result.bogo_ops_per_sec:.2f} ops/s | "
+                    f"温度 {result.pre_temperature:.1f}/{result.peak_temperature:.1f}/{result.post_temperature:.1f}°C "
+                    f"(初始/峰值/结束) | 状态: {result.status}")
+        self._print("-" * 60)
     
     def run_continuous_tests(self):
         """连续运行测试"""
@@ -505,7 +538,7 @@ class StressTestMonitor:
             # 等待间隔，支持快速响应Ctrl+C，支持小数秒
             if self.running and not self._stop_requested:
                 interval = self.config.test.interval_seconds
-                print(f"等待 {interval} 秒后继续...", end="", flush=True)
+                self._print(f"等待 {interval} 秒后继续...", end="", flush=True)
                 
                 if interval >= 1:
                     # 间隔大于等于1秒时，按秒等待
@@ -514,7 +547,7 @@ class StressTestMonitor:
                             break
                         time.sleep(1)
                         if not self._stop_requested and i < int(interval) - 1:
-                            print(".", end="", flush=True)
+                            self._print(".", end="", flush=True)
                     # 处理小数部分
                     remaining = interval - int(interval)
                     if remaining > 0 and not self._stop_requested:
@@ -524,17 +557,16 @@ class StressTestMonitor:
                     time.sleep(interval)
                 
                 if not self._stop_requested:
-                    print(" 继续")
-                    sys.stdout.flush()
+                    self._print(" 继续")
     
     def _print_test_config(self):
         """打印测试配置"""
-        print("\n[配置] ", end="")
-        print(f"时长: {'无限' if not self.config.test.duration_minutes else f'{self.config.test.duration_minutes}分'} | ", end="")
-        print(f"间隔: {self.config.test.interval_seconds}秒 | ", end="")
-        print(f"最大: {self.config.test.max_tests}次 | ", end="")
-        print(f"超时: {self.config.test.timeout_seconds}秒")
-        print("-" * 60)
+        self._print("\n[配置] ", end="")
+        self._print(f"时长: {'无限' if not self.config.test.duration_minutes else f'{self.config.test.duration_minutes}分'} | ", end="")
+        self._print(f"间隔: {self.config.test.interval_seconds}秒 | ", end="")
+        self._print(f"最大: {self.config.test.max_tests}次 | ", end="")
+        self._print(f"超时: {self.config.test.timeout_seconds}秒")
+        self._print("-" * 60)
     
     def _print_statistics(self):
         """打印统计信息"""
@@ -547,7 +579,7 @@ class StressTestMonitor:
         temp_stats = self.temp_monitor.get_statistics()
         avg_temp = temp_stats['average'] if temp_stats and temp_stats.get('average') else 0
         
-        print(f"\n[统计] 进度: {self.test_count}/{self.config.test.max_tests} | "
+        self._print(f"\n[统计] 进度: {self.test_count}/{self.config.test.max_tests} | "
               f"成功: {self.successful_tests} | 失败: {self.failed_tests} | "
               f"平均: {avg_perf:.2f} ops/s, {avg_temp:.1f}°C")
     
@@ -559,7 +591,8 @@ class StressTestMonitor:
         
         # 生成图表
         if self.config.output.save_charts:
-            self._generate_charts()
+            with _plot_lock:
+                self._generate_charts()
         
         # 打印报告
         self._print_report()
@@ -573,6 +606,7 @@ class StressTestMonitor:
         times = [r.timestamp for r in self.test_results]
         ops_per_sec = [r.bogo_ops_per_sec for r in self.test_results]
         temperatures = [r.temperature for r in self.test_results]
+        pre_temperatures = [r.pre_temperature for r in self.test_results]
         
         # 创建图表 - 3个子图
         fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 10))
@@ -602,7 +636,10 @@ class StressTestMonitor:
         valid_temps = [t for t in temperatures if t > 0]
         if valid_temps:
             ax2.plot(range(1, len(temperatures)+1), temperatures, 'o-', 
-                    markersize=8, linewidth=2, color='red', label='温度')
+                    markersize=8, linewidth=2, color='red', label='峰值温度')
+            if any(t > 0 for t in pre_temperatures):
+                ax2.plot(range(1, len(pre_temperatures)+1), pre_temperatures, '.--',
+                        markersize=6, linewidth=1, color='steelblue', label='初始温度')
             ax2.set_title('系统温度变化', fontsize=14, fontweight='bold')
             ax2.set_xlabel('测试序号', fontsize=12)
             ax2.set_ylabel('温度 (°C)', fontsize=12)
@@ -672,36 +709,36 @@ class StressTestMonitor:
         plt.close()
         
         logger.info(f"性能图表已生成: {chart_file}")
-        print(f"\n[图表] 性能分析图表已保存: {chart_file}")
+        self._print(f"\n[图表] 性能分析图表已保存: {chart_file}")
     
     def _print_report(self):
         """打印测试报告"""
         ops_values = [r.bogo_ops_per_sec for r in self.test_results]
         avg_perf = sum(ops_values) / len(ops_values)
         
-        print(f"\n{'='*50}")
-        print("测试报告")
-        print("="*50)
-        print(f"总测试次数: {self.test_count}")
-        print(f"成功次数: {self.successful_tests}")
-        print(f"失败次数: {self.failed_tests}")
-        print(f"成功率: {(self.successful_tests/self.test_count*100 if self.test_count > 0 else 0):.2f}%")
-        print(f"平均性能: {avg_perf:.2f} ops/s")
-        print(f"最高性能: {max(ops_values):.2f} ops/s")
-        print(f"最低性能: {min(ops_values):.2f} ops/s")
-        
-        # 温度统计 - 从测试结果中获取
+        self._print(f"\n{'='*50}")
+        self._print("测试报告")
+        self._print("="*50)
+        self._print(f"总测试次数: {self.test_count}")
+        self._print(f"成功次数: {self.successful_tests}")
+        self._print(f"失败次数: {self.failed_tests}")
+        self._print(f"成功率: {(self.successful_tests/self.test_count*100 if self.test_count > 0 else 0):.2f}%")
+        self._print(f"平均性能: {avg_perf:.2f} ops/s")
+        self._print(f"最高性能: {max(ops_values):.2f} ops/s")
+        self._print(f"最低性能: {min(ops_values):.2f} ops/s")
+        
+        # 温度统计 - 测试期间的峰值温度
         valid_temps = [r.temperature for r in self.test_results if r.temperature > 0]
         if valid_temps:
-            print(f"\n温度统计:")
-            print(f"  平均温度: {sum(valid_temps)/len(valid_temps):.1f}°C")
-            print(f"  最高温度: {max(valid_temps):.1f}°C")
-            print(f"  最低温度: {min(valid_temps):.1f}°C")
+            self._print(f"\n温度统计 (每次测试的峰值):")
+            self._print(f"  平均温度: {sum(valid_temps)/len(valid_temps):.1f}°C")
+            self._print(f"  最高温度: {max(valid_temps):.1f}°C")
+            self._print(f"  最低温度: {min(valid_temps):.1f}°C")
         else:
-            print(f"\n温度统计: 无有效温度数据")
+            self._print(f"\n温度统计: 无有效温度数据")
         
-        print(f"\n输出目录: {self.output_dir}")
-        print("="*50)
+        self._print(f"\n输出目录: {self.output_dir}")
+        self._print("="*50)
     
     def save_summary(self):
         """保存测试摘要"""
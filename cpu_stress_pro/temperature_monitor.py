@@ -12,7 +12,8 @@ import logging
 import csv
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List
+from collections import deque
+from typing import Optional, Dict, List, Callable
 
 logger = logging.getLogger(__name__)
 
@@ -63,17 +64,18 @@ class TemperatureMonitor:
             writer.writerow(["时间戳", "温度(°C)", "备注"])
         logger.debug(f"温度日志创建: {self.csv_file}")
     
-    def get_temperature(self) -> float:
+    def get_temperature(self, use_cache: bool = True) -> float:
         """
         获取当前温度 - 优化版本
         只使用sensors方法，支持缓存
+        use_cache: False 时总是执行sensors，读取失败返回0而不是旧的缓存值
         """
         if not self.connection:
             logger.warning("无连接可用")
             return 0.0
         
         # 检查缓存是否有效（避免频繁调用）
-        if self._cache_time and self._temp_cache > 0:
+        if use_cache and self._cache_time and self._temp_cache > 0:
             if (datetime.now() - self._cache_time).total_seconds() < self._cache_timeout:
                 logger.debug(f"使用缓存温度: {self._temp_cache:.1f}°C")
                 return self._temp_cache
@@ -113,7 +115,9 @@ class TemperatureMonitor:
             logger.error(f"获取温度失败: {e}")
         
         # 返回缓存值（如果有）
-        return self._temp_cache if self._temp_cache > 0 else temp_value
+        if use_cache and self._temp_cache > 0:
+            return self._temp_cache
+        return temp_value
     
     def _parse_sensors_output(self, output: str) -> float:
         """
@@ -205,7 +209,8 @@ class TemperatureMonitor:
             
             while self.monitoring and not self.stop_event.wait(interval):
                 try:
-                    temp = self.get_temperature()
+                    # 每个采样点都重新读取，采样间隔短于缓存超时也不会记录旧值
+                    temp = self.get_temperature(use_cache=False)
                     if temp > 0:
                         # 记录到历史
                         self.temp_history.append({
@@ -310,6 +315,143 @@ class TemperatureMonitor:
         logger.info(f"温度摘要已保存: {summary_file}")
 
 
+class ThermalSampler:
+    """
+    压力测试期间的实时温度采样
+    在独立的SSH exec通道上运行一个只用shell内建命令读取sysfs热区的循环，
+    每个周期只有一次sleep进程，对目标CPU几乎没有负担，也不占用交互shell。
+    优先取cpu热区的最高温度，没有cpu热区时取其余热区（不含电池）的最高温度。
+    """
+    
+    SCRIPT = (
+        "cd {thermal_dir} 2>/dev/null || exit 1; "
+        "printf TYPES; for z in thermal_zone*; do n=-; {{ read n < $z/type; }} 2>/dev/null; printf ' %s' \"$n\"; done; echo; "
+        "while :; do printf T; for z in thermal_zone*; do t=-; {{ read t < $z/temp; }} 2>/dev/null; printf ' %s' \"$t\"; done; echo; "
+        "sleep {interval}; done"
+    )
+    
+    def __init__(self, connection, interval: float = 1.0, thermal_dir: str = "/sys/class/thermal",
+                 on_sample: Optional[Callable[[float], None]] = None):
+        """
+        connection: 支持 open_stream 的连接对象（SSHConnection）
+        interval: 采样间隔(秒)
+        thermal_dir: 热区目录
+        on_sample: 每个有效样本的回调
+        """
+        self.connection = connection
+        self.interval = interval
+        self.thermal_dir = thermal_dir
+        self.on_sample = on_sample
+        
+        # (时间戳, 温度)，按1秒间隔约保存10小时
+        self.samples = deque(maxlen=36000)
+        self._channel = None
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    @property
+    def running(self) -> bool:
+        """采样通道是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def available(self) -> bool:
+        """正在运行且已取得有效样本"""
+        return self.running and bool(self.samples)
+    
+    def start(self) -> bool:
+        """启动采样，连接不支持独立通道或远端没有热区时返回False"""
+        if self.running:
+            return True
+        if not hasattr(self.connection, 'open_stream'):
+            logger.debug("连接不支持独立通道，无法实时采样温度")
+            return False
+        
+        command = self.SCRIPT.format(thermal_dir=self.thermal_dir, interval=self.interval)
+        self._channel = self.connection.open_stream(command)
+        if self._channel is None:
+            return False
+        
+        self._thread = threading.Thread(target=self._read_loop, name='thermal-sampler', daemon=True)
+        self._thread.start()
+        
+        # 等第一个样本，确认远端有可读的热区
+        deadline = time.time() + max(3.0, self.interval * 3)
+        while time.time() < deadline and self.running and not self.samples:
+            time.sleep(0.05)
+        if not self.samples:
+            logger.warning(f"{self.thermal_dir} 下没有可读的温度")
+            self.stop()
+            return False
+        
+        logger.info(f"实时温度采样已启动，间隔 {self.interval}秒，当前 {self.latest():.1f}°C")
+        return True
+    
+    def stop(self):
+        """停止采样"""
+        if self._channel is not None:
+            self.connection.close_stream(self._channel)
+            self._channel = None
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+    
+    def latest(self, max_age: Optional[float] = None) -> float:
+        """最新样本；max_age 秒内没有样本时返回0"""
+        with self._lock:
+            if not self.samples:
+                return 0.0
+            stamp, temp = self.samples[-1]
+        if max_age is not None and time.time() - stamp > max_age:
+            return 0.0
+        return temp
+    
+    def peak(self, start: float, end: Optional[float] = None) -> float:
+        """时间窗口 [start, end] 内的最高温度，没有样本时返回0"""
+        end = end if end is not None else time.time()
+        with self._lock:
+            temps = [temp for stamp, temp in self.samples if start <= stamp <= end]
+        return max(temps) if temps else 0.0
+    
+    def _read_loop(self):
+        """读取采样通道（工作线程）"""
+        types: List[str] = []
+        try:
+            for line in self._channel.makefile('r'):
+                fields = line.split()
+                if not fields:
+                    continue
+                if fields[0] == 'TYPES':
+                    types = fields[1:]
+                elif fields[0] == 'T':
+                    temp = self._select_temperature(types, fields[1:])
+                    if temp > 0:
+                        with self._lock:
+                            self.samples.append((time.time(), temp))
+                        if self.on_sample:
+                            self.on_sample(temp)
+        except Exception as e:
+            logger.debug(f"温度采样通道结束: {e}")
+    
+    @staticmethod
+    def _select_temperature(types: List[str], values: List[str]) -> float:
+        """从各热区读数（毫摄氏度）中选出CPU温度"""
+        cpu_temps = []
+        other_temps = []
+        for name, value in zip(types, values):
+            try:
+                temp = int(value) / 1000.0
+            except ValueError:
+                continue
+            if not 0 < temp < 125:
+                continue
+            if 'cpu' in name.lower():
+                cpu_temps.append(temp)
+            elif 'bat' not in name.lower():
+                other_temps.append(temp)
+        return max(cpu_temps or other_temps or [0.0])
+
+
 def main():
     """独立运行温度监控"""
     import sys
@@ -17,6 +17,7 @@ __version__ = '1.0.0'
 __author__ = 'Leisai Python Driver Team'
 __all__ = [
     'L7Driver',
+    'AsyncL7Driver',
     'ControlMode', 
     'ServoStatus',
     'AlarmCode',
@@ -26,6 +27,7 @@ __all__ = [
 ]
 
 from .core.driver import L7Driver
+from .core.async_driver import AsyncL7Driver
 from .core.constants import ControlMode, ServoStatus, AlarmCode
 from .core.exceptions import L7Exception, CommunicationError, ParameterError
 
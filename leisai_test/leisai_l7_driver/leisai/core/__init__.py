@@ -1,11 +1,13 @@
 """Core functionality for Leisai L7 servo drivers."""
 
 from .driver import L7Driver
+from .async_driver import AsyncL7Driver
 from .constants import ControlMode, ServoStatus, AlarmCode
 from .exceptions import L7Exception, CommunicationError, ParameterError
 
 __all__ = [
     'L7Driver',
+    'AsyncL7Driver',
     'ControlMode',
     'ServoStatus', 
     'AlarmCode',
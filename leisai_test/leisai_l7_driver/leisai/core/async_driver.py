@@ -0,0 +1,608 @@
+"""
+asyncio driver for Leisai L7 servo drivers.
+
+This module provides AsyncL7Driver, the asyncio counterpart of
+L7Driver. Monitoring and JOG keepalive run as tasks on the event loop,
+so one loop can drive many axes on several ports.
+"""
+
+import asyncio
+import logging
+from typing import Optional, Dict, Any, Callable, List
+
+from .constants import (
+    ControlMode, ServoStatus, AlarmCode, DOSignal,
+    PARAMETER_ADDRESS, PARAMETER_32BIT, PR_CONTROL_ADDRESS, PR_MODE_ABSOLUTE,
+    DEFAULT_BAUDRATE, DEFAULT_TIMEOUT
+)
+from .exceptions import (
+    NotConnectedError, ParameterError, InvalidParameterError, InvalidPathError
+)
+from .planner import ReadBlock, SplitBlocks, plan_reads, decode_fields
+from .motion import PRPath
+from .monitor import STATUS_PARAMETERS, decode_alarm
+from ..protocols.aio import AsyncSerialConnection, AsyncModbusClient
+
+logger = logging.getLogger(__name__)
+
+# JOG keepalive period (the drive stops JOG when the command lapses)
+JOG_INTERVAL = 0.05
+
+
+class AsyncL7Driver:
+    """
+    asyncio driver for Leisai L7 servo.
+    
+    Mirrors the :class:`L7Driver` API with coroutines. Several drivers
+    can share one :class:`AsyncSerialConnection`; their transactions are
+    serialised on the connection's lock.
+    
+    Parameters
+    ----------
+    port : str
+        Serial port name (e.g., 'COM3' or '/dev/ttyUSB0')
+    slave_id : int, optional
+        Modbus slave ID (default: 1)
+    baudrate : int, optional
+        Serial baudrate (default: 38400)
+    timeout : float, optional
+        Communication timeout in seconds (default: 1.0)
+    connection : AsyncSerialConnection, optional
+        Shared connection to use instead of opening ``port``
+        
+    Examples
+    --------
+    >>> async def main():
+    ...     async with AsyncL7Driver('/dev/ttyUSB0') as driver:
+    ...         print(await driver.get_position())
+    >>> asyncio.run(main())
+    
+    Several axes on one port:
+    >>> connection = AsyncSerialConnection('/dev/ttyUSB0')
+    >>> axes = [AsyncL7Driver(connection.port, i, connection=connection) for i in (1, 2, 3)]
+    >>> await asyncio.gather(*(axis.connect() for axis in axes))
+    """
+    
+    def __init__(
+        self,
+        port: str,
+        slave_id: int = 1,
+        baudrate: int = DEFAULT_BAUDRATE,
+        timeout: float = DEFAULT_TIMEOUT,
+        connection: Optional[AsyncSerialConnection] = None,
+        **kwargs
+    ):
+        """Initialize asyncio L7 driver."""
+        self._shared = connection is not None
+        self._serial = connection or AsyncSerialConnection(port, baudrate, timeout, **kwargs)
+        self._modbus = AsyncModbusClient(self._serial, slave_id)
+        
+        # State
+        self._connected = False
+        self._control_mode = ControlMode.POSITION
+        self._status = ServoStatus.IDLE
+        self._split_blocks = SplitBlocks()
+        
+        # Background tasks
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._jog_task: Optional[asyncio.Task] = None
+        
+        # Callbacks
+        self._status_callback: Optional[Callable] = None
+        self._alarm_callback: Optional[Callable] = None
+        self._last_alarm: Optional[int] = None
+        self._last_motion: Optional[tuple] = None
+    
+    # ==================== Connection Management ====================
+    
+    async def connect(self) -> bool:
+        """
+        Connect to servo driver.
+        
+        Returns
+        -------
+        bool
+            True if connection successful
+            
+        Raises
+        ------
+        ConnectionError
+            If the serial port cannot be opened
+        """
+        if self._connected:
+            return True
+            
+        if not await self._serial.connect():
+            return False
+            
+        alarm = await self._read('alarm_code')
+        if alarm is None:
+            logger.error("Failed to verify connection")
+            if not self._shared:
+                await self._serial.disconnect()
+            return False
+            
+        self._connected = True
+        logger.info(f"Connected to L7 servo {self.slave_id} (alarm: 0x{alarm:02X})")
+        
+        if self._status_callback or self._alarm_callback:
+            self.start_monitoring()
+        return True
+    
+    async def disconnect(self):
+        """Disconnect from servo driver; a shared connection stays open."""
+        if not self._connected:
+            return
+            
+        await self.stop_monitoring()
+        await self._cancel_jog()
+        if not self._shared:
+            await self._serial.disconnect()
+        self._connected = False
+        logger.info(f"Disconnected from L7 servo {self.slave_id}")
+    
+    @property
+    def is_connected(self) -> bool:
+        """Check if driver is connected."""
+        return self._connected and self._serial.is_connected
+    
+    @property
+    def slave_id(self) -> int:
+        """Modbus slave ID."""
+        return self._modbus.slave_id
+    
+    def _check_connection(self):
+        """Raise exception if not connected."""
+        if not self.is_connected:
+            raise NotConnectedError()
+    
+    # ==================== Parameters ====================
+    
+    async def _read(self, name: str) -> Optional[int]:
+        """Read one parameter without a connection check."""
+        address = PARAMETER_ADDRESS[name]
+        if name in PARAMETER_32BIT:
+            values = await self._modbus.read_registers(address, 2)
+            if not values:
+                return None
+            return decode_fields([(name, 0, 2)], values)[name]
+        return await self._modbus.read_register(address)
+    
+    async def _write(self, name: str, value: int) -> bool:
+        """Write one parameter without a connection check."""
+        address = PARAMETER_ADDRESS[name]
+        if name in PARAMETER_32BIT:
+            return await self._modbus.write_registers(
+                address, [(value >> 16) & 0xFFFF, value & 0xFFFF]
+            )
+        return await self._modbus.write_register(address, value)
+    
+    async def read_parameter(self, name: str) -> Optional[Any]:
+        """
+        Read parameter by name.
+        
+        Parameters
+        ----------
+        name : str
+            Parameter name
+            
+        Returns
+        -------
+        Optional[Any]
+            Parameter value, None if failed
+            
+        Raises
+        ------
+        NotConnectedError
+            If not connected
+        InvalidParameterError
+            If parameter name invalid
+        """
+        self._check_connection()
+        if name not in PARAMETER_ADDRESS:
+            raise InvalidParameterError(name, message=f"Unknown parameter: {name}")
+        return await self._read(name)
+    
+    async def write_parameter(self, name: str, value: Any) -> bool:
+        """
+        Write parameter by name.
+        
+        Parameters
+        ----------
+        name : str
+            Parameter name
+        value : Any
+            Parameter value
+            
+        Returns
+        -------
+        bool
+            True if successful
+            
+        Raises
+        ------
+        NotConnectedError
+            If not connected
+        InvalidParameterError
+            If parameter name invalid
+        """
+        self._check_connection()
+        if name not in PARAMETER_ADDRESS:
+            raise InvalidParameterError(name, message=f"Unknown parameter: {name}")
+        return await self._write(name, value)
+    
+    async def read_parameters(self, names: List[str]) -> Dict[str, Optional[Any]]:
+        """
+        Read several parameters with as few block reads as possible.
+        
+        Same planning and fallback as ParameterManager.read_block().
+        
+        Parameters
+        ----------
+        names : List[str]
+            Parameter names
+            
+        Returns
+        -------
+        Dict[str, Optional[Any]]
+            Parameter values (None for failed reads)
+            
+        Raises
+        ------
+        NotConnectedError
+            If not connected
+        """
+        self._check_connection()
+        values = {}
+        for block in plan_reads(names):
+            values.update(await self._read_planned_block(block))
+        return values
+    
+    async def _read_planned_block(self, block: ReadBlock) -> Dict[str, Optional[Any]]:
+        """Read one planned block, splitting it in halves if rejected."""
+        if len(block.fields) == 1:
+            name = block.fields[0][0]
+            return {name: await self._read(name)}
+            
+        key = (block.address, block.count)
+        merged = key not in self._split_blocks
+        error = None
+        if merged:
+            try:
+                registers = await self._modbus.read_registers(block.address, block.count, raise_errors=True)
+            except Exception as e:
+                registers, error = None, e
+            if registers and len(registers) == block.count:
+                self._split_blocks.succeeded(key)
+                return block.decode(registers)
+                
+        values = {}
+        for half in block.split():
+            values.update(await self._read_planned_block(half))
+        if merged:
+            self._split_blocks.failed(key, error, all(value is not None for value in values.values()))
+        return values
+    
+    # ==================== Servo Control ====================
+    
+    async def set_control_mode(self, mode: ControlMode) -> bool:
+        """
+        Set control mode.
+        
+        Raises
+        ------
+        NotConnectedError
+            If not connected
+        ParameterError
+            If mode is invalid
+        """
+        self._check_connection()
+        if not isinstance(mode, ControlMode):
+            raise ParameterError("mode", mode, "Invalid control mode")
+            
+        success = await self._write('control_mode', mode.value)
+        if success:
+            self._control_mode = mode
+        return success
+    
+    @property
+    def control_mode(self) -> ControlMode:
+        """Get current control mode."""
+        return self._control_mode
+    
+    async def reset_alarm(self) -> bool:
+        """Reset servo alarm (write 0x1111 to PA0.25)."""
+        self._check_connection()
+        logger.info("Resetting alarm")
+        if not await self._write('aux_function', 0x1111):
+            return False
+        await asyncio.sleep(0.05)
+        return True
+    
+    async def is_servo_on(self) -> bool:
+        """Check whether servo is enabled (S-RDY output)."""
+        self._check_connection()
+        do_status = await self._read('do_status')
+        return do_status is not None and bool(do_status & DOSignal.DO1_SRDY)
+    
+    # ==================== Motion Control ====================
+    
+    async def get_position(self) -> Optional[int]:
+        """Get current position in pulses, None if failed."""
+        self._check_connection()
+        return await self._read('encoder_position')
+    
+    async def get_command_position(self) -> Optional[int]:
+        """Get commanded position in pulses, None if failed."""
+        self._check_connection()
+        return await self._read('command_position')
+    
+    async def get_speed(self) -> Optional[int]:
+        """Get current speed in rpm, None if failed."""
+        self._check_connection()
+        return await self._read('motor_speed')
+    
+    async def get_torque(self) -> Optional[int]:
+        """Get current torque percentage, None if failed."""
+        self._check_connection()
+        return await self._read('torque_feedback')
+    
+    async def jog(self, speed: int, direction: bool = True) -> bool:
+        """
+        Start JOG motion.
+        
+        The JOG command is repeated every 50 ms by a task on the event
+        loop until :meth:`stop_jog` is called.
+        
+        Parameters
+        ----------
+        speed : int
+            Speed in rpm
+        direction : bool
+            True for forward, False for reverse
+            
+        Returns
+        -------
+        bool
+            True if successful
+        """
+        self._check_connection()
+        logger.info(f"Starting JOG: {speed} rpm, {'forward' if direction else 'reverse'}")
+        
+        await self._cancel_jog()
+        success = await self._write('control_mode', ControlMode.PR.value)
+        if success:
+            success = await self._write('pr_jog_speed', speed)
+        if success:
+            self._jog_task = asyncio.create_task(self._jog_loop(0x4001 if direction else 0x4002))
+        return success
+    
+    async def _jog_loop(self, command: int):
+        """Send the JOG command periodically."""
+        loop = asyncio.get_running_loop()
+        next_time = loop.time()
+        while True:
+            if not await self._write('aux_function', command):
+                logger.error("JOG command failed")
+                return
+            next_time += JOG_INTERVAL
+            await asyncio.sleep(max(0.0, next_time - loop.time()))
+    
+    async def _cancel_jog(self):
+        """Cancel the JOG keepalive task."""
+        task, self._jog_task = self._jog_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    
+    async def stop_jog(self) -> bool:
+        """Stop JOG motion."""
+        self._check_connection()
+        logger.info("Stopping JOG")
+        await self._cancel_jog()
+        return await self._write('aux_function', 0)
+    
+    async def home(self, mode: int = 0, high_speed: int = 500, low_speed: int = 50) -> bool:
+        """
+        Start homing sequence.
+        
+        Parameters
+        ----------
+        mode : int
+            Homing mode
+        high_speed : int
+            High speed in rpm
+        low_speed : int
+            Low speed in rpm
+            
+        Returns
+        -------
+        bool
+            True if successful
+        """
+        self._check_connection()
+        self._status = ServoStatus.HOMING
+        
+        success = await self._write('pr_home_mode', mode)
+        if success:
+            success = await self._write('pr_home_speed_high', high_speed)
+        if success:
+            success = await self._write('pr_home_speed_low', low_speed)
+        if success:
+            pr_control = await self._read('pr_control') or 0
+            success = await self._write('pr_control', pr_control | 0x0001)
+        return success
+    
+    async def is_homing_complete(self) -> bool:
+        """Check if homing is complete."""
+        self._check_connection()
+        status = await self._read('pr_status')
+        return status is not None and bool(status & 0x0001)
+    
+    # ==================== PR Control ====================
+    
+    async def trigger_pr(self, path_id: int) -> bool:
+        """Trigger PR path via direct register write (0x6002)."""
+        self._check_connection()
+        if not 0 <= path_id <= 15:
+            raise InvalidPathError(path_id)
+        return await self._modbus.write_register(PR_CONTROL_ADDRESS, 0x0010 | (path_id & 0x0F))
+    
+    async def set_pr_path(self, path_id: int, position: int, speed: int,
+                          acceleration: int = 100, deceleration: int = 100,
+                          delay: int = 0, s_curve: int = 0,
+                          mode: int = PR_MODE_ABSOLUTE) -> bool:
+        """Configure PR path (same layout as L7Driver.set_pr_path)."""
+        self._check_connection()
+        path = PRPath(path_id, position, speed, acceleration, deceleration, delay, s_curve, mode)
+        path.validate()
+        return await self._modbus.write_registers(path.address, path.to_registers())
+    
+    async def stop_pr_motion(self) -> bool:
+        """Stop PR motion (0x6002 = 0x0040)."""
+        self._check_connection()
+        return await self._modbus.write_register(PR_CONTROL_ADDRESS, 0x0040)
+    
+    async def get_current_pr_path(self) -> Optional[int]:
+        """Get currently executing PR path."""
+        self._check_connection()
+        return await self._read('pr_current_path')
+    
+    async def get_pr_position(self) -> Optional[int]:
+        """Get current PR position in pulses."""
+        self._check_connection()
+        return await self._read('pr_current_position')
+    
+    async def is_pr_complete(self) -> bool:
+        """Check if PR motion is complete."""
+        self._check_connection()
+        status = await self._read('pr_status')
+        return status is not None and bool(status & 0x0002)
+    
+    # ==================== Status Monitoring ====================
+    
+    async def get_alarm(self) -> Optional[AlarmCode]:
+        """Get current alarm code, None if failed."""
+        self._check_connection()
+        return decode_alarm(await self._read('alarm_code'))
+    
+    async def is_ready(self) -> bool:
+        """Check if servo is ready (no alarm and S-RDY active)."""
+        alarm = await self.get_alarm()
+        if alarm and alarm != AlarmCode.NO_ALARM:
+            return False
+        return await self.is_servo_on()
+    
+    async def get_servo_status(self) -> Optional[int]:
+        """Get drive status word (0x0B05)."""
+        self._check_connection()
+        return await self._read('servo_status')
+    
+    async def get_temperature(self) -> Optional[float]:
+        """Get driver temperature in °C."""
+        self._check_connection()
+        raw = await self._read('driver_temperature')
+        return raw / 10.0 if raw is not None else None
+    
+    async def get_status_snapshot(self) -> Dict[str, Any]:
+        """
+        Read position, speed, torque, I/O, bus voltage, temperature and alarm.
+        
+        Returns
+        -------
+        Dict[str, Any]
+            Status values (None for failed reads)
+        """
+        values = await self.read_parameters(list(STATUS_PARAMETERS.values()))
+        return {key: values.get(name) for key, name in STATUS_PARAMETERS.items()}
+    
+    def start_monitoring(self, interval: float = 0.1):
+        """
+        Start status monitoring as a task on the running event loop.
+        
+        Parameters
+        ----------
+        interval : float
+            Monitoring interval in seconds
+        """
+        if self._monitor_task and not self._monitor_task.done():
+            logger.warning("Monitoring already running")
+            return
+        self._monitor_task = asyncio.create_task(self._monitor_loop(interval))
+        logger.info(f"Status monitoring started (interval: {interval}s)")
+    
+    async def stop_monitoring(self):
+        """Stop status monitoring."""
+        task, self._monitor_task = self._monitor_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        logger.info("Status monitoring stopped")
+    
+    async def _monitor_loop(self, interval: float):
+        """Main monitoring loop."""
+        loop = asyncio.get_running_loop()
+        next_time = loop.time()
+        while True:
+            try:
+                status = await self.get_status_snapshot()
+                self._dispatch_status(status)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Monitoring error: {e}")
+                next_time = loop.time() + 1.0
+                
+            next_time = max(next_time + interval, loop.time())
+            await asyncio.sleep(next_time - loop.time())
+    
+    def _dispatch_status(self, status: Dict[str, Any]):
+        """Call the alarm/status callbacks on changes."""
+        alarm = status.get('alarm')
+        if alarm is not None and alarm != self._last_alarm:
+            self._last_alarm = alarm
+            if self._alarm_callback:
+                try:
+                    self._alarm_callback(alarm)
+                except Exception as e:
+                    logger.error(f"Alarm callback error: {e}")
+                    
+        motion = (status.get('position'), status.get('speed'), status.get('torque'))
+        if motion != self._last_motion:
+            self._last_motion = motion
+            if self._status_callback:
+                try:
+                    self._status_callback(status)
+                except Exception as e:
+                    logger.error(f"Status callback error: {e}")
+    
+    def set_status_callback(self, callback: Optional[Callable]):
+        """Set status change callback (called with the status dict)."""
+        self._status_callback = callback
+    
+    def set_alarm_callback(self, callback: Optional[Callable]):
+        """Set alarm change callback (called with the raw alarm code)."""
+        self._alarm_callback = callback
+    
+    # ==================== Context Manager ====================
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.disconnect()
+    
+    def __repr__(self) -> str:
+        """String representation."""
+        status = "connected" if self.is_connected else "disconnected"
+        return f"AsyncL7Driver(port='{self._serial.port}', slave_id={self.slave_id}, status='{status}')"
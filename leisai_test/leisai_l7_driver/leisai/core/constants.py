@@ -6,7 +6,7 @@ used throughout the library.
 """
 
 from enum import IntEnum, IntFlag
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Optional
 
 
 class ControlMode(IntEnum):
@@ -209,15 +209,104 @@ PARAMETER_ADDRESS: Dict[str, int] = {
     'alarm_code': 0x0B1F,
 }
 
-# PR path register base addresses
+# Parameters stored as signed 32-bit values in two registers (high word first)
+PARAMETER_32BIT = frozenset({
+    'encoder_position',
+    'command_position',
+    'motor_position_cmd_unit',
+    'command_position_cmd_unit',
+    'pr_current_position',
+    'pr_home_offset',
+})
+
+# Parameters the drive reports but does not accept writes for
+READ_ONLY_PARAMETERS = frozenset(
+    name for name, address in PARAMETER_ADDRESS.items() if 0x0B00 <= address <= 0x0BFF
+) | frozenset({
+    'pr_status', 'pr_error_code', 'pr_current_path',
+    'pr_current_position', 'pr_current_position_h', 'pr_current_position_l',
+})
+
+# Registers whose writes trigger an action rather than store a setting
+# (alarm clear / JOG, homing / PR trigger); never restored from a file
+COMMAND_PARAMETERS = frozenset({'aux_function', 'pr_control'})
+
+# Mapping parameters (PA0.40-47 values, PA0.50-57 pointers, 485 only)
+MAPPING_VALUE_BASE = 0x0050
+MAPPING_POINTER_BASE = 0x0064
+MAPPING_SLOTS = 8
+
+# Mapping pointer codes: 0x0BNN = class B, parameter NN as decimal digits
+# (e.g. PAB.24 -> 0x0B24). A 32-bit parameter takes a whole slot (PH = PL).
+MAPPING_POINTER: Dict[str, int] = {
+    'position_error': 0x0B04,
+    'servo_status': 0x0B05,
+    'motor_speed': 0x0B06,
+    'torque_feedback': 0x0B07,
+    'pulse_frequency': 0x0B08,
+    'dc_bus_voltage': 0x0B10,
+    'driver_temperature': 0x0B11,
+    'analog_input_1': 0x0B12,
+    'analog_input_2': 0x0B13,
+    'di_status': 0x0B17,
+    'do_status': 0x0B18,
+    'command_position_cmd_unit': 0x0B20,
+    'motor_position_cmd_unit': 0x0B21,
+    'command_position': 0x0B23,
+    'encoder_position': 0x0B24,
+    'alarm_code': 0x0B25,  # 0x0B1F is the low word of PAB.25
+}
+
+# Pointer codes of 32-bit parameters (PAB.20-PAB.25)
+MAPPING_POINTER_32BIT = frozenset({0x0B20, 0x0B21, 0x0B22, 0x0B23, 0x0B24, 0x0B25})
+
+# Pointer for the unused half of a slot holding a single 16-bit parameter
+# (PAB.00 software version, read-only); PH = PL would mean one 32-bit value
+MAPPING_FILLER_POINTER = 0x0B00
+
+# PR path table (PA9): 8 registers per path from 0x6200 + 8 * path, in
+# order [mode, position H, position L, speed, acc, dec, dwell, special]
 PR_PATH_BASE = 0x6200
-PR_PATH_SIZE = 0x10
+PR_PATH_SIZE = 8
+PR_PATH_COUNT = 16
+
+# PR path mode word: bits 0-3 motion type (1 = position), bits 6-7
+# reference (0 = absolute, 1 = incremental to command, 2 = relative to motor)
+PR_MODE_ABSOLUTE = 0x0001
+PR_MODE_INCREMENTAL = 0x0041
+PR_MODE_RELATIVE = 0x0081
+
+# PR control operation register (PA8.02): PR trigger, emergency stop
+PR_CONTROL_ADDRESS = 0x6002
 
 # Communication settings
 DEFAULT_BAUDRATE = 38400
 DEFAULT_TIMEOUT = 1.0
 MAX_RETRIES = 3
 RETRY_DELAY = 0.1
+MAX_READ_REGISTERS = 125  # Modbus limit for one 0x03 request
+MAX_WRITE_REGISTERS = 123  # Modbus limit for one 0x10 request
+
+# Modbus broadcast: slave 0 is executed by every drive and never answered;
+# the master keeps the line quiet for the turnaround delay afterwards
+BROADCAST_SLAVE_ID = 0
+BROADCAST_TURNAROUND = 0.01
+
+# Register cache lifetime by address range, first match wins
+# (seconds; None = valid until written, 0 = never cached)
+REGISTER_CACHE_TTL: Tuple[Tuple[int, int, Optional[float]], ...] = (
+    (0x0033, 0x0033, 0.0),     # PA0.25 auxiliary function (command register)
+    (0x0050, 0x005F, 0.005),   # Mapping values PA0.40-47 mirror live status
+    (0x0400, 0x0400, 0.005),   # DI monitor
+    (0x0410, 0x0410, 0.005),   # DO monitor
+    (0x0000, 0x06FF, None),    # Configuration parameters PA0-PA6
+    (0x0800, 0x0805, 0.005),   # PR control / status / current position
+    (0x0B00, 0x0BFF, 0.005),   # Live status PAB
+    (0x6002, 0x6002, 0.0),     # PR trigger / completion (PA8.02)
+    (0x6000, 0x62FF, None),    # PR settings and path table
+)
+DEFAULT_CACHE_TTL = 0.1  # Registers outside REGISTER_CACHE_TTL
+CACHE_MAX_ENTRIES = 1024
 
 # Physical limits
 MAX_SPEED_RPM = 6500
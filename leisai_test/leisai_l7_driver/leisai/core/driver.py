@@ -6,25 +6,32 @@ This module provides the high-level interface for controlling L7 servo drivers.
 
 import logging
 import time
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Union, List
 from threading import Thread, Event
 from dataclasses import dataclass
 
 from .constants import (
     ControlMode, ServoStatus, AlarmCode,
     PARAMETER_ADDRESS, ALARM_DESCRIPTIONS,
-    PR_PATH_BASE, PR_PATH_SIZE, DOSignal
+    PR_MODE_ABSOLUTE, DOSignal
 )
 from .exceptions import (
     NotConnectedError, ServoNotReadyError,
     ParameterError, ParameterOutOfRangeError,
     InvalidPathError, AlarmError
 )
-from .parameters import ParameterManager
-from .motion import MotionController
+from .parameters import ParameterManager, TransferProgress
+from .sync import SyncReport
+from .motion import MotionController, PRPath, PRTableReport, load_pr_table
+from .sequence import PRSequenceRunner, SequenceReport, MoveResult
 from .monitor import StatusMonitor
+from .scope import TraceRecorder, DEFAULT_TRACE_CAPACITY
+from .history import StatusHistory, DEFAULT_HISTORY_CAPACITY
 from ..protocols.serial import SerialConnection
 from ..protocols.modbus import ModbusClient
+from ..protocols.cache import CacheStats
+from ..protocols.bus import ModbusBus
+from ..protocols.keepalive import KeepaliveStats
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +66,12 @@ class L7Driver:
         Serial baudrate (default: 38400)
     timeout : float, optional
         Communication timeout in seconds (default: 1.0)
+    bus : ModbusBus, optional
+        Shared bus to communicate through instead of opening ``port``
+        directly (several drives on one RS-485 line)
+    connection : SerialConnection, optional
+        Connection to use instead of opening ``port`` (e.g. a
+        SimulatorConnection); owned and closed by the driver
     
     Examples
     --------
@@ -73,6 +86,11 @@ class L7Driver:
     >>> with L7Driver('COM3') as driver:
     ...     driver.servo_on()
     ...     driver.jog(speed=500)
+    
+    Several drives on one RS-485 line:
+    >>> bus = ModbusBus('COM3')
+    >>> axis1 = L7Driver('COM3', slave_id=1, bus=bus)
+    >>> axis2 = L7Driver('COM3', slave_id=2, bus=bus)
     """
     
     def __init__(
@@ -81,12 +99,21 @@ class L7Driver:
         slave_id: int = 1,
         baudrate: int = 38400,
         timeout: float = 1.0,
+        bus: Optional[ModbusBus] = None,
+        connection: Optional[SerialConnection] = None,
         **kwargs
     ):
         """Initialize L7 driver."""
         # Communication layer
-        self._serial = SerialConnection(port, baudrate, timeout, **kwargs)
-        self._modbus = ModbusClient(self._serial, slave_id)
+        self._bus = bus
+        if bus is not None:
+            self._serial = bus.serial
+            self._modbus = bus.client(slave_id)
+        else:
+            if connection is None:
+                connection = SerialConnection(port, baudrate, timeout, **kwargs)
+            self._serial = connection
+            self._modbus = ModbusClient(self._serial, slave_id)
         
         # Component managers
         self._params = ParameterManager(self._modbus)
@@ -102,6 +129,8 @@ class L7Driver:
         # Callbacks
         self._status_callback: Optional[Callable] = None
         self._alarm_callback: Optional[Callable] = None
+        self._monitor_interval = 0.1
+        self._pr_runner: Optional[PRSequenceRunner] = None
         
         logger.info(f"L7Driver initialized for {port} (slave ID: {slave_id})")
     
@@ -126,15 +155,15 @@ class L7Driver:
             return True
         
         try:
-            # Open serial connection
-            if not self._serial.connect():
+            # Open serial connection (or join the shared bus)
+            if not self._open_transport():
                 return False
             
             # Test communication
             alarm = self._params.read('alarm_code')
             if alarm is None:
                 logger.error("Failed to verify connection")
-                self._serial.disconnect()
+                self._close_transport()
                 return False
             
             self._connected = True
@@ -143,9 +172,10 @@ class L7Driver:
             # Read servo info
             self._read_servo_info()
             
-            # Start monitoring if callbacks are set
-            if self._status_callback or self._alarm_callback:
+            # Start monitoring if callbacks are set or history is recorded
+            if self._status_callback or self._alarm_callback or self._monitor.history is not None:
                 self._monitor.start(
+                    interval=self._monitor_interval,
                     status_callback=self._status_callback,
                     alarm_callback=self._alarm_callback
                 )
@@ -154,7 +184,7 @@ class L7Driver:
             
         except Exception as e:
             logger.error(f"Connection failed: {e}")
-            self._serial.disconnect()
+            self._close_transport()
             return False
     
     def disconnect(self):
@@ -166,15 +196,36 @@ class L7Driver:
         self._monitor.stop()
         
         # Close connection
-        self._serial.disconnect()
+        self._close_transport()
         self._connected = False
         logger.info("Disconnected from L7 servo")
     
+    def _open_transport(self) -> bool:
+        """Open the serial port, or start the shared bus if not running."""
+        if self._bus is not None:
+            return self._bus.connect()
+        return self._serial.connect()
+    
+    def _close_transport(self):
+        """Close the serial port; a shared bus stays open for other drives."""
+        if self._bus is None:
+            self._serial.disconnect()
+    
     @property
     def is_connected(self) -> bool:
         """Check if driver is connected."""
         return self._connected and self._serial.is_connected
     
+    @property
+    def slave_id(self) -> int:
+        """Modbus slave ID of the drive."""
+        return self._modbus.slave_id
+    
+    @property
+    def serial_connection(self) -> SerialConnection:
+        """Serial line of the drive (shared by all drives on a bus)."""
+        return self._serial
+    
     def _check_connection(self):
         """Raise exception if not connected."""
         if not self.is_connected:
@@ -446,6 +497,18 @@ class L7Driver:
         self._check_connection()
         return self._motion.stop_jog()
     
+    def get_jog_stats(self) -> Optional[KeepaliveStats]:
+        """
+        Get timing statistics of the JOG keepalive.
+        
+        Returns
+        -------
+        Optional[KeepaliveStats]
+            Jitter, latency and deadline misses of the running (or last)
+            JOG, None if JOG was never started
+        """
+        return self._motion.jog_stats
+    
     def home(self, mode: int = 0, high_speed: int = 500, low_speed: int = 50) -> bool:
         """
         Start homing sequence.
@@ -576,7 +639,11 @@ class L7Driver:
         self._check_connection()
         return self._params.restore_defaults()
     
-    def export_parameters(self, filename: str) -> bool:
+    def export_parameters(
+        self,
+        filename: str,
+        progress: Optional[Callable[[TransferProgress], None]] = None
+    ) -> bool:
         """
         Export parameters to file.
         
@@ -584,6 +651,8 @@ class L7Driver:
         ----------
         filename : str
             Output filename
+        progress : Optional[Callable[[TransferProgress], None]]
+            Called after each block read with transfer progress
             
         Returns
         -------
@@ -596,9 +665,13 @@ class L7Driver:
             If not connected
         """
         self._check_connection()
-        return self._params.export_to_file(filename)
+        return self._params.export_to_file(filename, progress)
     
-    def import_parameters(self, filename: str) -> bool:
+    def import_parameters(
+        self,
+        filename: str,
+        progress: Optional[Callable[[TransferProgress], None]] = None
+    ) -> bool:
         """
         Import parameters from file.
         
@@ -606,11 +679,44 @@ class L7Driver:
         ----------
         filename : str
             Input filename
+        progress : Optional[Callable[[TransferProgress], None]]
+            Called after each block write with transfer progress
             
         Returns
         -------
         bool
-            True if successful
+            True if every setting in the file was written
+            
+        Raises
+        ------
+        NotConnectedError
+            If not connected
+        """
+        self._check_connection()
+        return self._params.import_from_file(filename, progress)
+    
+    def sync_parameters(
+        self,
+        target: Union[str, Dict[str, Any]],
+        dry_run: bool = False,
+        progress: Optional[Callable[[TransferProgress], None]] = None
+    ) -> SyncReport:
+        """
+        Write only the parameters that differ from a target set.
+        
+        Parameters
+        ----------
+        target : Union[str, Dict[str, Any]]
+            Parameter file or name-value pairs
+        dry_run : bool
+            Only compare, write nothing
+        progress : Optional[Callable[[TransferProgress], None]]
+            Called after each block read and write
+            
+        Returns
+        -------
+        SyncReport
+            Changed, unchanged, failed, missing and skipped parameters
             
         Raises
         ------
@@ -618,7 +724,63 @@ class L7Driver:
             If not connected
         """
         self._check_connection()
-        return self._params.import_from_file(filename)
+        if isinstance(target, str):
+            return self._params.sync_from_file(target, dry_run, progress)
+        return self._params.sync(target, dry_run, progress)
+    
+    def compare_parameters(self, reference: Union['L7Driver', str, Dict[str, Any]]) -> SyncReport:
+        """
+        Compare settings against another drive or a golden file.
+        
+        Nothing is written. ``changed`` maps each differing parameter to
+        (value on this drive, reference value).
+        
+        Parameters
+        ----------
+        reference : Union[L7Driver, str, Dict[str, Any]]
+            Connected drive, parameter file or name-value pairs
+            
+        Returns
+        -------
+        SyncReport
+            Dry-run report
+            
+        Raises
+        ------
+        NotConnectedError
+            If not connected
+        """
+        if isinstance(reference, L7Driver):
+            reference._check_connection()
+            reference = reference._params.read_settings()
+        return self.sync_parameters(reference, dry_run=True)
+    
+    def enable_register_cache(self, enabled: bool = True):
+        """
+        Serve repeated reads from the register cache.
+        
+        Configuration registers stay cached until written, live status
+        registers for a few milliseconds (see REGISTER_CACHE_TTL).
+        
+        Parameters
+        ----------
+        enabled : bool
+            True to enable, False to always read from the drive
+        """
+        self._modbus.cache.enabled = enabled
+        if not enabled:
+            self._modbus.cache.clear()
+    
+    def get_cache_stats(self) -> CacheStats:
+        """
+        Get register cache counters.
+        
+        Returns
+        -------
+        CacheStats
+            Hits, misses, evictions, invalidations and cached registers
+        """
+        return self._modbus.cache.stats
     
     # ==================== Gain Adjustment ====================
     
@@ -779,6 +941,119 @@ class L7Driver:
         self._check_connection()
         return self._monitor.is_servo_ready()
     
+    def get_status_snapshot(self) -> Dict[str, Any]:
+        """
+        Read position, speed, torque, I/O, bus voltage, temperature and alarm.
+        
+        Returns
+        -------
+        Dict[str, Any]
+            Status values (None for failed reads)
+            
+        Raises
+        ------
+        NotConnectedError
+            If not connected
+        """
+        self._check_connection()
+        return self._monitor.read_snapshot()
+    
+    def enable_status_mapping(self) -> bool:
+        """
+        Fetch status snapshots through the mapping parameters.
+        
+        Programs PA0.50-57 so the monitored status values are read with
+        one coherent transaction per cycle.
+        
+        Returns
+        -------
+        bool
+            True if the mapping was configured
+            
+        Raises
+        ------
+        NotConnectedError
+            If not connected
+        """
+        self._check_connection()
+        return self._monitor.enable_mapping()
+    
+    def enable_status_history(
+        self,
+        capacity: int = DEFAULT_HISTORY_CAPACITY,
+        interval: float = 0.1
+    ) -> StatusHistory:
+        """
+        Record every status monitoring cycle in a columnar history.
+        
+        Starts status monitoring if it is not running yet (now, or on
+        :meth:`connect`).
+        
+        Parameters
+        ----------
+        capacity : int
+            Samples to preallocate (e.g. ``8 * 3600 * 100`` for 8 hours
+            at 100 Hz)
+        interval : float
+            Monitoring interval in seconds if monitoring is started here
+            
+        Returns
+        -------
+        StatusHistory
+            Recorded samples
+        """
+        history = self._monitor.enable_history(capacity)
+        self._monitor_interval = interval
+        if self._connected and not self._monitor.running:
+            self._monitor.start(
+                interval=interval,
+                status_callback=self._status_callback,
+                alarm_callback=self._alarm_callback
+            )
+        return history
+    
+    @property
+    def status_history(self) -> Optional[StatusHistory]:
+        """Columnar status history, None if not enabled."""
+        return self._monitor.history
+    
+    def create_trace_recorder(
+        self,
+        channels: Optional[List[str]] = None,
+        capacity: int = DEFAULT_TRACE_CAPACITY,
+        use_mapping: bool = False
+    ) -> TraceRecorder:
+        """
+        Create a high-rate trace recorder (software oscilloscope).
+        
+        Parameters
+        ----------
+        channels : Optional[List[str]]
+            Parameter names to sample (default: speed, torque, position
+            error and bus voltage)
+        capacity : int
+            Ring buffer size in samples
+        use_mapping : bool
+            Sample through the mapping parameters; status snapshots fall
+            back to plain block reads
+            
+        Returns
+        -------
+        TraceRecorder
+            Recorder bound to this drive
+            
+        Raises
+        ------
+        NotConnectedError
+            If not connected
+        ImportError
+            If NumPy is not installed
+        """
+        self._check_connection()
+        if use_mapping:
+            self._monitor.disable_mapping()
+        return TraceRecorder(self._modbus, self._params, channels, capacity, use_mapping)
+    
     def set_status_callback(self, callback: Optional[Callable]):
         """
         Set status change callback.
@@ -856,7 +1131,8 @@ class L7Driver:
     
     def set_pr_path(self, path_id: int, position: int, speed: int, 
                    acceleration: int = 100, deceleration: int = 100,
-                   delay: int = 0, s_curve: int = 0) -> bool:
+                   delay: int = 0, s_curve: int = 0,
+                   mode: int = PR_MODE_ABSOLUTE) -> bool:
         """
         Configure PR path.
         
@@ -875,15 +1151,15 @@ class L7Driver:
         delay : int
             Delay time in ms
         s_curve : int
-            S-curve time in ms
+            Special parameter word (last register of the path)
+        mode : int
+            Path mode word (default: absolute position move)
             
         Returns
         -------
         bool
             True if successful
         """
-        from .motion import PRPath
-        
         path = PRPath(
             path_id=path_id,
             position=position,
@@ -891,11 +1167,67 @@ class L7Driver:
             acceleration=acceleration,
             deceleration=deceleration,
             delay=delay,
-            s_curve=s_curve
+            s_curve=s_curve,
+            mode=mode
         )
         
         return self._motion.set_pr_path(path)
     
+    def load_pr_table(
+        self,
+        source: Union[str, List[PRPath], List[Dict[str, Any]]],
+        verify: bool = True
+    ) -> PRTableReport:
+        """
+        Program PR paths from a table and verify them.
+        
+        Consecutive paths are written with shared 0x10 requests and read
+        back with block reads, so a full 16-path recipe takes four
+        requests.
+        
+        Parameters
+        ----------
+        source : Union[str, List[PRPath], List[Dict[str, Any]]]
+            CSV/JSON file, PRPath objects or dictionaries of PRPath fields
+        verify : bool
+            Read the paths back and compare every field
+            
+        Returns
+        -------
+        PRTableReport
+            Written paths and per-path mismatches
+            
+        Raises
+        ------
+        NotConnectedError
+            If not connected
+        InvalidPathError
+            If a path number is invalid
+            
+        Examples
+        --------
+        >>> report = driver.load_pr_table('recipe_a.csv')
+        >>> report.ok, report.mismatches
+        """
+        self._check_connection()
+        if isinstance(source, str):
+            paths = load_pr_table(source)
+        else:
+            paths = [path if isinstance(path, PRPath) else PRPath.from_dict(path) for path in source]
+        return self._motion.write_pr_table(paths, verify)
+    
+    def read_pr_table(self) -> Dict[int, PRPath]:
+        """
+        Read all 16 PR paths with block reads.
+        
+        Returns
+        -------
+        Dict[int, PRPath]
+            Paths read successfully, by path number
+        """
+        self._check_connection()
+        return self._motion.read_pr_table()
+    
     def stop_pr_motion(self) -> bool:
         """
         Stop PR motion.
@@ -965,7 +1297,55 @@ class L7Driver:
             True if complete
         """
         return self._motion.is_pr_complete()
-
+    
+    def run_pr_sequence(
+        self,
+        sequence: List[int],
+        repeat: int = 1,
+        timeout: float = 30.0,
+        dwell: float = 0.0,
+        on_move: Optional[Callable[[MoveResult], None]] = None
+    ) -> SequenceReport:
+        """
+        Run PR paths back to back, starting each as soon as the previous
+        one completes.
+        
+        Completion is polled from the 0x6002 readback with an interval
+        adapted to the learned cycle time of each path.
+        
+        Parameters
+        ----------
+        sequence : List[int]
+            Path numbers in order
+        repeat : int
+            Number of passes (0: until the runner is stopped)
+        timeout : float
+            Maximum time of each move in seconds
+        dwell : float
+            Pause after each move in seconds
+        on_move : Optional[Callable[[MoveResult], None]]
+            Called after every move
+            
+        Returns
+        -------
+        SequenceReport
+            Per-move cycle times and throughput
+            
+        Raises
+        ------
+        NotConnectedError
+            If not connected
+        """
+        self._check_connection()
+        return self.pr_runner.run(sequence, repeat, timeout, dwell, on_move)
+    
+    @property
+    def pr_runner(self) -> PRSequenceRunner:
+        """PR sequence runner of this drive (keeps learned cycle times)."""
+        if self._pr_runner is None:
+            self._pr_runner = PRSequenceRunner(self)
+        return self._pr_runner
+    
     # ==================== Convenience getters for tests ====================
 
     def get_alarm_code(self) -> int:
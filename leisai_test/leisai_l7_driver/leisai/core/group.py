@@ -0,0 +1,401 @@
+"""
+Coordinated PR start of several axes.
+
+:class:`AxisGroup` starts PR paths on several drives as close together as
+the serial lines allow. Axes on one line that run the same path share a
+single broadcast frame (slave 0, 0x6002 = 0x001P), so every drive decodes
+the same bytes at the same time. Drives that ignore broadcasts, and axes
+running different paths, get their prebuilt unicast frames back to back
+under one hold of the line, interleaved across lines. Every start carries
+the time its frame left the port, so the inter-axis skew is measured.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Union, Sequence
+
+from .constants import PR_CONTROL_ADDRESS, PR_PATH_COUNT, BROADCAST_SLAVE_ID, BROADCAST_TURNAROUND
+from .exceptions import CommunicationError, InvalidPathError, NotConnectedError
+from .sequence import PR_STATE_RUNNING, PR_STATE_SETTLING
+from ..protocols.modbus import ModbusRTU, FrameBuffer
+from ..protocols.serial import PriorityLock
+
+logger = logging.getLogger(__name__)
+
+# PA8.02 commands
+PR_TRIGGER = 0x0010
+PR_STOP = 0x0040
+
+
+@dataclass
+class AxisStart:
+    """
+    Command delivery to one axis.
+    
+    Attributes
+    ----------
+    name : str
+        Axis name
+    command : int
+        Value written to 0x6002
+    method : str
+        ``'broadcast'`` or ``'unicast'``
+    sent_at : float
+        ``time.perf_counter()`` when the frame had left the port
+    ok : bool
+        True if the drive took the command
+    error : Optional[str]
+        Reason of a failure
+    """
+    name: str
+    command: int
+    method: str
+    sent_at: float = 0.0
+    ok: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class GroupStart:
+    """Result of a coordinated command."""
+    axes: List[AxisStart] = field(default_factory=list)
+    elapsed: float = 0.0
+    
+    def __getitem__(self, name: str) -> AxisStart:
+        for axis in self.axes:
+            if axis.name == name:
+                return axis
+        raise KeyError(name)
+    
+    @property
+    def ok(self) -> bool:
+        """True if every axis took the command."""
+        return all(axis.ok for axis in self.axes)
+    
+    @property
+    def skew(self) -> float:
+        """Spread of the send times of the axes that took the command."""
+        times = [axis.sent_at for axis in self.axes if axis.ok]
+        return max(times) - min(times) if times else 0.0
+    
+    def summary(self) -> str:
+        """One-line summary."""
+        methods: Dict[str, int] = {}
+        for axis in self.axes:
+            if axis.ok:
+                methods[axis.method] = methods.get(axis.method, 0) + 1
+        started = sum(methods.values())
+        how = ' + '.join(f"{count} {method}" for method, count in methods.items()) or 'none'
+        return (f"{started}/{len(self.axes)} axes ({how}), "
+                f"skew {self.skew * 1e3:.2f} ms, {self.elapsed * 1e3:.1f} ms total")
+
+
+class AxisGroup:
+    """
+    Several drives started and stopped as one.
+    
+    A broadcast is executed by every drive on the line, including drives
+    that are not in the group; use ``broadcast=False`` on lines shared
+    with other equipment. Whether the drives of a line execute broadcasts
+    is learned on the first broadcast trigger by reading every axis back;
+    axes that did not start are then triggered by unicast and the line is
+    not broadcast to again.
+    
+    Parameters
+    ----------
+    axes : Union[Sequence[L7Driver], Dict[str, L7Driver]]
+        Connected drives, optionally named (default name ``PORT:SLAVE``)
+    broadcast : bool
+        Use broadcast frames where all axes of a line get the same command
+    verify : bool
+        Read every broadcast axis back and resend by unicast where needed
+    turnaround : float
+        Silence after a broadcast before the line is released, in seconds
+        
+    Examples
+    --------
+    >>> group = AxisGroup([x_axis, y_axis, z_axis])
+    >>> start = group.trigger_pr(3)
+    >>> print(start.summary())
+    >>> group.wait(start)
+    """
+    
+    def __init__(
+        self,
+        axes: Union[Sequence, Dict[str, object]],
+        broadcast: bool = True,
+        verify: bool = True,
+        turnaround: float = BROADCAST_TURNAROUND
+    ):
+        """Initialize axis group."""
+        if not isinstance(axes, dict):
+            drivers = list(axes)
+            axes = OrderedDict(
+                (f"{driver.serial_connection.port}:{driver.slave_id}", driver) for driver in drivers
+            )
+            if len(axes) != len(drivers):
+                raise ValueError("Axis names are not unique, pass a dict of named drivers")
+        self.axes = OrderedDict(axes)
+        self.broadcast = broadcast
+        self.verify = verify
+        self.turnaround = turnaround
+        self._frames = FrameBuffer()
+        
+        # Serial line (by identity) -> names of its axes
+        self._lines: Dict[int, List[str]] = OrderedDict()
+        self._serials: Dict[int, object] = {}
+        for name, driver in self.axes.items():
+            serial = driver.serial_connection
+            self._lines.setdefault(id(serial), []).append(name)
+            self._serials[id(serial)] = serial
+        # None until a broadcast trigger shows whether the drives execute it
+        self._support: Dict[int, Optional[bool]] = {key: None for key in self._lines}
+    
+    @property
+    def broadcast_support(self) -> Dict[str, Optional[bool]]:
+        """Port -> whether its drives execute broadcasts (None: unknown)."""
+        return {self._serials[key].port: value for key, value in self._support.items()}
+    
+    def trigger_pr(self, path: Union[int, Dict[str, int]]) -> GroupStart:
+        """
+        Start PR paths on the group.
+        
+        Parameters
+        ----------
+        path : Union[int, Dict[str, int]]
+            Path for every axis, or axis name -> path for some axes
+            
+        Returns
+        -------
+        GroupStart
+            Per-axis delivery, send times and skew
+            
+        Raises
+        ------
+        InvalidPathError
+            If a path number is invalid
+        NotConnectedError
+            If a drive is not connected
+        """
+        if isinstance(path, dict):
+            paths = {name: path[name] for name in self.axes if name in path}
+            unknown = set(path) - set(paths)
+            if unknown:
+                raise KeyError(f"Unknown axes: {sorted(unknown)}")
+        else:
+            paths = {name: path for name in self.axes}
+        for path_id in paths.values():
+            if not 0 <= path_id < PR_PATH_COUNT:
+                raise InvalidPathError(path_id)
+        return self._command({name: PR_TRIGGER | path_id for name, path_id in paths.items()})
+    
+    def stop_pr(self) -> GroupStart:
+        """
+        Stop PR motion on every axis (0x6002 = 0x0040).
+        
+        Returns
+        -------
+        GroupStart
+            Per-axis delivery
+        """
+        return self._command({name: PR_STOP for name in self.axes})
+    
+    def wait(self, start: GroupStart, timeout: float = 30.0, poll: float = 0.005) -> Dict[str, Optional[float]]:
+        """
+        Wait until the started paths complete.
+        
+        Parameters
+        ----------
+        start : GroupStart
+            Result of :meth:`trigger_pr`
+        timeout : float
+            Maximum wait in seconds
+        poll : float
+            Poll interval in seconds
+            
+        Returns
+        -------
+        Dict[str, Optional[float]]
+            Axis name -> seconds from its start to detected completion,
+            None if it did not complete in time
+        """
+        pending = {axis.name: axis for axis in start.axes
+                   if axis.ok and axis.command & 0xFFF0 == PR_TRIGGER}
+        done: Dict[str, Optional[float]] = {name: None for name in pending}
+        deadline = time.perf_counter() + timeout
+        
+        while pending:
+            for name, axis in list(pending.items()):
+                if self.axes[name].get_control_operation() == axis.command & 0x000F:
+                    done[name] = time.perf_counter() - axis.sent_at
+                    del pending[name]
+            if pending:
+                if time.perf_counter() > deadline:
+                    logger.warning(f"PR not complete on {sorted(pending)}")
+                    break
+                time.sleep(poll)
+        return done
+    
+    # ==================== Delivery ====================
+    
+    def _command(self, commands: Dict[str, int]) -> GroupStart:
+        """Deliver 0x6002 commands, broadcasting where possible."""
+        for name in commands:
+            if not self.axes[name].is_connected:
+                raise NotConnectedError()
+                
+        begin = time.perf_counter()
+        broadcasts: Dict[int, int] = OrderedDict()
+        unicasts: Dict[int, List[str]] = OrderedDict()
+        for key, line in self._lines.items():
+            names = [name for name in line if name in commands]
+            if not names:
+                continue
+            values = {commands[name] for name in names}
+            if (self.broadcast and len(names) > 1 and len(names) == len(line)
+                    and len(values) == 1 and self._support[key] is not False
+                    and self._can_probe(key, names, values.pop())):
+                broadcasts[key] = commands[names[0]]
+            else:
+                unicasts[key] = names
+                
+        results: Dict[str, AxisStart] = {}
+        self._send(broadcasts, unicasts, commands, results)
+        if broadcasts and self.verify:
+            self._verify(broadcasts, commands, results)
+            
+        start = GroupStart([results[name] for name in commands], time.perf_counter() - begin)
+        logger.debug(f"Group command: {start.summary()}")
+        return start
+    
+    def _can_probe(self, key: int, names: List[str], command: int) -> bool:
+        """
+        Check that a first broadcast trigger can be verified.
+        
+        While support is unknown, a drive already showing the readback
+        expected after the trigger would look as if it executed the
+        broadcast; such a line is triggered by unicast this time.
+        """
+        if self._support[key] is not None or command == PR_STOP or not self.verify:
+            return True
+        for name in names:
+            state = self.axes[name].get_control_operation()
+            if state is None or self._accepted(state, command):
+                return False
+        return True
+    
+    def _frame(self, slave_id: int, command: int) -> bytes:
+        """Build a 0x06 frame writing ``command`` to 0x6002."""
+        return bytes(self._frames.request(
+            slave_id, ModbusRTU.WRITE_SINGLE_REGISTER, PR_CONTROL_ADDRESS, command
+        ))
+    
+    def _send(
+        self,
+        broadcasts: Dict[int, int],
+        unicasts: Dict[int, List[str]],
+        commands: Dict[str, int],
+        results: Dict[str, AxisStart]
+    ):
+        """Send all frames while holding every involved line at high priority."""
+        frames = {key: self._frame(BROADCAST_SLAVE_ID, command) for key, command in broadcasts.items()}
+        queues = {key: [(name, self._frame(self.axes[name].slave_id, commands[name])) for name in names]
+                  for key, names in unicasts.items()}
+                  
+        with ExitStack() as stack:
+            # Fixed order, so two groups sharing lines cannot deadlock
+            for key in sorted(set(broadcasts) | set(unicasts)):
+                stack.enter_context(self._serials[key].transaction_lock.priority(PriorityLock.HIGH))
+                
+            last_broadcast = None
+            for key, frame in frames.items():
+                serial = self._serials[key]
+                sent_at, error = 0.0, None
+                try:
+                    serial.reset_buffers()
+                    serial.write(frame)
+                    sent_at = last_broadcast = time.perf_counter()
+                except CommunicationError as e:
+                    error = str(e)
+                for name in self._lines[key]:
+                    results[name] = AxisStart(name, broadcasts[key], 'broadcast', sent_at, error is None, error)
+                    
+            # Unicast: one frame per line and round, lines interleaved
+            while any(queues.values()):
+                in_flight = []
+                for key, queue in queues.items():
+                    if not queue:
+                        continue
+                    name, frame = queue.pop(0)
+                    serial = self._serials[key]
+                    try:
+                        serial.reset_buffers()
+                        serial.write(frame)
+                        in_flight.append((serial, name, frame, time.perf_counter()))
+                    except CommunicationError as e:
+                        results[name] = AxisStart(name, commands[name], 'unicast', error=str(e))
+                for serial, name, frame, sent_at in in_flight:
+                    try:
+                        response = serial.read_frame(len(frame))
+                        error = None if response == frame else "Command rejected"
+                    except CommunicationError as e:
+                        error = str(e)
+                    results[name] = AxisStart(name, commands[name], 'unicast', sent_at, error is None, error)
+                    
+            if last_broadcast is not None:
+                remaining = self.turnaround - (time.perf_counter() - last_broadcast)
+                if remaining > 0:
+                    time.sleep(remaining)
+    
+    def _verify(self, broadcasts: Dict[int, int], commands: Dict[str, int], results: Dict[str, AxisStart]):
+        """Read broadcast axes back; resend by unicast where that is safe."""
+        resend: Dict[int, List[str]] = OrderedDict()
+        for key, command in broadcasts.items():
+            names = [name for name in self._lines[key] if results[name].ok]
+            missed = {}
+            for name in names:
+                state = self.axes[name].get_control_operation()
+                if not self._accepted(state, command):
+                    missed[name] = state
+            if not names:
+                continue
+                
+            probing = self._support[key] is None and command != PR_STOP
+            if probing:
+                self._support[key] = not missed
+                port = self._serials[key].port
+                if missed:
+                    logger.warning(f"Drives on {port} ignore broadcasts, using unicast")
+                else:
+                    logger.info(f"Drives on {port} execute broadcasts")
+                    
+            if missed and (probing or command == PR_STOP):
+                # Stopping again is harmless; an unconfirmed first trigger did not start
+                resend[key] = list(missed)
+            else:
+                for name, state in missed.items():
+                    state_text = 'unreadable' if state is None else f"0x{state:04X}"
+                    results[name].ok = False
+                    results[name].error = f"Not started (PA8.02 {state_text})"
+                    
+        if resend:
+            self._send({}, resend, commands, results)
+    
+    @staticmethod
+    def _accepted(state: Optional[int], command: int) -> bool:
+        """
+        True if a 0x6002 readback shows that ``command`` was received.
+        
+        A trigger reading back unchanged (0x001P) is latched but not yet
+        responded to; the drive did get the frame and will start the path,
+        so it counts as accepted rather than as a missed broadcast.
+        """
+        if state is None:
+            return False
+        if command == PR_STOP:
+            return not state & PR_STATE_RUNNING
+        path_id = command & 0x000F
+        return state in (command, PR_STATE_RUNNING | path_id, PR_STATE_SETTLING, path_id)
@@ -0,0 +1,294 @@
+"""
+Columnar status history for L7 servo drivers.
+
+Monitoring samples are stored as fixed-width typed columns (``array``)
+with a shared timestamp column instead of one dict per sample, so an
+8-hour capture at 100 Hz stays in the tens of MB. Time windows are
+returned as zero-copy ``memoryview`` slices; ``numpy.frombuffer`` wraps
+them without copying as well.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import reduce
+from operator import and_
+from threading import Lock
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+
+# Status key -> array typecode (raw register values as read by the monitor)
+HISTORY_COLUMNS: Dict[str, str] = {
+    'alarm': 'H',
+    'position': 'i',
+    'speed': 'H',
+    'torque': 'H',
+    'di_status': 'H',
+    'do_status': 'H',
+    'bus_voltage': 'H',
+    'temperature': 'H',
+}
+
+DEFAULT_HISTORY_CAPACITY = 4096
+
+
+@dataclass
+class HistoryWindow:
+    """
+    Read-only view of a range of samples.
+    
+    Attributes
+    ----------
+    times : memoryview
+        Timestamps (``time.time()`` seconds, float64)
+    columns : Dict[str, memoryview]
+        Values of each column
+    valid : memoryview
+        Bit mask per sample; bit ``i`` is set if column ``i`` was read
+    names : List[str]
+        Column names in bit order
+    """
+    times: memoryview
+    columns: Dict[str, memoryview]
+    valid: memoryview
+    names: List[str]
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def __getitem__(self, name: str) -> memoryview:
+        """Values of one column."""
+        return self.columns[name]
+    
+    def is_valid(self, name: str, index: int) -> bool:
+        """True if ``name`` was read successfully in sample ``index``."""
+        return bool(self.valid[index] >> self.names.index(name) & 1)
+    
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate samples as status dicts (None for failed reads).
+        
+        Yields
+        ------
+        Dict[str, Any]
+            Status values plus ``'time'``
+        """
+        for index, timestamp in enumerate(self.times):
+            mask = self.valid[index]
+            row = {'time': timestamp}
+            for bit, name in enumerate(self.names):
+                row[name] = self.columns[name][index] if mask >> bit & 1 else None
+            yield row
+
+
+class StatusHistory:
+    """
+    Append-only time series of monitor status samples.
+    
+    Columns are preallocated typed arrays that grow by doubling, so
+    appending is amortised O(1). Growing allocates new arrays rather
+    than resizing in place, so windows handed out earlier stay valid.
+    
+    Parameters
+    ----------
+    columns : Optional[Dict[str, str]]
+        Column name -> ``array`` typecode (default: HISTORY_COLUMNS)
+    capacity : int
+        Samples to preallocate (e.g. ``8 * 3600 * 100`` for a shift at
+        100 Hz, avoiding any regrowth)
+        
+    Examples
+    --------
+    >>> history = driver.enable_status_history(capacity=8 * 3600 * 100)
+    >>> window = history.window(time.time() - 60)
+    >>> max(window['speed'])
+    >>> plot = history.downsample(1000)
+    """
+    
+    def __init__(self, columns: Optional[Dict[str, str]] = None, capacity: int = DEFAULT_HISTORY_CAPACITY):
+        """Initialize status history."""
+        self._typecodes = dict(columns or HISTORY_COLUMNS)
+        self.names: List[str] = list(self._typecodes)
+        self._mask_typecode = 'B' if len(self.names) <= 8 else 'I' if len(self.names) <= 32 else 'Q'
+        self._count = 0
+        self._lock = Lock()
+        self._allocate(max(1, capacity))
+    
+    def _allocate(self, capacity: int):
+        """Allocate columns for ``capacity`` samples, copying existing ones."""
+        count = self._count
+        times = array('d', bytes(8 * capacity))
+        valid = array(self._mask_typecode, bytes(array(self._mask_typecode).itemsize * capacity))
+        columns = {
+            name: array(code, bytes(array(code).itemsize * capacity))
+            for name, code in self._typecodes.items()
+        }
+        if count:
+            times[:count] = self._times[:count]
+            valid[:count] = self._valid[:count]
+            for name, column in columns.items():
+                column[:count] = self._columns[name][:count]
+        self._times, self._valid, self._columns = times, valid, columns
+        self._capacity = capacity
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def capacity(self) -> int:
+        """Allocated samples."""
+        return self._capacity
+    
+    @property
+    def nbytes(self) -> int:
+        """Allocated memory in bytes."""
+        itemsize = self._times.itemsize + self._valid.itemsize
+        itemsize += sum(column.itemsize for column in self._columns.values())
+        return itemsize * self._capacity
+    
+    def append(self, timestamp: float, status: Dict[str, Any]):
+        """
+        Append one sample.
+        
+        Parameters
+        ----------
+        timestamp : float
+            Sample time (``time.time()``)
+        status : Dict[str, Any]
+            Status values; missing or None values are marked invalid
+        """
+        with self._lock:
+            index = self._count
+            if index == self._capacity:
+                self._allocate(2 * self._capacity)
+                
+            mask = 0
+            for bit, name in enumerate(self.names):
+                value = status.get(name)
+                if value is None:
+                    self._columns[name][index] = 0
+                else:
+                    self._columns[name][index] = value
+                    mask |= 1 << bit
+            self._times[index] = timestamp
+            self._valid[index] = mask
+            self._count = index + 1
+    
+    def clear(self):
+        """Drop all samples; windows taken earlier keep their data."""
+        with self._lock:
+            self._count = 0
+            self._allocate(self._capacity)
+    
+    def _view(self, start: int, stop: int, step: int = 1) -> HistoryWindow:
+        """Zero-copy view of samples [start, stop) (lock held)."""
+        section = slice(start, stop, step)
+        return HistoryWindow(
+            memoryview(self._times)[section],
+            {name: memoryview(column)[section] for name, column in self._columns.items()},
+            memoryview(self._valid)[section],
+            self.names,
+        )
+    
+    def _range(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        """Index range of samples with start <= time <= end (lock held)."""
+        times = memoryview(self._times)[:self._count]
+        first = 0 if start is None else bisect_left(times, start)
+        last = self._count if end is None else bisect_right(times, end)
+        return first, max(first, last)
+    
+    def window(self, start: Optional[float] = None, end: Optional[float] = None) -> HistoryWindow:
+        """
+        Samples within a time range, without copying.
+        
+        Parameters
+        ----------
+        start : Optional[float]
+            First timestamp (default: oldest sample)
+        end : Optional[float]
+            Last timestamp (default: newest sample)
+            
+        Returns
+        -------
+        HistoryWindow
+            Zero-copy view; stays valid while more samples are appended
+        """
+        with self._lock:
+            return self._view(*self._range(start, end))
+    
+    def last(self, samples: int) -> HistoryWindow:
+        """
+        Most recent samples, without copying.
+        
+        Parameters
+        ----------
+        samples : int
+            Number of samples
+            
+        Returns
+        -------
+        HistoryWindow
+            Zero-copy view
+        """
+        with self._lock:
+            return self._view(max(0, self._count - samples), self._count)
+    
+    def downsample(
+        self,
+        points: int,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        method: str = 'minmax'
+    ) -> HistoryWindow:
+        """
+        Reduce a time range to about ``points`` samples for plotting.
+        
+        Parameters
+        ----------
+        points : int
+            Target number of samples
+        start : Optional[float]
+            First timestamp (default: oldest sample)
+        end : Optional[float]
+            Last timestamp (default: newest sample)
+        method : str
+            ``'minmax'`` keeps the minimum and maximum sample of every
+            bucket of each column, so spikes stay visible; ``'stride'``
+            takes every n-th sample as a zero-copy strided view
+            
+        Returns
+        -------
+        HistoryWindow
+            Reduced samples (``'minmax'`` returns copies, two per bucket)
+        """
+        with self._lock:
+            first, last = self._range(start, end)
+            count = last - first
+            if count <= points or points <= 0:
+                return self._view(first, last)
+            if method == 'stride':
+                return self._view(first, last, -(-count // points))
+            if method != 'minmax':
+                raise ValueError(f"Unknown downsampling method: {method}")
+            window = self._view(first, last)
+            
+        buckets = max(1, points // 2)
+        size = -(-count // buckets)
+        times = array('d')
+        valid = array(self._mask_typecode)
+        columns = {name: array(code) for name, code in self._typecodes.items()}
+        for begin in range(0, count, size):
+            stop = min(begin + size, count)
+            # Per bucket: the times of its first and last sample; a column
+            # is valid only if every read in the bucket succeeded
+            mask = reduce(and_, window.valid[begin:stop])
+            times.extend((window.times[begin], window.times[stop - 1]))
+            valid.extend((mask, mask))
+            for name, column in columns.items():
+                values = window.columns[name][begin:stop]
+                column.extend((min(values), max(values)))
+        return HistoryWindow(
+            memoryview(times),
+            {name: memoryview(column) for name, column in columns.items()},
+            memoryview(valid),
+            self.names,
+        )
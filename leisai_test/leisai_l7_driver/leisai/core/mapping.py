@@ -0,0 +1,144 @@
+"""
+Mapping parameter layouts for L7 servo drivers.
+
+The L7 mapping parameters PA0.40-47 (0x0050-0x005F) mirror the
+parameters selected by the pointers PA0.50-57 (0x0064-0x0073), so
+scattered status registers can be read in one contiguous request.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable, List, Dict, Tuple
+
+from .constants import (
+    PARAMETER_32BIT, MAPPING_POINTER, MAPPING_POINTER_32BIT,
+    MAPPING_FILLER_POINTER, MAPPING_VALUE_BASE, MAPPING_POINTER_BASE, MAPPING_SLOTS
+)
+from .exceptions import ParameterError, InvalidParameterError
+from .planner import decode_fields
+
+
+@dataclass
+class MappingLayout:
+    """
+    Assignment of parameters to mapping slots.
+    
+    Attributes
+    ----------
+    pointers : List[Tuple[int, int]]
+        (PH, PL) pointer codes of each used slot
+    fields : List[Tuple[str, int, int]]
+        (name, offset, width) of each parameter within the value block
+    """
+    pointers: List[Tuple[int, int]] = field(default_factory=list)
+    fields: List[Tuple[str, int, int]] = field(default_factory=list)
+    
+    @property
+    def names(self) -> List[str]:
+        """Mapped parameter names."""
+        return [name for name, _, _ in self.fields]
+    
+    @property
+    def value_address(self) -> int:
+        """First register of the mapped values (PA0.40)."""
+        return MAPPING_VALUE_BASE
+    
+    @property
+    def value_count(self) -> int:
+        """Number of value registers to read per snapshot."""
+        return 2 * len(self.pointers)
+    
+    @property
+    def pointer_address(self) -> int:
+        """First pointer register (PA0.50)."""
+        return MAPPING_POINTER_BASE
+    
+    def pointer_registers(self) -> List[int]:
+        """Pointer register values (PH, PL per slot) for one 0x10 write."""
+        registers = []
+        for high, low in self.pointers:
+            registers.extend((high, low))
+        return registers
+    
+    def decode(self, values: List[int]) -> Dict[str, int]:
+        """
+        Decode parameter values from the mapped value registers.
+        
+        Parameters
+        ----------
+        values : List[int]
+            Registers read from ``value_address``
+            
+        Returns
+        -------
+        Dict[str, int]
+            Parameter values (32-bit values as signed integers)
+        """
+        return decode_fields(self.fields, values)
+
+
+def plan_mapping(names: Iterable[str]) -> MappingLayout:
+    """
+    Assign parameters to the eight mapping slots.
+    
+    A 32-bit parameter takes a whole slot (PH = PL); two 16-bit
+    parameters share one slot (PH, PL). A 16-bit parameter that only
+    exists as one word of a 32-bit parameter (alarm_code) maps the whole
+    32-bit parameter and takes its low word.
+    
+    Parameters
+    ----------
+    names : Iterable[str]
+        Parameter names from MAPPING_POINTER
+        
+    Returns
+    -------
+    MappingLayout
+        Slot assignment
+        
+    Raises
+    ------
+    InvalidParameterError
+        If a parameter cannot be mapped
+    ParameterError
+        If the parameters need more than eight slots
+        
+    Examples
+    --------
+    >>> layout = plan_mapping(['encoder_position', 'motor_speed', 'torque_feedback'])
+    >>> [(hex(h), hex(l)) for h, l in layout.pointers]
+    [('0xb24', '0xb24'), ('0xb06', '0xb07')]
+    """
+    layout = MappingLayout()
+    wide_slots: Dict[int, int] = {}
+    half_slot = None
+    
+    for name in dict.fromkeys(names):
+        if name not in MAPPING_POINTER:
+            raise InvalidParameterError(name, message=f"Parameter cannot be mapped: {name}")
+        pointer = MAPPING_POINTER[name]
+        
+        if pointer in MAPPING_POINTER_32BIT:
+            slot = wide_slots.get(pointer)
+            if slot is None:
+                slot = wide_slots[pointer] = len(layout.pointers)
+                layout.pointers.append((pointer, pointer))
+            if name in PARAMETER_32BIT:
+                layout.fields.append((name, 2 * slot, 2))
+            else:
+                layout.fields.append((name, 2 * slot + 1, 1))
+        elif half_slot is not None:
+            layout.pointers[half_slot] = (layout.pointers[half_slot][0], pointer)
+            layout.fields.append((name, 2 * half_slot + 1, 1))
+            half_slot = None
+        else:
+            half_slot = len(layout.pointers)
+            layout.pointers.append((pointer, MAPPING_FILLER_POINTER))
+            layout.fields.append((name, 2 * half_slot, 1))
+            
+    if len(layout.pointers) > MAPPING_SLOTS:
+        raise ParameterError(
+            message=f"{len(layout.pointers)} mapping slots needed, "
+                    f"only {MAPPING_SLOTS} available"
+        )
+        
+    return layout
@@ -11,9 +11,48 @@ from threading import Thread, Event
 
 from .constants import AlarmCode, DISignal, DOSignal
 from .exceptions import AlarmError
+from .history import StatusHistory, DEFAULT_HISTORY_CAPACITY
 
 logger = logging.getLogger(__name__)
 
+# Status dictionary key -> parameter name read each monitoring cycle
+STATUS_PARAMETERS: Dict[str, str] = {
+    'alarm': 'alarm_code',
+    'position': 'encoder_position',
+    'speed': 'motor_speed',
+    'torque': 'torque_feedback',
+    'di_status': 'di_status',
+    'do_status': 'do_status',
+    'bus_voltage': 'dc_bus_voltage',
+    'temperature': 'driver_temperature',
+}
+
+
+def decode_alarm(alarm: Optional[int]) -> Optional[AlarmCode]:
+    """
+    Convert a raw alarm_code register value to an AlarmCode.
+    
+    Parameters
+    ----------
+    alarm : Optional[int]
+        Raw register value
+        
+    Returns
+    -------
+    Optional[AlarmCode]
+        Alarm code (raw value if unknown) or None
+    """
+    if alarm is None:
+        return None
+    # 0xFFDC (65500) appears to indicate no alarm
+    if alarm == 0xFFDC or alarm == 65500:
+        return AlarmCode.NO_ALARM
+    try:
+        return AlarmCode(alarm)
+    except ValueError:
+        # Unknown alarm code
+        return alarm
+
 
 class StatusMonitor:
     """
@@ -41,17 +80,26 @@ class StatusMonitor:
         self._monitor_thread: Optional[Thread] = None
         self._stop_event = Event()
         self._monitor_interval = 0.1
+        self._use_mapping = False
         
         # Callbacks
         self._status_callback: Optional[Callable] = None
         self._alarm_callback: Optional[Callable] = None
         
+        # Columnar record of every cycle (None: not recording)
+        self.history: Optional[StatusHistory] = None
+        
         # Last known state
         self._last_alarm: Optional[int] = None
         self._last_position: Optional[int] = None
         self._last_speed: Optional[int] = None
         self._last_torque: Optional[int] = None
     
+    @property
+    def running(self) -> bool:
+        """True while the monitoring thread runs."""
+        return self._monitor_thread is not None and self._monitor_thread.is_alive()
+    
     def start(
         self,
         interval: float = 0.1,
@@ -70,7 +118,7 @@ class StatusMonitor:
         alarm_callback : Optional[Callable]
             Callback for alarm changes
         """
-        if self._monitor_thread and self._monitor_thread.is_alive():
+        if self.running:
             logger.warning("Monitoring already running")
             return
         
@@ -101,6 +149,8 @@ class StatusMonitor:
             try:
                 # Read current status
                 status_data = self._read_status()
+                if self.history is not None:
+                    self.history.append(time.time(), status_data)
                 
                 # Check for changes
                 self._check_alarm_change(status_data.get('alarm'))
@@ -113,21 +163,67 @@ class StatusMonitor:
                 logger.error(f"Monitoring error: {e}")
                 self._stop_event.wait(1.0)
     
+    def enable_history(self, capacity: int = DEFAULT_HISTORY_CAPACITY) -> StatusHistory:
+        """
+        Record every monitoring cycle in a columnar history.
+        
+        Parameters
+        ----------
+        capacity : int
+            Samples to preallocate
+            
+        Returns
+        -------
+        StatusHistory
+            History the monitor appends to (kept if already enabled)
+        """
+        if self.history is None:
+            self.history = StatusHistory(capacity=capacity)
+        return self.history
+    
+    def disable_history(self):
+        """Stop recording history (the returned history keeps its samples)."""
+        self.history = None
+    
+    def enable_mapping(self) -> bool:
+        """
+        Read status through the mapping parameters (PA0.40-47).
+        
+        Programs the mapping pointers for the monitored parameters so
+        each cycle is a single, coherent read of 0x0050-0x0059.
+        
+        Returns
+        -------
+        bool
+            True if the mapping was configured
+        """
+        self._use_mapping = self._params.configure_mapping(list(STATUS_PARAMETERS.values()))
+        return self._use_mapping
+    
+    def disable_mapping(self):
+        """Read status with plain block reads."""
+        self._use_mapping = False
+    
+    def read_snapshot(self) -> Dict[str, Any]:
+        """
+        Read one status snapshot.
+        
+        Returns
+        -------
+        Dict[str, Any]
+            Status values (None for failed reads)
+        """
+        return self._read_status()
+    
     def _read_status(self) -> Dict[str, Any]:
         """Read current status from servo."""
-        status = {}
-        
-        # Read key parameters
-        status['alarm'] = self._params.read('alarm_code')
-        status['position'] = self._params.read('encoder_position')
-        status['speed'] = self._params.read('motor_speed')
-        status['torque'] = self._params.read('torque_feedback')
-        status['di_status'] = self._params.read('di_status')
-        status['do_status'] = self._params.read('do_status')
-        status['bus_voltage'] = self._params.read('dc_bus_voltage')
-        status['temperature'] = self._params.read('driver_temperature')
-        
-        return status
+        values = None
+        if self._use_mapping:
+            values = self._params.read_mapped()
+        if values is None:
+            # Key parameters all sit in the 0x0B00 status block
+            values = self._params.read_block(list(STATUS_PARAMETERS.values()))
+        return {key: values.get(name) for key, name in STATUS_PARAMETERS.items()}
     
     def _check_alarm_change(self, alarm: Optional[int]):
         """Check for alarm changes."""
@@ -181,17 +277,7 @@ class StatusMonitor:
         Optional[AlarmCode]
             Alarm code or None if failed
         """
-        alarm = self._params.read('alarm_code')
-        if alarm is not None:
-            # 0xFFDC (65500) appears to indicate no alarm
-            if alarm == 0xFFDC or alarm == 65500:
-                return AlarmCode.NO_ALARM
-            try:
-                return AlarmCode(alarm)
-            except ValueError:
-                # Unknown alarm code
-                return alarm
-        return None
+        return decode_alarm(self._params.read('alarm_code'))
     
     def is_servo_ready(self) -> bool:
         """
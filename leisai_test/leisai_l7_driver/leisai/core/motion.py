@@ -5,27 +5,62 @@ This module provides motion control functionality including position,
 speed, torque control, and PR path control.
 """
 
+import csv
+import json
 import logging
 import time
-import threading
-from typing import Optional, List
-from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Tuple, Iterable
+from dataclasses import dataclass, field, fields
 
 from .constants import (
-    PR_PATH_BASE, PR_PATH_SIZE,
+    PR_PATH_BASE, PR_PATH_SIZE, PR_PATH_COUNT, PR_MODE_ABSOLUTE, PARAMETER_ADDRESS,
+    MAX_READ_REGISTERS, MAX_WRITE_REGISTERS,
     HomingMode, MAX_SPEED_RPM, MAX_POSITION, MIN_POSITION
 )
 from .exceptions import (
     InvalidPathError, MotionError,
     ParameterOutOfRangeError
 )
+from ..protocols.keepalive import Keepalive, KeepaliveStats
 
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class PRPath:
-    """PR path configuration."""
+    """
+    PR path configuration.
+    
+    Maps onto the 8 registers of one path in the PR table:
+    [mode, position H, position L, speed, acceleration, deceleration,
+    delay, s_curve].
+    
+    The special word of PR0 (PA9.07, 0x6207) is not stored in the table:
+    the drive maps it directly onto the PR control register PA8.02
+    (0x6002). Writing 0x10 there starts PR0 immediately and reading it
+    returns the PR status, so PR0 must keep ``s_curve`` at 0 and its
+    readback is not compared when verifying a table load.
+    
+    Attributes
+    ----------
+    path_id : int
+        Path number (0-15)
+    position : int
+        Target position (command units, signed 32-bit)
+    speed : int
+        Speed in rpm
+    acceleration : int
+        Acceleration time in ms/1000 rpm
+    deceleration : int
+        Deceleration time in ms/1000 rpm
+    delay : int
+        Dwell time after the move in ms
+    s_curve : int
+        Special parameter word (last register of the path; must be 0
+        for PR0, see above)
+    mode : int
+        Path mode word (default: absolute position move)
+    """
     path_id: int
     position: int
     speed: int
@@ -33,10 +68,11 @@ class PRPath:
     deceleration: int
     delay: int = 0
     s_curve: int = 0
+    mode: int = PR_MODE_ABSOLUTE
     
     def validate(self):
         """Validate path parameters."""
-        if not 0 <= self.path_id <= 15:
+        if not 0 <= self.path_id < PR_PATH_COUNT:
             raise InvalidPathError(self.path_id)
         
         if not MIN_POSITION <= self.position <= MAX_POSITION:
@@ -48,6 +84,176 @@ class PRPath:
             raise ParameterOutOfRangeError(
                 'speed', self.speed, 0, MAX_SPEED_RPM
             )
+        
+        # PR0's special word is PA8.02: a non-zero value would trigger motion
+        if self.path_id == 0 and self.s_curve != 0:
+            raise ParameterOutOfRangeError('s_curve', self.s_curve, 0, 0)
+    
+    @property
+    def address(self) -> int:
+        """First register of the path in the PR table."""
+        return PR_PATH_BASE + (self.path_id * PR_PATH_SIZE)
+    
+    def to_registers(self) -> List[int]:
+        """Register values of the path for one block write."""
+        return [
+            self.mode & 0xFFFF,               # Mode
+            (self.position >> 16) & 0xFFFF,   # Position high
+            self.position & 0xFFFF,           # Position low
+            self.speed & 0xFFFF,              # Speed
+            self.acceleration & 0xFFFF,       # Acceleration
+            self.deceleration & 0xFFFF,       # Deceleration
+            self.delay & 0xFFFF,              # Delay
+            self.s_curve & 0xFFFF,            # Special
+        ]
+    
+    @classmethod
+    def from_registers(cls, path_id: int, registers: List[int]) -> 'PRPath':
+        """
+        Decode a path from its 8 table registers.
+        
+        Parameters
+        ----------
+        path_id : int
+            Path number
+        registers : List[int]
+            Registers read from :attr:`address`
+            
+        Returns
+        -------
+        PRPath
+            Decoded path
+        """
+        mode, high, low, speed, acceleration, deceleration, delay, s_curve = registers[:PR_PATH_SIZE]
+        position = (high << 16) | low
+        if position & 0x80000000:
+            position -= 0x100000000
+        return cls(path_id, position, speed, acceleration, deceleration, delay, s_curve, mode)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PRPath':
+        """
+        Create a path from a dictionary (e.g. a JSON object or CSV row).
+        
+        Missing optional fields take their defaults; numbers may be given
+        as strings, including hex (``"0x41"``).
+        
+        Parameters
+        ----------
+        data : Dict[str, Any]
+            Field values keyed by attribute name
+            
+        Returns
+        -------
+        PRPath
+            Path
+            
+        Raises
+        ------
+        ValueError
+            If a required field is missing or a value is not a number
+        """
+        values = {}
+        for name in (f.name for f in fields(cls)):
+            value = data.get(name)
+            if value is None or value == '':
+                continue
+            values[name] = int(value, 0) if isinstance(value, str) else int(value)
+        try:
+            return cls(**values)
+        except TypeError as e:
+            raise ValueError(f"Invalid PR path {data}: {e}")
+
+
+@dataclass
+class PRTableReport:
+    """
+    Result of programming the PR table.
+    
+    Attributes
+    ----------
+    written : List[int]
+        Paths written successfully
+    failed : List[int]
+        Paths whose write was rejected
+    mismatches : Dict[int, Dict[str, Tuple[int, int]]]
+        Per path: field -> (expected, read back)
+    unreadable : List[int]
+        Paths that could not be read back
+    transactions : int
+        Modbus requests used (writes and reads)
+    elapsed : float
+        Seconds taken
+    """
+    written: List[int] = field(default_factory=list)
+    failed: List[int] = field(default_factory=list)
+    mismatches: Dict[int, Dict[str, Tuple[int, int]]] = field(default_factory=dict)
+    unreadable: List[int] = field(default_factory=list)
+    transactions: int = 0
+    elapsed: float = 0.0
+    
+    @property
+    def ok(self) -> bool:
+        """True if every path was written and verified."""
+        return not (self.failed or self.mismatches or self.unreadable)
+    
+    def summary(self) -> str:
+        """One-line summary."""
+        text = (f"{len(self.written)} paths written, {len(self.failed)} failed, "
+                f"{len(self.mismatches)} mismatched ({self.transactions} requests, "
+                f"{self.elapsed:.2f} s)")
+        if self.unreadable:
+            text += f", {len(self.unreadable)} unreadable"
+        return text
+
+
+def load_pr_table(filename: str) -> List[PRPath]:
+    """
+    Load PR paths from a CSV or JSON file.
+    
+    CSV files have a header row naming the :class:`PRPath` fields
+    (``path_id,position,speed,acceleration,deceleration[,delay,s_curve,mode]``).
+    JSON files hold a list of such objects, or an object with a
+    ``"paths"`` list.
+    
+    Parameters
+    ----------
+    filename : str
+        ``.csv`` or ``.json`` file
+        
+    Returns
+    -------
+    List[PRPath]
+        Paths in file order
+        
+    Raises
+    ------
+    ValueError
+        If a row is invalid
+    """
+    if filename.lower().endswith('.csv'):
+        with open(filename, 'r', newline='') as f:
+            rows = [
+                {key.strip(): value.strip() for key, value in row.items() if key}
+                for row in csv.DictReader(f)
+            ]
+    else:
+        with open(filename, 'r') as f:
+            rows = json.load(f)
+        if isinstance(rows, dict):
+            rows = rows.get('paths', [])
+    return [PRPath.from_dict(row) for row in rows]
+
+
+def _path_runs(path_ids: List[int], max_paths: int) -> List[List[int]]:
+    """Group sorted path numbers into consecutive runs of at most ``max_paths``."""
+    runs: List[List[int]] = []
+    for path_id in sorted(set(path_ids)):
+        if runs and path_id == runs[-1][-1] + 1 and len(runs[-1]) < max_paths:
+            runs[-1].append(path_id)
+        else:
+            runs.append([path_id])
+    return runs
 
 
 class MotionController:
@@ -71,8 +277,8 @@ class MotionController:
         """
         self._modbus = modbus_client
         self._params = param_manager
-        self._jog_thread = None
-        self._jog_stop_event = threading.Event()
+        self._jog_keepalive: Optional[Keepalive] = None
+        self._jog_stats: Optional[KeepaliveStats] = None
     
     # ==================== Basic Motion ====================
     
@@ -223,28 +429,23 @@ class MotionController:
             success = self._params.write('pr_jog_speed', speed)
             
             if success:
-                # Start JOG thread for continuous command sending
-                self._jog_stop_event.clear()
-                self._jog_thread = threading.Thread(
-                    target=self._jog_worker,
-                    args=(direction,),
-                    daemon=True
+                # Renew the JOG command every 50 ms on the high-priority path
+                self._jog_keepalive = Keepalive(
+                    self._modbus.serial, self._modbus.slave_id,
+                    PARAMETER_ADDRESS['aux_function'],
+                    0x4001 if direction else 0x4002,
+                    period=0.05
                 )
-                self._jog_thread.start()
+                success = self._jog_keepalive.start()
         
         return success
     
-    def _jog_worker(self, direction: bool):
-        """JOG worker thread that sends commands every 50ms."""
-        jog_command = 0x4001 if direction else 0x4002
-        
-        while not self._jog_stop_event.is_set():
-            try:
-                self._params.write('aux_function', jog_command)
-                time.sleep(0.05)  # 50ms interval
-            except Exception as e:
-                logger.error(f"JOG command failed: {e}")
-                break
+    @property
+    def jog_stats(self) -> Optional[KeepaliveStats]:
+        """Keepalive timing of the running (or last) JOG, None if never started."""
+        if self._jog_keepalive is not None:
+            return self._jog_keepalive.stats
+        return self._jog_stats
     
     def stop_jog(self) -> bool:
         """
@@ -257,12 +458,11 @@ class MotionController:
         """
         logger.info("Stopping JOG")
         
-        # Signal JOG thread to stop
-        self._jog_stop_event.set()
-        
-        # Wait for thread to finish
-        if self._jog_thread and self._jog_thread.is_alive():
-            self._jog_thread.join(timeout=1.0)
+        # Stop the keepalive, keeping its statistics
+        if self._jog_keepalive is not None:
+            self._jog_keepalive.stop()
+            self._jog_stats = self._jog_keepalive.stats
+            self._jog_keepalive = None
         
         # Stop JOG by writing 0 to aux_function
         return self._params.write('aux_function', 0)
@@ -357,23 +557,8 @@ class MotionController:
         
         logger.info(f"Setting PR path {path.path_id}")
         
-        # Calculate register addresses
-        base_addr = PR_PATH_BASE + (path.path_id * PR_PATH_SIZE)
-        
-        # Prepare path data
-        values = [
-            path.position & 0xFFFF,           # Position low
-            (path.position >> 16) & 0xFFFF,   # Position high
-            path.speed,                       # Speed
-            0,                                # Reserved
-            path.acceleration,                # Acceleration
-            path.deceleration,                # Deceleration
-            path.delay,                       # Delay
-            path.s_curve,                     # S-curve
-        ]
-        
         # Write path data
-        return self._modbus.write_registers(base_addr, values)
+        return self._modbus.write_registers(path.address, path.to_registers())
     
     def execute_pr_path(self, path_id: int) -> bool:
         """
@@ -440,40 +625,133 @@ class MotionController:
     def get_pr_configured_position(self, path_id: int) -> Optional[int]:
         """
         Read configured PR target position for a given path in command units.
-
+        
         Parameters
         ----------
         path_id : int
             PR path ID (0-15)
-
+            
         Returns
         -------
         Optional[int]
             32-bit position value or None if failed
         """
-        if not 0 <= path_id <= 15:
+        if not 0 <= path_id < PR_PATH_COUNT:
             return None
-        # 按文档：大端（高位在前，低位在后）
-        # PR0 高/低 -> 0x6201/0x6202；PR1 高/低 -> 0x6209/0x620A
-        if path_id == 0:
-            high_addr, low_addr = 0x6201, 0x6202
-        elif path_id == 1:
-            high_addr, low_addr = 0x6209, 0x620A
-        else:
-            # 其他路径回退到表基址方式：set_pr_path 写入为 [low, high] 从 base 开始
-            # 为保持一致，这里读取 base(低) 与 base+1(高)，再按大端组合
-            base_addr = PR_PATH_BASE + (path_id * PR_PATH_SIZE)
-            low_addr, high_addr = base_addr, base_addr + 1
-
-        high = self._modbus.read_register(high_addr)
-        low = self._modbus.read_register(low_addr)
-        if low is None or high is None:
+        # 位置在路径第 1/2 个寄存器：大端（高位在前，低位在后）
+        registers = self._modbus.read_registers(
+            PR_PATH_BASE + path_id * PR_PATH_SIZE + 1, 2, use_cache=False
+        )
+        if not registers or len(registers) != 2:
             return None
-        value = ((int(high) & 0xFFFF) << 16) | (int(low) & 0xFFFF)
+        value = (registers[0] << 16) | registers[1]
         if value & 0x80000000:
-            value = value - 0x100000000
+            value -= 0x100000000
         return value
     
+    def read_pr_table(self, path_ids: Optional[Iterable[int]] = None) -> Dict[int, PRPath]:
+        """
+        Read PR paths with block reads (15 paths per request).
+        
+        Parameters
+        ----------
+        path_ids : Optional[Iterable[int]]
+            Paths to read (default: all 16)
+            
+        Returns
+        -------
+        Dict[int, PRPath]
+            Paths read successfully, by path number
+        """
+        paths, _ = self._read_pr_paths(list(range(PR_PATH_COUNT)) if path_ids is None else list(path_ids))
+        return paths
+    
+    def _read_pr_paths(self, path_ids: List[int]) -> Tuple[Dict[int, PRPath], int]:
+        """Read paths in consecutive runs; returns paths and request count."""
+        paths = {}
+        requests = 0
+        for run in _path_runs(path_ids, MAX_READ_REGISTERS // PR_PATH_SIZE):
+            address = PR_PATH_BASE + run[0] * PR_PATH_SIZE
+            count = len(run) * PR_PATH_SIZE
+            registers = self._modbus.read_registers(address, count, use_cache=False)
+            requests += 1
+            if not registers or len(registers) != count:
+                logger.error(f"Failed to read PR paths {run[0]}-{run[-1]}")
+                continue
+            for index, path_id in enumerate(run):
+                offset = index * PR_PATH_SIZE
+                paths[path_id] = PRPath.from_registers(path_id, registers[offset:offset + PR_PATH_SIZE])
+        return paths, requests
+    
+    def write_pr_table(self, paths: Iterable[PRPath], verify: bool = True) -> PRTableReport:
+        """
+        Program PR paths with the fewest 0x10 writes and verify them.
+        
+        Consecutive paths share one write (up to 15 paths, 120
+        registers), so a full 16-path table takes two writes and, with
+        ``verify``, two block reads.
+        
+        Parameters
+        ----------
+        paths : Iterable[PRPath]
+            Paths to program (a later path replaces an earlier one with
+            the same number)
+        verify : bool
+            Read the written paths back and compare every field
+            
+        Returns
+        -------
+        PRTableReport
+            Written paths and per-path mismatches
+            
+        Raises
+        ------
+        InvalidPathError
+            If a path number is invalid
+        ParameterOutOfRangeError
+            If a path value is out of range
+        """
+        start = time.perf_counter()
+        table = {}
+        for path in paths:
+            path.validate()
+            table[path.path_id] = path
+            
+        report = PRTableReport()
+        for run in _path_runs(list(table), MAX_WRITE_REGISTERS // PR_PATH_SIZE):
+            registers = []
+            for path_id in run:
+                registers.extend(table[path_id].to_registers())
+            report.transactions += 1
+            if self._modbus.write_registers(table[run[0]].address, registers):
+                report.written.extend(run)
+            else:
+                logger.error(f"Failed to write PR paths {run[0]}-{run[-1]}")
+                report.failed.extend(run)
+                
+        if verify and report.written:
+            readback, requests = self._read_pr_paths(report.written)
+            report.transactions += requests
+            for path_id in report.written:
+                actual = readback.get(path_id)
+                if actual is None:
+                    report.unreadable.append(path_id)
+                    continue
+                expected = PRPath.from_registers(path_id, table[path_id].to_registers())
+                differences = {
+                    f.name: (getattr(expected, f.name), getattr(actual, f.name))
+                    for f in fields(PRPath)
+                    if getattr(expected, f.name) != getattr(actual, f.name)
+                    # PR0's special word reads back the PR status (PA8.02)
+                    and not (path_id == 0 and f.name == 's_curve')
+                }
+                if differences:
+                    report.mismatches[path_id] = differences
+                    
+        report.elapsed = time.perf_counter() - start
+        logger.info(f"PR table: {report.summary()}")
+        return report
+    
     def is_pr_complete(self) -> bool:
         """
         Check if PR motion is complete.
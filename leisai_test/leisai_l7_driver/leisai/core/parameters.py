@@ -6,21 +6,70 @@ This module handles parameter reading, writing, and management.
 
 import json
 import logging
-from typing import Optional, Any, Dict, List
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Any, Dict, List, Callable
 from pathlib import Path
 
-from .constants import PARAMETER_ADDRESS
+from .constants import (
+    PARAMETER_ADDRESS, PARAMETER_32BIT, READ_ONLY_PARAMETERS, COMMAND_PARAMETERS
+)
 from .exceptions import ParameterError, InvalidParameterError
+from .planner import ReadBlock, WriteBlock, SplitBlocks, plan_reads, plan_writes, DEFAULT_MAX_GAP
+from .mapping import MappingLayout, plan_mapping
+from .sync import SyncReport, diff_parameters, is_setting
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class TransferProgress:
+    """
+    Progress of a bulk parameter read or write.
+    
+    Attributes
+    ----------
+    total : int
+        Number of parameters to transfer
+    done : int
+        Parameters transferred so far (including failed ones)
+    failed : int
+        Parameters that could not be transferred
+    transactions : int
+        Modbus requests issued
+    """
+    total: int
+    done: int = 0
+    failed: int = 0
+    transactions: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the transfer started."""
+        return time.perf_counter() - self.started
+    
+    @property
+    def rate(self) -> float:
+        """Parameters per second."""
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+    
+    def __str__(self) -> str:
+        return (f"{self.done}/{self.total} parameters, {self.transactions} transactions, "
+                f"{self.elapsed:.2f} s ({self.rate:.0f} params/s)")
+
+
+ProgressCallback = Callable[[TransferProgress], None]
+
+
 class ParameterManager:
     """
     Manages servo parameters.
     
     This class provides methods for reading, writing, and managing
-    servo parameters with validation and caching.
+    servo parameters with validation. Cached values are kept per
+    register in the Modbus client's :class:`RegisterCache`.
     """
     
     def __init__(self, modbus_client):
@@ -33,10 +82,15 @@ class ParameterManager:
             Modbus client for communication
         """
         self._modbus = modbus_client
-        self._cache = {}
         self._modified = set()
+        
+        # Block reads the drive rejected (e.g. spanning a hole in the map)
+        self._split_blocks = SplitBlocks()
+        
+        # Active mapping parameter layout (PA0.40-57)
+        self._mapping: Optional[MappingLayout] = None
     
-    def read(self, name: str, use_cache: bool = False) -> Optional[Any]:
+    def read(self, name: str, use_cache: Optional[bool] = None) -> Optional[Any]:
         """
         Read parameter by name.
         
@@ -44,8 +98,9 @@ class ParameterManager:
         ----------
         name : str
             Parameter name
-        use_cache : bool
-            Use cached value if available
+        use_cache : Optional[bool]
+            Use cached value if available (default: the client's
+            ``cache.enabled``)
             
         Returns
         -------
@@ -60,24 +115,12 @@ class ParameterManager:
         if name not in PARAMETER_ADDRESS:
             raise InvalidParameterError(name, message=f"Unknown parameter: {name}")
         
-        # Check cache
-        if use_cache and name in self._cache:
-            return self._cache[name]
-        
-        # Read from device
         address = PARAMETER_ADDRESS[name]
         
         # Handle 32-bit parameters
-        if name in ['encoder_position', 'command_position', 'motor_position_cmd_unit', 'command_position_cmd_unit', 'pr_current_position', 'pr_home_offset']:
-            value = self._read_32bit(address)
-        else:
-            value = self._modbus.read_register(address)
-        
-        # Update cache
-        if value is not None:
-            self._cache[name] = value
-        
-        return value
+        if name in PARAMETER_32BIT:
+            return self._read_32bit(address, use_cache)
+        return self._modbus.read_register(address, use_cache)
     
     def write(self, name: str, value: Any) -> bool:
         """
@@ -106,13 +149,12 @@ class ParameterManager:
         address = PARAMETER_ADDRESS[name]
         
         # Handle 32-bit parameters
-        if name in ['encoder_position', 'command_position', 'motor_position_cmd_unit', 'command_position_cmd_unit', 'pr_current_position', 'pr_home_offset']:
+        if name in PARAMETER_32BIT:
             success = self._write_32bit(address, value)
         else:
             success = self._modbus.write_register(address, value)
         
         if success:
-            self._cache[name] = value
             self._modified.add(name)
         
         return success
@@ -131,15 +173,176 @@ class ParameterManager:
         Dict[str, Any]
             Parameter values
         """
-        values = {}
+        valid = []
         for name in names:
+            if name in PARAMETER_ADDRESS:
+                valid.append(name)
+            else:
+                logger.warning(f"Failed to read {name}: unknown parameter")
+                
+        values = dict.fromkeys(names)
+        values.update(self.read_block(valid))
+        return values
+    
+    def read_block(self, names: List[str], max_gap: int = DEFAULT_MAX_GAP) -> Dict[str, Optional[Any]]:
+        """
+        Read several parameters with as few block reads as possible.
+        
+        Parameters close together in the register map are fetched in a
+        single 0x03 request and decoded from the response. If the drive
+        rejects a block (e.g. it spans an unmapped register), it is split
+        into smaller blocks and not tried again.
+        
+        Parameters
+        ----------
+        names : List[str]
+            Parameter names
+        max_gap : int
+            Maximum number of unused registers spanned inside one block
+            
+        Returns
+        -------
+        Dict[str, Optional[Any]]
+            Parameter values (None for failed reads)
+            
+        Raises
+        ------
+        InvalidParameterError
+            If a parameter name is invalid
+        """
+        return self._read_blocks(plan_reads(names, max_gap=max_gap))
+    
+    def _read_blocks(
+        self,
+        blocks: List[ReadBlock],
+        progress: Optional[TransferProgress] = None,
+        callback: Optional[ProgressCallback] = None
+    ) -> Dict[str, Optional[Any]]:
+        """Read planned blocks, reporting progress after each one."""
+        values = {}
+        for block in blocks:
+            result = self._read_planned_block(block, progress)
+            values.update(result)
+            if progress is not None:
+                progress.done += len(result)
+                progress.failed += sum(value is None for value in result.values())
+                if callback:
+                    callback(progress)
+        return values
+    
+    def _read_planned_block(
+        self,
+        block: ReadBlock,
+        progress: Optional[TransferProgress] = None
+    ) -> Dict[str, Optional[Any]]:
+        """Read one planned block, splitting it in halves if rejected."""
+        key = (block.address, block.count)
+        single = len(block.fields) == 1
+        if progress is not None and (single or key not in self._split_blocks):
+            progress.transactions += 1
+            
+        if single:
+            name = block.fields[0][0]
+            return {name: self.read(name)}
+            
+        merged = key not in self._split_blocks
+        error = None
+        if merged:
             try:
-                values[name] = self.read(name)
+                registers = self._modbus.read_registers(block.address, block.count, raise_errors=True)
             except Exception as e:
-                logger.warning(f"Failed to read {name}: {e}")
-                values[name] = None
+                registers, error = None, e
+            if registers and len(registers) == block.count:
+                self._split_blocks.succeeded(key)
+                return block.decode(registers)
+            logger.debug(f"Block read 0x{block.address:04X}+{block.count} failed ({error}), splitting")
+            
+        values = {}
+        for half in block.split():
+            values.update(self._read_planned_block(half, progress))
+            
+        if merged:
+            self._split_blocks.failed(key, error, all(value is not None for value in values.values()))
         return values
     
+    # ==================== Mapping Parameters ====================
+    
+    @property
+    def mapping(self) -> Optional[MappingLayout]:
+        """Active mapping layout, None if not configured."""
+        return self._mapping
+    
+    def configure_mapping(self, names: List[str], verify: bool = True) -> bool:
+        """
+        Program the mapping pointers (PA0.50-57) for a set of parameters.
+        
+        All pointers are written with a single 0x10 request. Afterwards
+        the mapped values (PA0.40-47) can be fetched in one transaction
+        with :meth:`read_mapped`, giving a coherent snapshot.
+        
+        Parameters
+        ----------
+        names : List[str]
+            Parameter names (at most 8 slots: one per 32-bit parameter,
+            one per pair of 16-bit parameters)
+        verify : bool
+            Read the pointers back and compare
+            
+        Returns
+        -------
+        bool
+            True if successful
+            
+        Raises
+        ------
+        InvalidParameterError
+            If a parameter cannot be mapped
+        ParameterError
+            If the parameters do not fit in the mapping slots
+        """
+        layout = plan_mapping(names)
+        pointers = layout.pointer_registers()
+        
+        self._mapping = None
+        if not self._modbus.write_registers(layout.pointer_address, pointers):
+            logger.error("Failed to write mapping pointers")
+            return False
+            
+        if verify:
+            readback = self._modbus.read_registers(
+                layout.pointer_address, len(pointers), use_cache=False
+            )
+            if readback != pointers:
+                logger.error(f"Mapping pointer verification failed: {readback} != {pointers}")
+                return False
+                
+        self._mapping = layout
+        logger.info(f"Mapping configured: {', '.join(layout.names)}")
+        return True
+    
+    def read_mapped(self) -> Optional[Dict[str, Any]]:
+        """
+        Read all mapped parameters in one transaction.
+        
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            Parameter values, None if failed or no mapping configured
+        """
+        layout = self._mapping
+        if layout is None:
+            return None
+            
+        registers = self._modbus.read_registers(layout.value_address, layout.value_count)
+        if not registers or len(registers) != layout.value_count:
+            return None
+            
+        return layout.decode(registers)
+    
+    def clear_mapping(self):
+        """Forget the active mapping layout (the drive keeps its pointers)."""
+        self._mapping = None
+    
     def write_multiple(self, parameters: Dict[str, Any]) -> Dict[str, bool]:
         """
         Write multiple parameters.
@@ -163,9 +366,89 @@ class ParameterManager:
                 results[name] = False
         return results
     
-    def _read_32bit(self, address: int) -> Optional[int]:
+    def write_block(
+        self,
+        values: Dict[str, Any],
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, bool]:
+        """
+        Write several parameters with as few 0x10 requests as possible.
+        
+        Parameters at consecutive addresses are written together. If the
+        drive rejects a block, it is split in halves down to single
+        parameters, so one bad value only fails itself.
+        
+        Parameters
+        ----------
+        values : Dict[str, Any]
+            Parameter name-value pairs
+        progress : Optional[Callable[[TransferProgress], None]]
+            Called after each block
+            
+        Returns
+        -------
+        Dict[str, bool]
+            Success status for each parameter
+            
+        Raises
+        ------
+        InvalidParameterError
+            If a parameter name is invalid
+        """
+        blocks = plan_writes(values)
+        state = TransferProgress(sum(len(block.fields) for block in blocks))
+        results = self._write_blocks(blocks, state, progress)
+        
+        # Aliases written through another name (e.g. '<name>_h')
+        for name in values:
+            if name not in results:
+                address = PARAMETER_ADDRESS[name]
+                results[name] = all(
+                    ok for other, ok in results.items()
+                    if PARAMETER_ADDRESS[other] <= address < PARAMETER_ADDRESS[other] + 2
+                )
+        return results
+    
+    def _write_blocks(
+        self,
+        blocks: List[WriteBlock],
+        progress: TransferProgress,
+        callback: Optional[ProgressCallback] = None
+    ) -> Dict[str, bool]:
+        """Write planned blocks, reporting progress after each one."""
+        results = {}
+        for block in blocks:
+            result = self._write_planned_block(block, progress)
+            results.update(result)
+            progress.done += len(result)
+            progress.failed += sum(not ok for ok in result.values())
+            if callback:
+                callback(progress)
+        return results
+    
+    def _write_planned_block(self, block: WriteBlock, progress: TransferProgress) -> Dict[str, bool]:
+        """Write one planned block, splitting it in halves if rejected."""
+        progress.transactions += 1
+        if len(block.registers) == 1:
+            ok = self._modbus.write_register(block.address, block.registers[0])
+        else:
+            ok = self._modbus.write_registers(block.address, block.registers)
+            
+        if ok:
+            self._modified.update(block.names)
+            return dict.fromkeys(block.names, True)
+        if len(block.fields) == 1:
+            return {block.names[0]: False}
+            
+        logger.debug(f"Block write 0x{block.address:04X}+{len(block.registers)} failed, splitting")
+        results = {}
+        for half in block.split():
+            results.update(self._write_planned_block(half, progress))
+        return results
+    
+    def _read_32bit(self, address: int, use_cache: Optional[bool] = None) -> Optional[int]:
         """Read 32-bit value from two registers."""
-        values = self._modbus.read_registers(address, 2)
+        values = self._modbus.read_registers(address, 2, use_cache)
         if values and len(values) == 2:
             # Combine high and low words (big-endian: 高位在前，低位在后)
             value = (values[0] << 16) | values[1]
@@ -209,18 +492,32 @@ class ParameterManager:
         """
         logger.warning("Restoring factory defaults")
         # TODO: Implement factory reset command
-        self._cache.clear()
+        self._modbus.cache.clear()
         self._modified.clear()
         return True
     
-    def export_to_file(self, filename: str) -> bool:
+    def export_to_file(
+        self,
+        filename: str,
+        progress: Optional[ProgressCallback] = None,
+        max_gap: int = 0
+    ) -> bool:
         """
         Export parameters to JSON file.
         
+        All parameters are fetched with planned block reads. By default
+        a block only covers consecutive known registers, so no request
+        can hit an unmapped address; a larger ``max_gap`` needs fewer
+        requests on drives whose parameter classes have no holes.
+        
         Parameters
         ----------
         filename : str
             Output filename
+        progress : Optional[Callable[[TransferProgress], None]]
+            Called after each block read
+        max_gap : int
+            Maximum number of unused registers spanned inside one block
             
         Returns
         -------
@@ -229,11 +526,13 @@ class ParameterManager:
         """
         try:
             # Read all parameters
-            params = {}
-            for name, address in PARAMETER_ADDRESS.items():
-                value = self.read(name)
-                if value is not None:
-                    params[name] = value
+            blocks = plan_reads(PARAMETER_ADDRESS, max_gap=max_gap)
+            state = TransferProgress(sum(len(block.fields) for block in blocks))
+            values = self._read_blocks(blocks, state, progress)
+            params = {
+                name: values[name] for name in PARAMETER_ADDRESS if values.get(name) is not None
+            }
+            logger.info(f"Read {state}")
             
             # Save to file
             path = Path(filename)
@@ -247,19 +546,25 @@ class ParameterManager:
             logger.error(f"Failed to export parameters: {e}")
             return False
     
-    def import_from_file(self, filename: str) -> bool:
+    def import_from_file(self, filename: str, progress: Optional[ProgressCallback] = None) -> bool:
         """
         Import parameters from JSON file.
         
+        Settings are written with planned multi-register writes; status
+        (read-only) and command registers in the file are skipped.
+        
         Parameters
         ----------
         filename : str
             Input filename
+        progress : Optional[Callable[[TransferProgress], None]]
+            Called after each block write
             
         Returns
         -------
         bool
-            True if successful
+            True if every writable setting in the file was written;
+            False if any write failed (the others are still written)
         """
         try:
             path = Path(filename)
@@ -267,12 +572,24 @@ class ParameterManager:
                 params = json.load(f)
             
             # Write parameters
+            writable = {}
             for name, value in params.items():
-                if name in PARAMETER_ADDRESS:
-                    self.write(name, value)
-                else:
+                if name not in PARAMETER_ADDRESS:
                     logger.warning(f"Unknown parameter in file: {name}")
-            
+                elif name in READ_ONLY_PARAMETERS or name in COMMAND_PARAMETERS:
+                    logger.debug(f"Skipping {name}: not a writable setting")
+                else:
+                    writable[name] = value
+                    
+            blocks = plan_writes(writable)
+            state = TransferProgress(sum(len(block.fields) for block in blocks))
+            results = self._write_blocks(blocks, state, progress)
+            failed = [name for name, ok in results.items() if not ok]
+            logger.info(f"Wrote {state}")
+            if failed:
+                logger.error(f"Failed to write {len(failed)} parameters: {', '.join(failed)}")
+                return False
+                
             logger.info(f"Parameters imported from {filename}")
             return True
             
@@ -280,6 +597,116 @@ class ParameterManager:
             logger.error(f"Failed to import parameters: {e}")
             return False
     
+    # ==================== Diff / Sync ====================
+    
+    def read_settings(self, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """
+        Read every stored setting (no status or command registers).
+        
+        Parameters
+        ----------
+        progress : Optional[Callable[[TransferProgress], None]]
+            Called after each block read
+            
+        Returns
+        -------
+        Dict[str, Any]
+            Setting values; unreadable settings are left out
+        """
+        names = [name for name in PARAMETER_ADDRESS if is_setting(name)]
+        blocks = plan_reads(names, max_gap=0)
+        state = TransferProgress(sum(len(block.fields) for block in blocks))
+        values = self._read_blocks(blocks, state, progress)
+        return {name: value for name, value in values.items() if value is not None}
+    
+    def sync(
+        self,
+        target: Dict[str, Any],
+        dry_run: bool = False,
+        progress: Optional[ProgressCallback] = None
+    ) -> SyncReport:
+        """
+        Bring the drive to ``target``, writing only what differs.
+        
+        Current values are read with block reads and compared by their
+        register encoding; changed settings (and settings that could not
+        be read) are written with coalesced 0x10 writes.
+        
+        Parameters
+        ----------
+        target : Dict[str, Any]
+            Desired parameter values
+        dry_run : bool
+            Only compare, write nothing
+        progress : Optional[Callable[[TransferProgress], None]]
+            Called after each block read and write
+            
+        Returns
+        -------
+        SyncReport
+            Changed, unchanged, failed, missing and skipped parameters
+        """
+        names = [name for name in target if is_setting(name)]
+        blocks = plan_reads(names, max_gap=0)
+        state = TransferProgress(sum(len(block.fields) for block in blocks))
+        current = self._read_blocks(blocks, state, progress)
+        
+        report = diff_parameters(current, target)
+        report.transactions = state.transactions
+        if dry_run:
+            return report
+            
+        report.dry_run = False
+        pending = dict(report.changed)
+        pending.update((name, (None, target[name])) for name in report.missing)
+        if not pending:
+            return report
+            
+        blocks = plan_writes({name: value for name, (_, value) in pending.items()})
+        state = TransferProgress(sum(len(block.fields) for block in blocks))
+        results = self._write_blocks(blocks, state, progress)
+        report.transactions += state.transactions
+        
+        for name, ok in results.items():
+            if ok:
+                report.changed[name] = pending[name]
+            else:
+                report.changed.pop(name, None)
+                report.failed[name] = pending[name]
+                
+        # Unreadable settings that were written (or failed) are counted there
+        report.missing = [name for name in report.missing if name not in results]
+        
+        logger.info(f"Parameter sync: {report.summary()}")
+        return report
+    
+    def sync_from_file(
+        self,
+        filename: str,
+        dry_run: bool = False,
+        progress: Optional[ProgressCallback] = None
+    ) -> SyncReport:
+        """
+        Sync the drive to a JSON parameter file (see :meth:`sync`).
+        
+        Parameters
+        ----------
+        filename : str
+            Parameter file written by :meth:`export_to_file`
+        dry_run : bool
+            Only compare, write nothing
+        progress : Optional[Callable[[TransferProgress], None]]
+            Called after each block read and write
+            
+        Returns
+        -------
+        SyncReport
+            Sync result
+        """
+        with open(Path(filename), 'r') as f:
+            target = json.load(f)
+        return self.sync(target, dry_run, progress)
+    
     def get_modified(self) -> set:
         """
         Get set of modified parameter names.
@@ -293,4 +720,4 @@ class ParameterManager:
     
     def clear_cache(self):
         """Clear parameter cache."""
-        self._cache.clear()
\ No newline at end of file
+        self._modbus.cache.clear()
\ No newline at end of file
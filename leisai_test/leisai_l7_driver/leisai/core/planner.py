@@ -0,0 +1,372 @@
+"""
+Register read and write planning for L7 servo drivers.
+
+This module merges parameter reads into the fewest Modbus block reads
+(function 0x03) and decodes the individual values from the responses,
+and merges parameter writes into contiguous multi-register writes
+(function 0x10).
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable, List, Dict, Tuple, Optional, Any
+
+from .constants import (
+    PARAMETER_ADDRESS, PARAMETER_32BIT, MAX_READ_REGISTERS, MAX_WRITE_REGISTERS
+)
+from .exceptions import InvalidParameterError, ModbusError
+
+# Default number of unused registers a block may span to avoid another
+# transaction; each costs two bytes on the wire, a new request ~15 bytes
+# plus the slave turnaround
+DEFAULT_MAX_GAP = 16
+
+# Modbus exception code of a request for registers the slave does not have
+ILLEGAL_DATA_ADDRESS = 0x02
+
+# Failed merged reads in a row (each with readable halves) after which a
+# block is read split even without an illegal-address answer
+SPLIT_AFTER_FAILURES = 3
+
+
+def parameter_width(name: str) -> int:
+    """Get the number of registers a parameter occupies."""
+    return 2 if name in PARAMETER_32BIT else 1
+
+
+@dataclass
+class ReadBlock:
+    """
+    Contiguous register range covering one or more parameters.
+    
+    Attributes
+    ----------
+    address : int
+        First register address
+    count : int
+        Number of registers to read
+    fields : List[Tuple[str, int, int]]
+        (name, offset, width) of each parameter within the block
+    """
+    address: int
+    count: int = 0
+    fields: List[Tuple[str, int, int]] = field(default_factory=list)
+    
+    @property
+    def end(self) -> int:
+        """Address after the last register of the block."""
+        return self.address + self.count
+    
+    @property
+    def names(self) -> List[str]:
+        """Parameter names covered by the block."""
+        return [name for name, _, _ in self.fields]
+    
+    def add(self, name: str, address: int, width: int):
+        """Add a parameter, extending the block to cover it."""
+        self.fields.append((name, address - self.address, width))
+        self.count = max(self.count, address + width - self.address)
+    
+    def split(self) -> List['ReadBlock']:
+        """Split the block into two blocks with half of the parameters each."""
+        fields = sorted(self.fields, key=lambda f: f[1])
+        middle = len(fields) // 2
+        halves = []
+        for part in (fields[:middle], fields[middle:]):
+            if not part:
+                continue
+            half = ReadBlock(self.address + part[0][1])
+            for name, offset, width in part:
+                half.add(name, self.address + offset, width)
+            halves.append(half)
+        return halves
+    
+    def decode(self, values: List[int]) -> Dict[str, int]:
+        """
+        Decode parameter values from a block read response.
+        
+        Parameters
+        ----------
+        values : List[int]
+            Register values starting at ``address``
+            
+        Returns
+        -------
+        Dict[str, int]
+            Parameter values (32-bit values as signed integers)
+        """
+        return decode_fields(self.fields, values)
+
+
+class SplitBlocks:
+    """
+    Merged block reads that are issued split.
+    
+    A failed merged read is not enough to give up on a block: a CRC
+    error or a timeout would otherwise degrade every later read of it
+    to one transaction per parameter. A block is only split for good
+    when the drive answers its read with *illegal data address*, or
+    after :data:`SPLIT_AFTER_FAILURES` failures in a row while both of
+    its halves could be read.
+    
+    Keys are ``(address, count)`` tuples.
+    """
+    
+    def __init__(self, max_failures: int = SPLIT_AFTER_FAILURES):
+        """Initialize with no split blocks."""
+        self.max_failures = max_failures
+        self._blocks = set()
+        self._failures: Dict[Tuple[int, int], int] = {}
+    
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return key in self._blocks
+    
+    def __iter__(self):
+        return iter(self._blocks)
+    
+    def __len__(self) -> int:
+        return len(self._blocks)
+    
+    def succeeded(self, key: Tuple[int, int]):
+        """Record a successful merged read."""
+        self._failures.pop(key, None)
+    
+    def failed(self, key: Tuple[int, int], error: Optional[BaseException], halves_read: bool):
+        """
+        Record a failed merged read.
+        
+        Parameters
+        ----------
+        key : Tuple[int, int]
+            Block address and register count
+        error : Optional[BaseException]
+            Exception of the merged read (None for a short response)
+        halves_read : bool
+            True if every parameter was then read from the halves
+        """
+        if isinstance(error, ModbusError) and error.exception_code == ILLEGAL_DATA_ADDRESS:
+            self._blocks.add(key)
+            self._failures.pop(key, None)
+        elif halves_read:
+            failures = self._failures.get(key, 0) + 1
+            if failures >= self.max_failures:
+                self._blocks.add(key)
+                self._failures.pop(key, None)
+            else:
+                self._failures[key] = failures
+
+
+def decode_fields(fields: Iterable[Tuple[str, int, int]], values: List[int]) -> Dict[str, int]:
+    """
+    Decode (name, offset, width) fields from a list of register values.
+    
+    Parameters
+    ----------
+    fields : Iterable[Tuple[str, int, int]]
+        Field layout
+    values : List[int]
+        Register values
+        
+    Returns
+    -------
+    Dict[str, int]
+        Parameter values (32-bit values as signed integers)
+    """
+    result = {}
+    for name, offset, width in fields:
+        if width == 2:
+            # Big-endian: 高位在前，低位在后
+            value = (values[offset] << 16) | values[offset + 1]
+            if value & 0x80000000:
+                value -= 0x100000000
+        else:
+            value = values[offset]
+        result[name] = value
+    return result
+
+
+def plan_reads(
+    names: Iterable[str],
+    max_gap: int = DEFAULT_MAX_GAP,
+    max_count: int = MAX_READ_REGISTERS
+) -> List[ReadBlock]:
+    """
+    Merge parameter reads into the fewest block reads.
+    
+    Parameters are sorted by address and packed into blocks; a new
+    block is started when the next parameter is more than ``max_gap``
+    registers past the end of the current one, or when it would make
+    the block longer than ``max_count`` registers.
+    
+    Parameters
+    ----------
+    names : Iterable[str]
+        Parameter names from PARAMETER_ADDRESS
+    max_gap : int
+        Maximum number of unused registers spanned inside a block
+    max_count : int
+        Maximum registers per block (125 for Modbus)
+        
+    Returns
+    -------
+    List[ReadBlock]
+        Blocks in ascending address order
+        
+    Raises
+    ------
+    InvalidParameterError
+        If a parameter name is invalid
+        
+    Examples
+    --------
+    >>> blocks = plan_reads(['motor_speed', 'dc_bus_voltage', 'alarm_code'])
+    >>> [(hex(b.address), b.count) for b in blocks]
+    [('0xb06', 5), ('0xb1f', 1)]
+    """
+    entries = []
+    for name in dict.fromkeys(names):
+        if name not in PARAMETER_ADDRESS:
+            raise InvalidParameterError(name, message=f"Unknown parameter: {name}")
+        entries.append((PARAMETER_ADDRESS[name], parameter_width(name), name))
+    entries.sort()
+    
+    blocks: List[ReadBlock] = []
+    current: Optional[ReadBlock] = None
+    for address, width, name in entries:
+        if (current is None
+                or address - current.end > max_gap
+                or address + width - current.address > max_count):
+            current = ReadBlock(address)
+            blocks.append(current)
+        current.add(name, address, width)
+        
+    return blocks
+
+
+@dataclass
+class WriteBlock:
+    """
+    Contiguous register range written with one 0x10 request.
+    
+    Attributes
+    ----------
+    address : int
+        First register address
+    registers : List[int]
+        Register values to write
+    fields : List[Tuple[str, int, int]]
+        (name, offset, width) of each parameter within the block
+    """
+    address: int
+    registers: List[int] = field(default_factory=list)
+    fields: List[Tuple[str, int, int]] = field(default_factory=list)
+    
+    @property
+    def end(self) -> int:
+        """Address after the last register of the block."""
+        return self.address + len(self.registers)
+    
+    @property
+    def names(self) -> List[str]:
+        """Parameter names covered by the block."""
+        return [name for name, _, _ in self.fields]
+    
+    def add(self, name: str, registers: List[int]):
+        """Append a parameter at the end of the block."""
+        self.fields.append((name, len(self.registers), len(registers)))
+        self.registers.extend(registers)
+    
+    def split(self) -> List['WriteBlock']:
+        """Split the block into two blocks with half of the parameters each."""
+        middle = len(self.fields) // 2
+        halves = []
+        for part in (self.fields[:middle], self.fields[middle:]):
+            if not part:
+                continue
+            half = WriteBlock(self.address + part[0][1])
+            for name, offset, width in part:
+                half.add(name, self.registers[offset:offset + width])
+            halves.append(half)
+        return halves
+
+
+def encode_value(name: str, value: Any) -> List[int]:
+    """
+    Encode a parameter value as register values.
+    
+    Parameters
+    ----------
+    name : str
+        Parameter name
+    value : Any
+        Parameter value (converted with int())
+        
+    Returns
+    -------
+    List[int]
+        One register, or high and low word of a 32-bit parameter
+    """
+    value = int(value)
+    if name in PARAMETER_32BIT:
+        # Big-endian: 高位在前，低位在后
+        return [(value >> 16) & 0xFFFF, value & 0xFFFF]
+    return [value & 0xFFFF]
+
+
+def plan_writes(
+    values: Dict[str, Any],
+    max_count: int = MAX_WRITE_REGISTERS
+) -> List[WriteBlock]:
+    """
+    Merge parameter writes into the fewest multi-register writes.
+    
+    Writes never span registers that are not being written, so only
+    parameters at strictly consecutive addresses share a block. A
+    register that is already covered (e.g. the ``_h`` alias of a 32-bit
+    parameter in the same set) is written once, by the first name.
+    
+    Parameters
+    ----------
+    values : Dict[str, Any]
+        Parameter values by name from PARAMETER_ADDRESS
+    max_count : int
+        Maximum registers per block (123 for Modbus)
+        
+    Returns
+    -------
+    List[WriteBlock]
+        Blocks in ascending address order
+        
+    Raises
+    ------
+    InvalidParameterError
+        If a parameter name is invalid
+        
+    Examples
+    --------
+    >>> blocks = plan_writes({'gear_ratio_numerator': 1, 'gear_ratio_denominator': 1,
+    ...                       'reverse_mode': 0, 'rigidity_level': 13})
+    >>> [(hex(b.address), len(b.registers)) for b in blocks]
+    [('0x6', 3), ('0x100', 1)]
+    """
+    entries = []
+    for name, value in values.items():
+        if name not in PARAMETER_ADDRESS:
+            raise InvalidParameterError(name, message=f"Unknown parameter: {name}")
+        entries.append((PARAMETER_ADDRESS[name], -parameter_width(name), name, value))
+    # Wider parameter first when a 32-bit value and its alias share an address
+    entries.sort(key=lambda e: e[:2])
+    
+    blocks: List[WriteBlock] = []
+    current: Optional[WriteBlock] = None
+    for address, width, name, value in entries:
+        width = -width
+        if current is not None and address < current.end:
+            continue
+        if (current is None
+                or address != current.end
+                or current.end + width - current.address > max_count):
+            current = WriteBlock(address)
+            blocks.append(current)
+        current.add(name, encode_value(name, value))
+        
+    return blocks
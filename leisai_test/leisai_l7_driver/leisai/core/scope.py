@@ -0,0 +1,549 @@
+"""
+High-rate trace recording of L7 status registers (software oscilloscope).
+
+A :class:`TraceRecorder` samples a fixed set of status parameters as fast
+as the link allows, timestamps every sample with ``time.perf_counter_ns``
+and writes it into a preallocated NumPy ring buffer. A :class:`Trigger`
+freezes a capture with pre-trigger history, e.g. on an alarm edge or when
+the position error exceeds a threshold.
+
+Requires NumPy (``pip install leisai-l7-driver[scope]``).
+"""
+
+import csv
+import logging
+import time
+from dataclasses import dataclass
+from threading import Thread, Event, Lock
+from typing import Optional, List, Tuple, Callable
+
+from .constants import PARAMETER_ADDRESS
+from .exceptions import InvalidParameterError
+from .planner import ReadBlock, plan_reads
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Default channels: speed, torque, position error, bus voltage
+TRACE_CHANNELS: List[str] = [
+    'motor_speed', 'torque_feedback', 'position_error', 'dc_bus_voltage',
+]
+
+# 16-bit status words holding signed values
+SIGNED_CHANNELS = frozenset({
+    'motor_speed', 'torque_feedback', 'position_error', 'analog_input_1', 'analog_input_2',
+})
+
+DEFAULT_TRACE_CAPACITY = 65536
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for trace recording: pip install leisai-l7-driver[scope]")
+
+
+@dataclass
+class Trigger:
+    """
+    Capture trigger on one channel.
+    
+    Attributes
+    ----------
+    channel : str
+        Parameter name to watch
+    condition : str
+        ``'rising'`` (crosses above ``level``), ``'falling'`` (crosses
+        below ``level``) or ``'change'`` (any change of value)
+    level : int
+        Threshold for ``'rising'``/``'falling'``
+    absolute : bool
+        Compare the magnitude of the value (e.g. position error in
+        either direction)
+        
+    Examples
+    --------
+    >>> Trigger.alarm()
+    >>> Trigger.above('position_error', 500, absolute=True)
+    """
+    channel: str
+    condition: str = 'rising'
+    level: int = 0
+    absolute: bool = False
+    
+    def __post_init__(self):
+        if self.condition not in ('rising', 'falling', 'change'):
+            raise ValueError(f"Unknown trigger condition: {self.condition}")
+    
+    @classmethod
+    def alarm(cls) -> 'Trigger':
+        """Trigger on any change of the alarm code."""
+        return cls('alarm_code', 'change')
+    
+    @classmethod
+    def above(cls, channel: str, level: int, absolute: bool = False) -> 'Trigger':
+        """Trigger when ``channel`` rises above ``level``."""
+        return cls(channel, 'rising', level, absolute)
+    
+    @classmethod
+    def below(cls, channel: str, level: int, absolute: bool = False) -> 'Trigger':
+        """Trigger when ``channel`` falls below ``level``."""
+        return cls(channel, 'falling', level, absolute)
+    
+    def check(self, previous: Optional[int], value: int) -> bool:
+        """
+        Test one sample against the previous one.
+        
+        Parameters
+        ----------
+        previous : Optional[int]
+            Previous value (None for the first sample)
+        value : int
+            Current value
+            
+        Returns
+        -------
+        bool
+            True if the trigger fires on this sample
+        """
+        if previous is None:
+            return False
+        if self.condition == 'change':
+            return value != previous
+        if self.absolute:
+            previous, value = abs(previous), abs(value)
+        if self.condition == 'rising':
+            return previous <= self.level < value
+        return previous >= self.level > value
+
+
+class Trace:
+    """
+    Recorded samples.
+    
+    Attributes
+    ----------
+    channels : List[str]
+        Channel names, one column each
+    times : numpy.ndarray
+        Sample timestamps (``perf_counter_ns``, int64)
+    data : numpy.ndarray
+        Sample values, shape (samples, channels), int32
+    trigger_index : Optional[int]
+        Row of the triggering sample, None for a free-running capture
+    """
+    
+    def __init__(self, channels: List[str], times, data, trigger_index: Optional[int] = None):
+        _require_numpy()
+        self.channels = list(channels)
+        self.times = np.asarray(times, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.int32)
+        self.trigger_index = trigger_index
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def __getitem__(self, channel: str):
+        """Values of one channel."""
+        return self.data[:, self.channels.index(channel)]
+    
+    @property
+    def time_s(self):
+        """Sample times in seconds, relative to the trigger (or the first sample)."""
+        if not len(self.times):
+            return np.zeros(0)
+        origin = self.times[self.trigger_index or 0]
+        return (self.times - origin) / 1e9
+    
+    @property
+    def duration(self) -> float:
+        """Time between first and last sample in seconds."""
+        if len(self.times) < 2:
+            return 0.0
+        return float(self.times[-1] - self.times[0]) / 1e9
+    
+    @property
+    def sample_rate(self) -> float:
+        """Mean sample rate in Hz."""
+        duration = self.duration
+        return (len(self.times) - 1) / duration if duration > 0 else 0.0
+    
+    def save_npz(self, filename: str):
+        """
+        Save to a compressed NumPy archive.
+        
+        Parameters
+        ----------
+        filename : str
+            Output file (``.npz``)
+        """
+        np.savez_compressed(
+            filename,
+            times=self.times,
+            data=self.data,
+            channels=np.array(self.channels),
+            trigger_index=np.int64(-1 if self.trigger_index is None else self.trigger_index),
+        )
+    
+    @classmethod
+    def load_npz(cls, filename: str) -> 'Trace':
+        """
+        Load a trace saved with :meth:`save_npz`.
+        
+        Parameters
+        ----------
+        filename : str
+            Input file (``.npz``)
+            
+        Returns
+        -------
+        Trace
+            Loaded trace
+        """
+        _require_numpy()
+        with np.load(filename) as archive:
+            trigger_index = int(archive['trigger_index'])
+            return cls(
+                [str(name) for name in archive['channels']],
+                archive['times'],
+                archive['data'],
+                None if trigger_index < 0 else trigger_index,
+            )
+    
+    def save_csv(self, filename: str):
+        """
+        Save as CSV with a time column in seconds.
+        
+        Parameters
+        ----------
+        filename : str
+            Output file (``.csv``)
+        """
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['time_s'] + self.channels)
+            for t, row in zip(self.time_s.tolist(), self.data.tolist()):
+                writer.writerow([f"{t:.6f}"] + row)
+
+
+class TraceRecorder:
+    """
+    Software oscilloscope for L7 status registers.
+    
+    Samples are read back to back in a background thread (or on a fixed
+    ``interval``) and stored in a ring buffer of ``capacity`` samples.
+    Without a trigger the recorder runs until :meth:`stop` and
+    :meth:`snapshot` returns the most recent samples. With a trigger it
+    keeps ``pre_trigger`` samples of history, records ``post_trigger``
+    samples after the trigger and stops; :meth:`wait` returns the capture.
+    
+    Each sample is one request when all channels fit in one block (or in
+    the mapping parameters, see ``use_mapping``). Values are raw register
+    values; 16-bit signed status words are sign-extended.
+    
+    Parameters
+    ----------
+    modbus_client : ModbusClient
+        Modbus client for communication
+    param_manager : ParameterManager
+        Parameter manager (used for the mapping parameters)
+    channels : Optional[List[str]]
+        Parameter names to sample (default: TRACE_CHANNELS)
+    capacity : int
+        Ring buffer size in samples
+    use_mapping : bool
+        Sample through the mapping parameters PA0.40-47 (one coherent read
+        for scattered registers). This reprograms PA0.50-57, so it
+        replaces any status mapping set up for the monitor.
+        
+    Examples
+    --------
+    >>> recorder = driver.create_trace_recorder()
+    >>> recorder.arm(Trigger.above('position_error', 500, absolute=True), pre_trigger=2000)
+    >>> trace = recorder.wait(timeout=60)
+    >>> trace.save_npz('following_error.npz')
+    """
+    
+    def __init__(
+        self,
+        modbus_client,
+        param_manager,
+        channels: Optional[List[str]] = None,
+        capacity: int = DEFAULT_TRACE_CAPACITY,
+        use_mapping: bool = False
+    ):
+        """Initialize trace recorder."""
+        _require_numpy()
+        self._modbus = modbus_client
+        self._params = param_manager
+        self.channels: List[str] = list(dict.fromkeys(channels or TRACE_CHANNELS))
+        for name in self.channels:
+            if name not in PARAMETER_ADDRESS:
+                raise InvalidParameterError(name, message=f"Unknown parameter: {name}")
+        self.capacity = capacity
+        self.use_mapping = use_mapping
+        
+        # Preallocated ring buffer
+        self._times = np.zeros(capacity, dtype=np.int64)
+        self._data = np.zeros((capacity, len(self.channels)), dtype=np.int32)
+        self._count = 0
+        self._lock = Lock()
+        
+        # Read plan: (address, count, [(column, offset, width)])
+        self._plan: List[Tuple[int, int, List[Tuple[int, int, int]]]] = []
+        
+        # Sampling state
+        self._thread: Optional[Thread] = None
+        self._stop_event = Event()
+        self._done = Event()
+        self._interval = 0.0
+        self._trigger: Optional[Trigger] = None
+        self._trigger_column = 0
+        self._pre_trigger = 0
+        self._post_trigger = 0
+        self._trigger_sample: Optional[int] = None
+        self._on_trigger: Optional[Callable[['Trace'], None]] = None
+        self._capture: Optional[Trace] = None
+        self.missed = 0
+    
+    @property
+    def running(self) -> bool:
+        """True while sampling."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def sample_count(self) -> int:
+        """Samples recorded since the last start."""
+        return self._count
+    
+    def start(self, interval: float = 0.0):
+        """
+        Start free-running recording.
+        
+        Parameters
+        ----------
+        interval : float
+            Sample period in seconds (0: as fast as the link allows)
+        """
+        self._start(interval, None)
+    
+    def arm(
+        self,
+        trigger: Trigger,
+        pre_trigger: int = 1000,
+        post_trigger: int = 1000,
+        interval: float = 0.0,
+        on_trigger: Optional[Callable[['Trace'], None]] = None
+    ):
+        """
+        Start recording and capture once around a trigger.
+        
+        Parameters
+        ----------
+        trigger : Trigger
+            Trigger condition; its channel is sampled as well
+        pre_trigger : int
+            Samples of history to keep before the trigger
+        post_trigger : int
+            Samples to record after the trigger
+        interval : float
+            Sample period in seconds (0: as fast as the link allows)
+        on_trigger : Optional[Callable[[Trace], None]]
+            Called from the sampling thread with the finished capture
+            
+        Raises
+        ------
+        ValueError
+            If the capture does not fit in the ring buffer or the trigger
+            channel is not recorded
+        """
+        if pre_trigger + post_trigger + 1 > self.capacity:
+            raise ValueError(
+                f"Capture of {pre_trigger + post_trigger + 1} samples exceeds "
+                f"capacity {self.capacity}"
+            )
+        if trigger.channel not in self.channels:
+            raise ValueError(f"Trigger channel {trigger.channel} is not recorded")
+        self._trigger_column = self.channels.index(trigger.channel)
+        self._pre_trigger = pre_trigger
+        self._post_trigger = post_trigger
+        self._on_trigger = on_trigger
+        self._start(interval, trigger)
+    
+    def stop(self):
+        """Stop recording."""
+        if not self._thread:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+        logger.info(f"Trace recording stopped after {self._count} samples")
+    
+    def wait(self, timeout: Optional[float] = None) -> Optional[Trace]:
+        """
+        Wait for a triggered capture to complete.
+        
+        Parameters
+        ----------
+        timeout : Optional[float]
+            Maximum wait in seconds (None: wait forever)
+            
+        Returns
+        -------
+        Optional[Trace]
+            Capture around the trigger, None on timeout or if recording
+            stopped before the trigger
+        """
+        self._done.wait(timeout)
+        return self._capture
+    
+    def snapshot(self, samples: Optional[int] = None) -> Trace:
+        """
+        Copy the most recent samples out of the ring buffer.
+        
+        Parameters
+        ----------
+        samples : Optional[int]
+            Number of samples (default: all buffered)
+            
+        Returns
+        -------
+        Trace
+            Most recent samples, oldest first
+        """
+        with self._lock:
+            end = self._count
+            start = max(0, end - min(samples or self.capacity, self.capacity))
+            return self._extract(start, end, None)
+    
+    def _start(self, interval: float, trigger: Optional[Trigger]):
+        """Prepare the read plan and start the sampling thread."""
+        if self.running:
+            logger.warning("Trace recording already running")
+            return
+            
+        self._prepare_plan()
+        self._interval = interval
+        self._trigger = trigger
+        self._trigger_sample = None
+        self._capture = None
+        self._count = 0
+        self.missed = 0
+        self._done.clear()
+        self._stop_event.clear()
+        self._thread = Thread(target=self._sample_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"Trace recording started: {', '.join(self.channels)}")
+    
+    def _prepare_plan(self):
+        """Work out the register reads of one sample."""
+        columns = {name: column for column, name in enumerate(self.channels)}
+        
+        if self.use_mapping and self._params.configure_mapping(self.channels):
+            layout = self._params.mapping
+            fields = [(columns[name], offset, width) for name, offset, width in layout.fields]
+            self._plan = [(layout.value_address, layout.value_count, fields)]
+            return
+            
+        # Probe each block once; split blocks the drive rejects
+        self._plan = []
+        pending = plan_reads(self.channels)
+        while pending:
+            block: ReadBlock = pending.pop(0)
+            if len(block.fields) > 1:
+                registers = self._modbus.read_registers(block.address, block.count, use_cache=False)
+                if not registers or len(registers) != block.count:
+                    pending[:0] = block.split()
+                    continue
+            fields = [(columns[name], offset, width) for name, offset, width in block.fields]
+            self._plan.append((block.address, block.count, fields))
+    
+    def _read_sample(self, row) -> bool:
+        """Read one sample into a buffer row."""
+        for address, count, fields in self._plan:
+            registers = self._modbus.read_registers(address, count, use_cache=False)
+            if not registers or len(registers) != count:
+                return False
+            for column, offset, width in fields:
+                if width == 2:
+                    value = (registers[offset] << 16) | registers[offset + 1]
+                    if value & 0x80000000:
+                        value -= 0x100000000
+                else:
+                    value = registers[offset]
+                row[column] = value
+        return True
+    
+    def _sample_loop(self):
+        """Sampling thread."""
+        signed = [column for column, name in enumerate(self.channels) if name in SIGNED_CHANNELS]
+        row = [0] * len(self.channels)
+        previous: Optional[int] = None
+        next_time = time.perf_counter()
+        
+        while not self._stop_event.is_set():
+            start = time.perf_counter_ns()
+            try:
+                ok = self._read_sample(row)
+            except Exception as e:
+                logger.error(f"Trace sample error: {e}")
+                ok = False
+            # Midpoint of the request/response exchange
+            stamp = (start + time.perf_counter_ns()) // 2
+            
+            if not ok:
+                self.missed += 1
+            else:
+                for column in signed:
+                    if row[column] & 0x8000:
+                        row[column] -= 0x10000
+                        
+                with self._lock:
+                    index = self._count % self.capacity
+                    self._times[index] = stamp
+                    self._data[index] = row
+                    self._count += 1
+                    
+                if self._trigger is not None and self._check_trigger(previous, row):
+                    break
+                previous = row[self._trigger_column]
+                
+            if self._interval > 0:
+                next_time += self._interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    self._stop_event.wait(delay)
+                else:
+                    next_time = time.perf_counter()
+                    
+        self._done.set()
+    
+    def _check_trigger(self, previous: Optional[int], row: List[int]) -> bool:
+        """Track the trigger; returns True once the capture is complete."""
+        if self._trigger_sample is None:
+            if not self._trigger.check(previous, row[self._trigger_column]):
+                return False
+            self._trigger_sample = self._count - 1
+            logger.info(f"Trace triggered on {self._trigger.channel} = {row[self._trigger_column]}")
+            
+        if self._count <= self._trigger_sample + self._post_trigger:
+            return False
+            
+        with self._lock:
+            start = max(0, self._trigger_sample - self._pre_trigger)
+            self._capture = self._extract(start, self._count, self._trigger_sample - start)
+            
+        if self._on_trigger:
+            try:
+                self._on_trigger(self._capture)
+            except Exception as e:
+                logger.error(f"Trigger callback error: {e}")
+        return True
+    
+    def _extract(self, start: int, end: int, trigger_index: Optional[int]) -> Trace:
+        """Copy samples [start, end) out of the ring buffer (lock held)."""
+        indices = np.arange(start, end) % self.capacity
+        return Trace(self.channels, self._times[indices], self._data[indices], trigger_index)
@@ -0,0 +1,275 @@
+"""
+PR sequence execution with completion polling.
+
+:class:`PRSequenceRunner` triggers PR paths one after another and moves on
+as soon as the drive reports the previous move complete, instead of
+sleeping a fixed time. Completion is read from the PA8.02 (0x6002)
+readback: 0x010P while path P runs, 0x0200 while settling, 0x000P once
+done. The poll interval adapts to the move: it backs off while the axis
+travels and tightens near the expected end and while settling.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from threading import Event
+from typing import Optional, List, Dict, Iterable, Callable
+
+from .constants import DOSignal, PR_PATH_COUNT
+from .exceptions import InvalidPathError
+
+logger = logging.getLogger(__name__)
+
+# PA8.02 readback while a path is moving / settling
+PR_STATE_RUNNING = 0x0100
+PR_STATE_SETTLING = 0x0200
+
+
+@dataclass
+class MoveResult:
+    """
+    Result of one PR move.
+    
+    Attributes
+    ----------
+    path_id : int
+        Path number
+    ok : bool
+        True if the move completed
+    cycle_time : float
+        Seconds from trigger to detected completion
+    polls : int
+        Completion reads issued
+    error : Optional[str]
+        Reason of a failure
+    """
+    path_id: int
+    ok: bool
+    cycle_time: float = 0.0
+    polls: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class SequenceReport:
+    """Results of a PR sequence run."""
+    moves: List[MoveResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    
+    @property
+    def ok(self) -> bool:
+        """True if every move completed."""
+        return all(move.ok for move in self.moves)
+    
+    @property
+    def completed(self) -> List[MoveResult]:
+        """Moves that completed."""
+        return [move for move in self.moves if move.ok]
+    
+    @property
+    def throughput(self) -> float:
+        """Completed moves per second."""
+        return len(self.completed) / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def cycle_times(self, path_id: Optional[int] = None) -> List[float]:
+        """Cycle times of completed moves (optionally of one path)."""
+        return [move.cycle_time for move in self.completed
+                if path_id is None or move.path_id == path_id]
+    
+    def summary(self) -> str:
+        """One-line summary."""
+        times = self.cycle_times()
+        text = f"{len(times)}/{len(self.moves)} moves in {self.elapsed:.2f} s"
+        if times:
+            text += (f", cycle mean {sum(times) / len(times) * 1e3:.0f} ms "
+                     f"(min {min(times) * 1e3:.0f}, max {max(times) * 1e3:.0f}), "
+                     f"{self.throughput:.1f} moves/s")
+        return text
+
+
+class PRSequenceRunner:
+    """
+    Run PR paths back to back, waiting on completion.
+    
+    The runner learns the cycle time of every path (exponential moving
+    average). With an estimate it sleeps until shortly before the
+    expected end and then polls at ``poll_min``; without one it starts at
+    ``poll_min`` and backs off geometrically up to ``poll_max``. While
+    the drive reports settling it always polls at ``poll_min``.
+    
+    Parameters
+    ----------
+    driver : L7Driver
+        Connected driver
+    poll_min : float
+        Shortest poll interval in seconds
+    poll_max : float
+        Longest poll interval in seconds
+    require_inp : bool
+        Also wait for the INP output (in position) before completing
+    near_window : float
+        Time before the expected end from which to poll at ``poll_min``
+        
+    Examples
+    --------
+    >>> runner = PRSequenceRunner(driver)
+    >>> report = runner.run([0, 1, 2], repeat=10)
+    >>> print(report.summary())
+    """
+    
+    def __init__(
+        self,
+        driver,
+        poll_min: float = 0.002,
+        poll_max: float = 0.05,
+        require_inp: bool = False,
+        near_window: float = 0.02
+    ):
+        """Initialize sequence runner."""
+        self.driver = driver
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.require_inp = require_inp
+        self.near_window = near_window
+        self._expected: Dict[int, float] = {}
+        self._stop_event = Event()
+    
+    def expected_time(self, path_id: int) -> Optional[float]:
+        """Learned cycle time of a path, None before its first move."""
+        return self._expected.get(path_id)
+    
+    def stop(self):
+        """Abort a running sequence and stop PR motion."""
+        self._stop_event.set()
+        self.driver.stop_pr_motion()
+    
+    def run_path(self, path_id: int, timeout: float = 30.0) -> MoveResult:
+        """
+        Trigger one path and wait until it completes.
+        
+        Parameters
+        ----------
+        path_id : int
+            Path number (0-15)
+        timeout : float
+            Maximum move time in seconds; PR motion is stopped on timeout
+            
+        Returns
+        -------
+        MoveResult
+            Completion and cycle time
+            
+        Raises
+        ------
+        InvalidPathError
+            If the path number is invalid
+        """
+        if not 0 <= path_id < PR_PATH_COUNT:
+            raise InvalidPathError(path_id)
+            
+        start = time.perf_counter()
+        if not self.driver.trigger_pr(path_id):
+            return MoveResult(path_id, False, error="Trigger rejected")
+            
+        result = self._wait_complete(path_id, start, timeout)
+        if result.ok:
+            previous = self._expected.get(path_id)
+            self._expected[path_id] = (
+                result.cycle_time if previous is None else 0.7 * previous + 0.3 * result.cycle_time
+            )
+        elif not self._stop_event.is_set():
+            self.driver.stop_pr_motion()
+        return result
+    
+    def run(
+        self,
+        sequence: Iterable[int],
+        repeat: int = 1,
+        timeout: float = 30.0,
+        dwell: float = 0.0,
+        on_move: Optional[Callable[[MoveResult], None]] = None
+    ) -> SequenceReport:
+        """
+        Run a sequence of paths, stopping at the first failed move.
+        
+        Parameters
+        ----------
+        sequence : Iterable[int]
+            Path numbers in order
+        repeat : int
+            Number of passes through the sequence (0: until :meth:`stop`)
+        timeout : float
+            Maximum time of each move in seconds
+        dwell : float
+            Pause after each completed move in seconds
+        on_move : Optional[Callable[[MoveResult], None]]
+            Called after every move
+            
+        Returns
+        -------
+        SequenceReport
+            Per-move results and throughput
+        """
+        paths = list(sequence)
+        report = SequenceReport()
+        self._stop_event.clear()
+        start = time.perf_counter()
+        
+        iteration = 0
+        while paths and (repeat <= 0 or iteration < repeat) and not self._stop_event.is_set():
+            for path_id in paths:
+                if self._stop_event.is_set():
+                    break
+                result = self.run_path(path_id, timeout)
+                report.moves.append(result)
+                if on_move:
+                    on_move(result)
+                if not result.ok:
+                    logger.error(f"PR{path_id} failed: {result.error}")
+                    report.elapsed = time.perf_counter() - start
+                    return report
+                if dwell > 0:
+                    self._stop_event.wait(dwell)
+            iteration += 1
+            
+        report.elapsed = time.perf_counter() - start
+        logger.info(f"PR sequence: {report.summary()}")
+        return report
+    
+    def _wait_complete(self, path_id: int, start: float, timeout: float) -> MoveResult:
+        """Poll the PR readback until the path reports completion."""
+        expected = self._expected.get(path_id)
+        backoff = self.poll_min
+        polls = 0
+        
+        while True:
+            state = self.driver.get_control_operation()
+            polls += 1
+            now = time.perf_counter()
+            elapsed = now - start
+            
+            if state is not None and state == path_id:
+                if not self.require_inp or self._in_position():
+                    return MoveResult(path_id, True, elapsed, polls)
+                delay = self.poll_min
+            elif self._stop_event.is_set():
+                return MoveResult(path_id, False, elapsed, polls, "Stopped")
+            elif elapsed > timeout:
+                alarm = self.driver.get_alarm()
+                return MoveResult(path_id, False, elapsed, polls,
+                                  f"Timeout (state {state}, alarm {alarm!r})")
+            elif state == PR_STATE_SETTLING:
+                delay = self.poll_min
+            elif expected is not None:
+                # Sleep through the bulk of the move, then poll tightly
+                delay = max(self.poll_min, min(self.poll_max, expected - elapsed - self.near_window))
+            else:
+                delay = backoff
+                backoff = min(self.poll_max, backoff * 1.5)
+                
+            self._stop_event.wait(delay)
+    
+    def _in_position(self) -> bool:
+        """Check the INP output."""
+        do_status = self.driver.get_digital_outputs()
+        return bool(do_status and do_status & DOSignal.DO2_INP)
@@ -0,0 +1,124 @@
+"""
+Parameter diff and sync for L7 servo drivers.
+
+The diff engine compares parameter sets by their register encoding, so
+-1 and 0xFFFF of a 16-bit parameter are the same value. It backs
+:meth:`ParameterManager.sync`, which writes only what differs, and
+drive-to-drive or drive-to-file comparisons that write nothing.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .constants import PARAMETER_ADDRESS, READ_ONLY_PARAMETERS, COMMAND_PARAMETERS
+from .planner import encode_value
+
+
+def is_setting(name: str) -> bool:
+    """Check if a parameter is a stored setting (writable, not a command)."""
+    return (name in PARAMETER_ADDRESS
+            and name not in READ_ONLY_PARAMETERS
+            and name not in COMMAND_PARAMETERS)
+
+
+@dataclass
+class SyncReport:
+    """
+    Result of a parameter diff or sync.
+    
+    Attributes
+    ----------
+    changed : Dict[str, Tuple[Any, Any]]
+        (current, target) of parameters that differ; written by a sync
+    unchanged : List[str]
+        Parameters already at the target value
+    failed : Dict[str, Tuple[Any, Any]]
+        (current, target) of parameters whose write failed
+    missing : List[str]
+        Parameters that could not be read from the source; after a
+        sync, only those that were not written either (the written
+        ones are in ``changed`` or ``failed`` with current None)
+    skipped : List[str]
+        Unknown, read-only and command parameters in the target
+    dry_run : bool
+        True if nothing was written
+    transactions : int
+        Modbus requests issued
+    """
+    changed: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    unchanged: List[str] = field(default_factory=list)
+    failed: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    dry_run: bool = True
+    transactions: int = 0
+    
+    @property
+    def in_sync(self) -> bool:
+        """True if the source matches the target (or was brought to it)."""
+        if self.failed:
+            return False
+        return not self.changed or not self.dry_run
+    
+    def summary(self) -> str:
+        """One-line summary."""
+        verb = 'differ' if self.dry_run else 'written'
+        return (f"{len(self.changed)} {verb}, {len(self.unchanged)} unchanged, "
+                f"{len(self.failed)} failed, {len(self.missing)} missing, "
+                f"{len(self.skipped)} skipped")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Report as a JSON-serialisable dictionary."""
+        return {
+            'changed': {name: list(values) for name, values in self.changed.items()},
+            'unchanged': list(self.unchanged),
+            'failed': {name: list(values) for name, values in self.failed.items()},
+            'missing': list(self.missing),
+            'skipped': list(self.skipped),
+            'dry_run': self.dry_run,
+            'transactions': self.transactions,
+        }
+
+
+def diff_parameters(
+    current: Dict[str, Optional[Any]],
+    target: Dict[str, Any],
+    settings_only: bool = True
+) -> SyncReport:
+    """
+    Compare current parameter values against a target set.
+    
+    Parameters
+    ----------
+    current : Dict[str, Optional[Any]]
+        Values of the source (drive or file); None means unreadable
+    target : Dict[str, Any]
+        Desired values
+    settings_only : bool
+        Skip read-only and command parameters in ``target``
+        
+    Returns
+    -------
+    SyncReport
+        Dry-run report; ``changed`` holds (current, target) pairs
+        
+    Examples
+    --------
+    >>> report = diff_parameters({'rigidity_level': 13, 'reverse_mode': 0},
+    ...                          {'rigidity_level': 15, 'reverse_mode': 0})
+    >>> report.changed, report.unchanged
+    ({'rigidity_level': (13, 15)}, ['reverse_mode'])
+    """
+    report = SyncReport()
+    for name, value in target.items():
+        if name not in PARAMETER_ADDRESS or (settings_only and not is_setting(name)):
+            report.skipped.append(name)
+            continue
+        old = current.get(name)
+        if old is None:
+            report.missing.append(name)
+        elif encode_value(name, old) == encode_value(name, value):
+            report.unchanged.append(name)
+        else:
+            report.changed[name] = (old, value)
+    return report
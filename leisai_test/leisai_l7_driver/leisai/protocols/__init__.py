@@ -1,6 +1,16 @@
 """Communication protocol implementations."""
 
 from .modbus import ModbusRTU, ModbusClient
-from .serial import SerialConnection
+from .serial import SerialConnection, PriorityLock
+from .engine import IOEngine
+from .cache import RegisterCache, CacheStats
+from .bus import ModbusBus, BusClient, BusPriority
+from .keepalive import Keepalive, KeepaliveStats
+from .aio import AsyncSerialConnection, AsyncModbusRTU, AsyncModbusClient
 
-__all__ = ['ModbusRTU', 'ModbusClient', 'SerialConnection']
\ No newline at end of file
+__all__ = [
+    'ModbusRTU', 'ModbusClient', 'SerialConnection', 'PriorityLock', 'RegisterCache', 'CacheStats',
+    'IOEngine', 'Keepalive', 'KeepaliveStats',
+    'ModbusBus', 'BusClient', 'BusPriority',
+    'AsyncSerialConnection', 'AsyncModbusRTU', 'AsyncModbusClient',
+]
\ No newline at end of file
@@ -0,0 +1,430 @@
+"""
+asyncio serial transport and Modbus RTU client.
+
+This module mirrors :mod:`serial` and :mod:`modbus` for asyncio
+applications: one event loop can drive many drives on several ports
+without a thread per port, monitor or JOG loop.
+
+Requires ``pyserial-asyncio`` (``pip install leisai-l7-driver[asyncio]``).
+"""
+
+import asyncio
+import logging
+import struct
+import time
+from typing import Optional, List
+
+import serial
+
+from ..core.exceptions import (
+    ConnectionError,
+    CommunicationError,
+    ModbusError,
+    TimeoutError
+)
+from ..core.constants import DEFAULT_BAUDRATE, DEFAULT_TIMEOUT, MAX_RETRIES, RETRY_DELAY
+from .modbus import ModbusFrame, ModbusRTU, calculate_crc16, register_struct
+
+try:
+    import serial_asyncio
+except ImportError:
+    serial_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+
+class _FrameProtocol(asyncio.Protocol):
+    """Collects received bytes and wakes up pending readers."""
+    
+    def __init__(self):
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer = bytearray()
+        self.closed = False
+        self._waiter: Optional[asyncio.Future] = None
+    
+    def connection_made(self, transport):
+        self.transport = transport
+    
+    def data_received(self, data: bytes):
+        self.buffer += data
+        self._wake()
+    
+    def connection_lost(self, exc):
+        self.closed = True
+        self._wake()
+    
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+    
+    async def read_exactly(self, size: int) -> bytes:
+        """Wait until ``size`` bytes are buffered and return them."""
+        while len(self.buffer) < size:
+            if self.closed:
+                raise ConnectionError("Serial port closed")
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+
+class AsyncSerialConnection:
+    """
+    asyncio serial connection handler.
+    
+    Transactions on the port are serialised with an ``asyncio.Lock``,
+    so several :class:`AsyncModbusClient` instances (one per slave)
+    can share one connection.
+    
+    Parameters
+    ----------
+    port : str
+        Serial port name or pyserial URL
+    baudrate : int
+        Baud rate (default: 38400)
+    timeout : float
+        Response timeout in seconds (default: 1.0)
+    **kwargs
+        Additional arguments passed to serial.Serial
+    """
+    
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = DEFAULT_BAUDRATE,
+        timeout: float = DEFAULT_TIMEOUT,
+        **kwargs
+    ):
+        """Initialize asyncio serial connection."""
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.serial_args = {
+            'bytesize': kwargs.get('bytesize', serial.EIGHTBITS),
+            'parity': kwargs.get('parity', serial.PARITY_NONE),
+            'stopbits': kwargs.get('stopbits', serial.STOPBITS_ONE),
+        }
+        
+        self._transport: Optional[asyncio.Transport] = None
+        self._protocol: Optional[_FrameProtocol] = None
+        self._lock: Optional[asyncio.Lock] = None
+    
+    @property
+    def char_time(self) -> float:
+        """Time in seconds to transmit one character at the current settings."""
+        bits = 1 + self.serial_args['bytesize'] + self.serial_args['stopbits']
+        if self.serial_args['parity'] != serial.PARITY_NONE:
+            bits += 1
+        return bits / self.baudrate
+    
+    @property
+    def is_connected(self) -> bool:
+        """Check if serial port is open."""
+        return self._protocol is not None and not self._protocol.closed
+    
+    @property
+    def lock(self) -> asyncio.Lock:
+        """Lock held for the duration of one request/response exchange."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+    
+    async def connect(self) -> bool:
+        """
+        Open serial connection.
+        
+        Returns
+        -------
+        bool
+            True if connection successful
+            
+        Raises
+        ------
+        ConnectionError
+            If connection fails or pyserial-asyncio is not installed
+        """
+        if self.is_connected:
+            return True
+            
+        if serial_asyncio is None:
+            raise ConnectionError(
+                "pyserial-asyncio is required: pip install leisai-l7-driver[asyncio]"
+            )
+            
+        try:
+            logger.info(f"Opening serial port {self.port} at {self.baudrate} baud (asyncio)")
+            self._transport, self._protocol = await serial_asyncio.create_serial_connection(
+                asyncio.get_running_loop(), _FrameProtocol, self.port,
+                baudrate=self.baudrate, **self.serial_args
+            )
+            return True
+            
+        except (serial.SerialException, OSError) as e:
+            logger.error(f"Failed to open serial port {self.port}: {e}")
+            raise ConnectionError(f"Cannot open serial port {self.port}: {e}")
+    
+    async def disconnect(self):
+        """Close serial connection."""
+        if self._transport is not None:
+            self._transport.close()
+            logger.info(f"Serial port {self.port} closed")
+        self._transport = None
+        self._protocol = None
+    
+    def reset_input(self):
+        """Discard unread received bytes."""
+        if self._protocol is not None:
+            self._protocol.buffer.clear()
+    
+    def write(self, data: bytes):
+        """
+        Queue data for transmission.
+        
+        Raises
+        ------
+        ConnectionError
+            If not connected
+        """
+        if not self.is_connected:
+            raise ConnectionError("Not connected")
+        self._transport.write(data)
+    
+    async def read(self, size: int, timeout: Optional[float] = None) -> bytes:
+        """
+        Read exactly ``size`` bytes.
+        
+        Raises
+        ------
+        TimeoutError
+            If the bytes do not arrive within the timeout
+        ConnectionError
+            If not connected
+        """
+        if not self.is_connected:
+            raise ConnectionError("Not connected")
+        try:
+            return await asyncio.wait_for(
+                self._protocol.read_exactly(size),
+                self.timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError("Response timeout")
+    
+    async def __aenter__(self):
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
+
+
+class AsyncModbusRTU:
+    """
+    Modbus RTU protocol handler for asyncio.
+    
+    Same frames, validation and retry policy as :class:`ModbusRTU`.
+    The response is read header first: the first five bytes tell a
+    normal response from an exception response, so no inter-frame
+    silence timing is needed.
+    """
+    
+    def __init__(self, connection: AsyncSerialConnection):
+        """
+        Initialize asyncio Modbus RTU handler.
+        
+        Parameters
+        ----------
+        connection : AsyncSerialConnection
+            Connection to use for communication
+        """
+        self.serial = connection
+        self._transaction_id = 0
+    
+    async def read_holding_registers(self, slave_id: int, address: int, count: int = 1) -> List[int]:
+        """Read holding registers (function code 0x03)."""
+        request = ModbusFrame(
+            slave_id, ModbusRTU.READ_HOLDING_REGISTERS, struct.pack('>HH', address, count)
+        )
+        response = await self._execute_transaction(
+            request, ModbusRTU.response_length(ModbusRTU.READ_HOLDING_REGISTERS, count)
+        )
+        
+        byte_count = response.data[0]
+        if byte_count != count * 2:
+            raise CommunicationError(f"Invalid byte count: {byte_count}")
+        return list(register_struct(count).unpack_from(response.data, 1))
+    
+    async def write_single_register(self, slave_id: int, address: int, value: int) -> bool:
+        """Write single register (function code 0x06)."""
+        data = struct.pack('>HH', address, value & 0xFFFF)
+        request = ModbusFrame(slave_id, ModbusRTU.WRITE_SINGLE_REGISTER, data)
+        response = await self._execute_transaction(
+            request, ModbusRTU.response_length(request.function_code)
+        )
+        
+        if response.data != data:
+            raise CommunicationError("Write verification failed")
+        return True
+    
+    async def write_multiple_registers(self, slave_id: int, address: int, values: List[int]) -> bool:
+        """Write multiple registers (function code 0x10)."""
+        count = len(values)
+        data = struct.pack('>HHB%dH' % count, address, count, count * 2,
+                           *(value & 0xFFFF for value in values))
+        request = ModbusFrame(slave_id, ModbusRTU.WRITE_MULTIPLE_REGISTERS, data)
+        response = await self._execute_transaction(
+            request, ModbusRTU.response_length(request.function_code)
+        )
+        
+        if response.data != data[:4]:
+            raise CommunicationError("Write verification failed")
+        return True
+    
+    async def _execute_transaction(self, request: ModbusFrame, response_length: int) -> ModbusFrame:
+        """
+        Execute a Modbus transaction with retry logic.
+        
+        Raises
+        ------
+        ModbusError
+            If Modbus exception received
+        CommunicationError
+            If communication fails after retries
+        """
+        self._transaction_id += 1
+        transaction_id = self._transaction_id
+        request_bytes = request.to_bytes()
+        
+        for attempt in range(MAX_RETRIES):
+            try:
+                async with self.serial.lock:
+                    self.serial.reset_input()
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(f"TX: {request_bytes.hex(' ').upper()}")
+                    self.serial.write(request_bytes)
+                    
+                    response_bytes = await self._receive_response(
+                        request.slave_id, request.function_code, response_length
+                    )
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(f"RX: {response_bytes.hex(' ').upper()}")
+                        
+                response = ModbusFrame.from_bytes(response_bytes)
+                calc_crc = calculate_crc16(response_bytes[:-2])
+                if calc_crc != response.crc:
+                    raise CommunicationError(f"CRC mismatch: {calc_crc:04X} != {response.crc:04X}")
+                    
+                if response.function_code & 0x80:
+                    raise ModbusError(response.data[0])
+                    
+                return response
+                
+            except TimeoutError:
+                logger.warning(f"Transaction {transaction_id} timeout on attempt {attempt + 1}")
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(RETRY_DELAY)
+                    continue
+                raise
+                
+            except ModbusError as e:
+                # The slave answered; only a busy slave is worth asking again
+                logger.warning(f"Transaction {transaction_id}: {e}")
+                if e.exception_code in (0x05, 0x06) and attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(RETRY_DELAY)
+                    continue
+                raise
+                
+            except ConnectionError:
+                raise
+                
+            except Exception as e:
+                logger.error(f"Transaction {transaction_id} failed: {e}")
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(RETRY_DELAY)
+                    continue
+                raise
+                
+        raise CommunicationError(f"Transaction failed after {MAX_RETRIES} attempts")
+    
+    async def _receive_response(self, slave_id: int, function_code: int, length: int) -> bytes:
+        """Receive one response frame, header first."""
+        # Every response is at least as long as an exception response
+        deadline = time.monotonic() + self.serial.timeout
+        frame = await self.serial.read(ModbusRTU.EXCEPTION_RESPONSE_LENGTH)
+        
+        recv_slave_id, recv_function = frame[0], frame[1]
+        if recv_slave_id != slave_id:
+            raise CommunicationError(f"Slave ID mismatch: {recv_slave_id} != {slave_id}")
+            
+        if recv_function & 0x80:
+            return frame
+            
+        if recv_function != function_code:
+            raise CommunicationError(f"Function code mismatch: {recv_function} != {function_code}")
+            
+        if function_code == ModbusRTU.READ_HOLDING_REGISTERS and frame[2] != length - 5:
+            raise CommunicationError(f"Invalid byte count: {frame[2]}")
+            
+        if length > len(frame):
+            frame += await self.serial.read(
+                length - len(frame), max(0.0, deadline - time.monotonic())
+            )
+        return frame
+
+
+class AsyncModbusClient:
+    """
+    High-level asyncio Modbus client for one slave.
+    
+    Mirrors :class:`ModbusClient`: failures are logged and reported as
+    None / False instead of raising.
+    """
+    
+    def __init__(self, connection: AsyncSerialConnection, slave_id: int = 1):
+        """
+        Initialize asyncio Modbus client.
+        
+        Parameters
+        ----------
+        connection : AsyncSerialConnection
+            Connection to use
+        slave_id : int
+            Slave device ID
+        """
+        self.modbus = AsyncModbusRTU(connection)
+        self.slave_id = slave_id
+    
+    async def read_register(self, address: int) -> Optional[int]:
+        """Read single register, None if failed."""
+        values = await self.read_registers(address, 1)
+        return values[0] if values else None
+    
+    async def read_registers(self, address: int, count: int, raise_errors: bool = False) -> Optional[List[int]]:
+        """Read multiple registers, None if failed (or the error with ``raise_errors``)."""
+        try:
+            return await self.modbus.read_holding_registers(self.slave_id, address, count)
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"Failed to read {count} registers from 0x{address:04X}: {e}")
+            return None
+    
+    async def write_register(self, address: int, value: int) -> bool:
+        """Write single register, False if failed."""
+        try:
+            return await self.modbus.write_single_register(self.slave_id, address, value)
+        except Exception as e:
+            logger.error(f"Failed to write register 0x{address:04X}: {e}")
+            return False
+    
+    async def write_registers(self, address: int, values: List[int]) -> bool:
+        """Write multiple registers, False if failed."""
+        try:
+            return await self.modbus.write_multiple_registers(self.slave_id, address, values)
+        except Exception as e:
+            logger.error(f"Failed to write {len(values)} registers to 0x{address:04X}: {e}")
+            return False
@@ -0,0 +1,624 @@
+"""
+Shared RS-485 bus scheduling.
+
+This module lets several L7 drives on one serial line share a single
+SerialConnection. One worker thread executes every transaction on the
+bus: requests are served in priority order and round-robin between
+slaves of equal priority, so no single drive can starve the others.
+"""
+
+import logging
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import IntEnum
+from threading import Condition, Thread, current_thread
+from typing import Optional, List, Dict, Any, Callable, Deque, Union
+
+from ..core.constants import PR_CONTROL_ADDRESS, DEFAULT_BAUDRATE, DEFAULT_TIMEOUT
+from ..core.exceptions import CommunicationError
+from .modbus import ModbusRTU, ModbusClient
+from .serial import SerialConnection
+
+logger = logging.getLogger(__name__)
+
+
+class BusPriority(IntEnum):
+    """Transaction priority on a shared bus (lower runs first)."""
+    CONTROL = 0  # PR trigger / emergency stop writes (0x6002)
+    WRITE = 1
+    READ = 2
+    POLL = 3
+
+
+def request_priority(method: str, address: int) -> BusPriority:
+    """
+    Get the default priority of a Modbus request.
+    
+    Parameters
+    ----------
+    method : str
+        ModbusRTU method name
+    address : int
+        Starting register address
+        
+    Returns
+    -------
+    BusPriority
+        Priority to queue the request with
+    """
+    if method.startswith('write'):
+        if address == PR_CONTROL_ADDRESS:
+            return BusPriority.CONTROL
+        return BusPriority.WRITE
+    return BusPriority.READ
+
+
+@dataclass
+class SlaveStats:
+    """Per-slave transaction statistics (times in seconds)."""
+    transactions: int = 0
+    errors: int = 0
+    total_latency: float = 0.0
+    min_latency: float = float('inf')
+    max_latency: float = 0.0
+    last_latency: float = 0.0
+    total_queue_wait: float = 0.0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+    
+    @property
+    def mean_latency(self) -> float:
+        """Mean bus latency per successful transaction."""
+        return self.total_latency / self.transactions if self.transactions else 0.0
+    
+    @property
+    def mean_queue_wait(self) -> float:
+        """Mean time a request waited in the queue."""
+        total = self.transactions + self.errors
+        return self.total_queue_wait / total if total else 0.0
+    
+    def percentile(self, percent: float) -> float:
+        """
+        Get a latency percentile over the most recent transactions.
+        
+        Parameters
+        ----------
+        percent : float
+            Percentile (0-100)
+            
+        Returns
+        -------
+        float
+            Latency in seconds, 0.0 if no samples
+        """
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100.0))
+        return ordered[index]
+    
+    def record(self, latency: float, queue_wait: float):
+        """Record a successful transaction."""
+        self.transactions += 1
+        self.total_latency += latency
+        self.min_latency = min(self.min_latency, latency)
+        self.max_latency = max(self.max_latency, latency)
+        self.last_latency = latency
+        self.total_queue_wait += queue_wait
+        self.recent.append(latency)
+    
+    def copy(self) -> 'SlaveStats':
+        """Return a snapshot of these statistics."""
+        snapshot = SlaveStats(
+            self.transactions, self.errors, self.total_latency,
+            self.min_latency, self.max_latency, self.last_latency,
+            self.total_queue_wait
+        )
+        snapshot.recent.extend(self.recent)
+        return snapshot
+
+
+class _Request:
+    """A queued bus transaction."""
+    
+    __slots__ = ('priority', 'slave_id', 'method', 'args', 'future', 'enqueued', 'poll')
+    
+    def __init__(self, priority, slave_id, method, args, poll=None):
+        self.priority = priority
+        self.slave_id = slave_id
+        self.method = method
+        self.args = args
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+        self.poll = poll
+
+
+class _PollTask:
+    """A periodic register read scheduled on the bus."""
+    
+    __slots__ = ('slave_id', 'address', 'count', 'interval', 'callback', 'next_due', 'pending')
+    
+    def __init__(self, slave_id, address, count, interval, callback):
+        self.slave_id = slave_id
+        self.address = address
+        self.count = count
+        self.interval = interval
+        self.callback = callback
+        self.next_due = time.perf_counter()
+        self.pending = False
+
+
+class ModbusBus:
+    """
+    Transaction scheduler for several slaves on one serial line.
+    
+    The bus owns a single :class:`SerialConnection`; every request from
+    every slave is executed by one worker thread, so frames from
+    different drives never interleave on the wire.
+    
+    Parameters
+    ----------
+    port : Union[str, SerialConnection]
+        Serial port name or an existing serial connection
+    baudrate : int, optional
+        Serial baudrate (default: 38400)
+    timeout : float, optional
+        Communication timeout in seconds (default: 1.0)
+        
+    Examples
+    --------
+    >>> with ModbusBus('COM3') as bus:
+    ...     axes = [bus.create_driver(slave_id) for slave_id in (1, 2, 3, 4)]
+    ...     for axis in axes:
+    ...         axis.connect()
+    ...     print(bus.get_stats(1).mean_latency)
+    """
+    
+    def __init__(
+        self,
+        port: Union[str, SerialConnection],
+        baudrate: int = DEFAULT_BAUDRATE,
+        timeout: float = DEFAULT_TIMEOUT,
+        **kwargs
+    ):
+        """Initialize bus scheduler."""
+        if isinstance(port, SerialConnection):
+            self.serial = port
+        else:
+            self.serial = SerialConnection(port, baudrate, timeout, **kwargs)
+        self._modbus = ModbusRTU(self.serial)
+        
+        # Pending requests: priority -> slave ID -> FIFO
+        self._queues: Dict[int, 'OrderedDict[int, Deque[_Request]]'] = {
+            priority: OrderedDict() for priority in BusPriority
+        }
+        self._polls: List[_PollTask] = []
+        self._stats: Dict[int, SlaveStats] = {}
+        
+        self._condition = Condition()
+        self._worker: Optional[Thread] = None
+        self._running = False
+    
+    @property
+    def is_running(self) -> bool:
+        """Check if the bus worker is running."""
+        return self._running and self._worker is not None and self._worker.is_alive()
+    
+    def in_worker_thread(self) -> bool:
+        """True if called from the bus worker (e.g. a poll callback)."""
+        worker = self._worker
+        return worker is not None and current_thread() is worker
+    
+    def connect(self) -> bool:
+        """
+        Open the serial port and start the bus worker.
+        
+        Returns
+        -------
+        bool
+            True if the bus is running
+            
+        Raises
+        ------
+        ConnectionError
+            If the serial port cannot be opened
+        """
+        with self._condition:
+            if self.is_running:
+                return True
+            if self._worker is not None and self._worker.is_alive():
+                logger.warning(f"Modbus bus on {self.serial.port} still stopping")
+                return False
+                
+            if not self.serial.connect():
+                return False
+                
+            self._running = True
+            self._worker = Thread(target=self._worker_loop, daemon=True)
+            self._worker.start()
+            
+        logger.info(f"Modbus bus started on {self.serial.port}")
+        return True
+    
+    def disconnect(self):
+        """
+        Stop the bus worker, fail pending requests and close the port.
+        
+        If the worker is still inside a request after the join timeout,
+        the worker reference and the open port are kept so it can finish
+        (pending requests are failed either way); call again to close
+        once it has exited.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+            worker = self._worker
+            
+        if worker:
+            worker.join(timeout=2.0)
+            
+        with self._condition:
+            for slaves in self._queues.values():
+                for pending in slaves.values():
+                    for request in pending:
+                        if not request.future.done():
+                            request.future.set_exception(
+                                CommunicationError("Bus stopped")
+                            )
+                slaves.clear()
+            if worker and worker.is_alive():
+                logger.warning(f"Modbus bus on {self.serial.port} still busy, port left open")
+                return
+            if self._worker is worker:
+                self._worker = None
+                
+        self.serial.disconnect()
+        logger.info(f"Modbus bus on {self.serial.port} stopped")
+    
+    # ==================== Requests ====================
+    
+    def submit(
+        self,
+        slave_id: int,
+        method: str,
+        *args,
+        priority: Optional[int] = None
+    ) -> Future:
+        """
+        Queue a Modbus request.
+        
+        The returned future is resolved by the bus worker; do not wait on
+        it from the worker itself (see :meth:`add_poll`).
+        
+        Parameters
+        ----------
+        slave_id : int
+            Slave device ID
+        method : str
+            ModbusRTU method name, e.g. ``'read_holding_registers'``
+        *args
+            Method arguments after the slave ID
+        priority : Optional[int]
+            Queue priority (default: derived from method and address)
+            
+        Returns
+        -------
+        Future
+            Future resolving to the method's return value
+            
+        Raises
+        ------
+        CommunicationError
+            If the bus is not running
+        """
+        if priority is None:
+            priority = request_priority(method, args[0] if args else 0)
+        request = _Request(priority, slave_id, method, args)
+        
+        with self._condition:
+            if not self._running:
+                raise CommunicationError("Bus not connected")
+            self._enqueue(request)
+            self._condition.notify()
+            
+        return request.future
+    
+    def execute(
+        self,
+        slave_id: int,
+        method: str,
+        *args,
+        priority: Optional[int] = None
+    ) -> Any:
+        """
+        Execute a Modbus request and wait for its result.
+        
+        Parameters
+        ----------
+        slave_id : int
+            Slave device ID
+        method : str
+            ModbusRTU method name
+        *args
+            Method arguments after the slave ID
+        priority : Optional[int]
+            Queue priority (default: derived from method and address)
+            
+        Returns
+        -------
+        Any
+            Method return value
+            
+        Raises
+        ------
+        ModbusError
+            If Modbus exception received
+        CommunicationError
+            If communication fails, or if called from the bus worker
+            (the request could never run)
+        """
+        if self.in_worker_thread():
+            raise CommunicationError(
+                "Blocking bus request from the bus worker (poll callback); "
+                "use submit() instead"
+            )
+        return self.submit(slave_id, method, *args, priority=priority).result()
+    
+    def client(self, slave_id: int) -> 'BusClient':
+        """
+        Create a Modbus client for one slave on this bus.
+        
+        Parameters
+        ----------
+        slave_id : int
+            Slave device ID
+            
+        Returns
+        -------
+        BusClient
+            Client routing its requests through the bus
+        """
+        return BusClient(self, slave_id)
+    
+    def create_driver(self, slave_id: int, **kwargs):
+        """
+        Create an L7Driver for one slave on this bus.
+        
+        Parameters
+        ----------
+        slave_id : int
+            Slave device ID
+        **kwargs
+            Additional arguments passed to L7Driver
+            
+        Returns
+        -------
+        L7Driver
+            Driver sharing this bus
+        """
+        from ..core.driver import L7Driver
+        return L7Driver(self.serial.port, slave_id, bus=self, **kwargs)
+    
+    # ==================== Polling ====================
+    
+    def add_poll(
+        self,
+        slave_id: int,
+        address: int,
+        count: int,
+        interval: float,
+        callback: Callable[[int, int, Optional[List[int]]], None]
+    ) -> object:
+        """
+        Poll a register block periodically.
+        
+        Poll reads run at the lowest priority and are served round-robin
+        between slaves. A poll is skipped while its previous read is
+        still queued, so a slow bus never builds up a backlog.
+        
+        Parameters
+        ----------
+        slave_id : int
+            Slave device ID
+        address : int
+            Starting register address
+        count : int
+            Number of registers
+        interval : float
+            Poll interval in seconds
+        callback : Callable
+            Called as ``callback(slave_id, address, values)``; ``values``
+            is None if the read failed. It runs on the bus worker, so it
+            must return quickly and must not make blocking requests on
+            this bus (:meth:`execute`, :class:`BusClient` or drivers
+            created by :meth:`create_driver`); those raise
+            :class:`CommunicationError`. :meth:`submit` is allowed as long
+            as the callback does not wait on the returned future.
+            
+        Returns
+        -------
+        object
+            Handle for :meth:`remove_poll`
+        """
+        task = _PollTask(slave_id, address, count, interval, callback)
+        with self._condition:
+            self._polls.append(task)
+            self._condition.notify()
+        return task
+    
+    def remove_poll(self, handle: object):
+        """Stop a poll created by :meth:`add_poll`."""
+        with self._condition:
+            if handle in self._polls:
+                self._polls.remove(handle)
+    
+    # ==================== Statistics ====================
+    
+    def get_stats(self, slave_id: Optional[int] = None) -> Union[SlaveStats, Dict[int, SlaveStats]]:
+        """
+        Get latency statistics.
+        
+        Parameters
+        ----------
+        slave_id : Optional[int]
+            Slave device ID, or None for all slaves
+            
+        Returns
+        -------
+        Union[SlaveStats, Dict[int, SlaveStats]]
+            Statistics snapshot for one slave or all slaves
+        """
+        with self._condition:
+            if slave_id is not None:
+                return self._stats.get(slave_id, SlaveStats()).copy()
+            return {sid: stats.copy() for sid, stats in self._stats.items()}
+    
+    def reset_stats(self):
+        """Clear latency statistics."""
+        with self._condition:
+            self._stats.clear()
+    
+    # ==================== Worker ====================
+    
+    def _enqueue(self, request: _Request):
+        """Append a request to its priority/slave queue (lock held)."""
+        slaves = self._queues[request.priority]
+        if request.slave_id not in slaves:
+            slaves[request.slave_id] = deque()
+        slaves[request.slave_id].append(request)
+    
+    def _next_request(self) -> Optional[_Request]:
+        """Pop the next request, round-robin within a priority (lock held)."""
+        for priority in sorted(self._queues):
+            slaves = self._queues[priority]
+            if not slaves:
+                continue
+            slave_id, pending = next(iter(slaves.items()))
+            request = pending.popleft()
+            if pending:
+                slaves.move_to_end(slave_id)
+            else:
+                del slaves[slave_id]
+            return request
+        return None
+    
+    def _schedule_polls(self, now: float) -> Optional[float]:
+        """Queue due polls and return seconds until the next one (lock held)."""
+        next_due = None
+        for task in self._polls:
+            if task.next_due <= now and not task.pending:
+                task.pending = True
+                task.next_due = max(task.next_due + task.interval, now)
+                self._enqueue(_Request(
+                    BusPriority.POLL, task.slave_id, 'read_holding_registers',
+                    (task.address, task.count), poll=task
+                ))
+            if not task.pending:
+                wait = task.next_due - now
+                next_due = wait if next_due is None else min(next_due, wait)
+        return next_due
+    
+    def _worker_loop(self):
+        """Execute queued requests until the bus is stopped."""
+        while True:
+            with self._condition:
+                if not self._running:
+                    break
+                wait = self._schedule_polls(time.perf_counter())
+                request = self._next_request()
+                if request is None:
+                    self._condition.wait(wait)
+                    continue
+                    
+            self._run(request)
+    
+    def _run(self, request: _Request):
+        """Execute one request and resolve its future."""
+        if not request.future.set_running_or_notify_cancel():
+            return
+            
+        start = time.perf_counter()
+        queue_wait = start - request.enqueued
+        method = getattr(self._modbus, request.method)
+        
+        try:
+            result = method(request.slave_id, *request.args)
+        except Exception as e:
+            with self._condition:
+                stats = self._stats.setdefault(request.slave_id, SlaveStats())
+                stats.errors += 1
+                stats.total_queue_wait += queue_wait
+            request.future.set_exception(e)
+            result = None
+        else:
+            latency = time.perf_counter() - start
+            with self._condition:
+                self._stats.setdefault(request.slave_id, SlaveStats()).record(latency, queue_wait)
+            request.future.set_result(result)
+            
+        if request.poll is not None:
+            task = request.poll
+            with self._condition:
+                task.pending = False
+            try:
+                task.callback(task.slave_id, task.address, result)
+            except Exception as e:
+                logger.error(f"Poll callback error: {e}")
+    
+    # ==================== Context Manager ====================
+    
+    def __enter__(self):
+        """Context manager entry."""
+        self.connect()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.disconnect()
+    
+    def __repr__(self) -> str:
+        """String representation."""
+        status = "running" if self.is_running else "stopped"
+        return f"ModbusBus(port='{self.serial.port}', status='{status}')"
+
+
+class _BusChannel:
+    """ModbusRTU-compatible front end that routes requests through a bus."""
+    
+    def __init__(self, bus: ModbusBus):
+        self.bus = bus
+        self.serial = bus.serial
+    
+    def read_holding_registers(self, slave_id: int, address: int, count: int = 1) -> List[int]:
+        return self.bus.execute(slave_id, 'read_holding_registers', address, count)
+    
+    def write_single_register(self, slave_id: int, address: int, value: int) -> bool:
+        return self.bus.execute(slave_id, 'write_single_register', address, value)
+    
+    def write_multiple_registers(self, slave_id: int, address: int, values: List[int]) -> bool:
+        return self.bus.execute(slave_id, 'write_multiple_registers', address, values)
+
+
+class BusClient(ModbusClient):
+    """
+    Modbus client for one slave on a shared bus.
+    
+    Behaves like :class:`ModbusClient`, but every request is queued on
+    the :class:`ModbusBus` instead of touching the serial port directly.
+    """
+    
+    def __init__(self, bus: ModbusBus, slave_id: int):
+        """
+        Initialize bus client.
+        
+        Parameters
+        ----------
+        bus : ModbusBus
+            Bus to route requests through
+        slave_id : int
+            Slave device ID
+        """
+        super().__init__(bus.serial, slave_id)
+        self.bus = bus
+        self.modbus = _BusChannel(bus)
@@ -0,0 +1,182 @@
+"""
+Register cache for Modbus clients.
+
+Cached values live as long as their register class allows: configuration
+registers stay valid until they are written, live status registers
+expire after a few milliseconds and command registers are never cached.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from threading import Lock
+from typing import Optional, List, Dict, Tuple, Sequence
+
+from ..core.constants import (
+    PARAMETER_ADDRESS, PARAMETER_32BIT,
+    REGISTER_CACHE_TTL, DEFAULT_CACHE_TTL, CACHE_MAX_ENTRIES
+)
+
+# Word -> other word of the same 32-bit parameter
+_PAIRED_WORDS: Dict[int, int] = {}
+for _name in PARAMETER_32BIT:
+    _high = PARAMETER_ADDRESS[_name]
+    _PAIRED_WORDS[_high] = _high + 1
+    _PAIRED_WORDS[_high + 1] = _high
+
+
+@dataclass
+class CacheStats:
+    """Register cache counters."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class RegisterCache:
+    """
+    Thread-safe register cache with per-class TTL and LRU eviction.
+    
+    Parameters
+    ----------
+    ttl_ranges : Sequence[Tuple[int, int, Optional[float]]]
+        (first, last, ttl) address ranges, first match wins; ttl None
+        means valid until written, 0 means never cached
+    default_ttl : Optional[float]
+        TTL of registers outside all ranges (seconds)
+    max_entries : int
+        Maximum number of cached registers
+    enabled : bool
+        Whether reads use the cache unless told otherwise
+    """
+    
+    def __init__(
+        self,
+        ttl_ranges: Sequence[Tuple[int, int, Optional[float]]] = REGISTER_CACHE_TTL,
+        default_ttl: Optional[float] = DEFAULT_CACHE_TTL,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        enabled: bool = False
+    ):
+        """Initialize register cache."""
+        self.ttl_ranges = tuple(ttl_ranges)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        
+        # address -> (value, expiry or None)
+        self._entries: 'OrderedDict[int, Tuple[int, Optional[float]]]' = OrderedDict()
+        self._ttl: Dict[int, Optional[float]] = {}
+        self._stats = CacheStats()
+        self._lock = Lock()
+    
+    def ttl(self, address: int) -> Optional[float]:
+        """
+        Get the cache lifetime of a register.
+        
+        Returns
+        -------
+        Optional[float]
+            Seconds, None if valid until written, 0 if never cached
+        """
+        ttl = self._ttl.get(address, -1)
+        if ttl == -1:
+            ttl = self.default_ttl
+            for first, last, range_ttl in self.ttl_ranges:
+                if first <= address <= last:
+                    ttl = range_ttl
+                    break
+            self._ttl[address] = ttl
+        return ttl
+    
+    def get(self, address: int, count: int = 1) -> Optional[List[int]]:
+        """
+        Look up ``count`` consecutive registers.
+        
+        Returns
+        -------
+        Optional[List[int]]
+            Cached values, None unless every register is cached and fresh
+        """
+        now = time.monotonic()
+        with self._lock:
+            values = []
+            for register in range(address, address + count):
+                entry = self._entries.get(register)
+                if entry is None or (entry[1] is not None and entry[1] <= now):
+                    self._stats.misses += 1
+                    return None
+                values.append(entry[0])
+            for register in range(address, address + count):
+                self._entries.move_to_end(register)
+            self._stats.hits += 1
+            return values
+    
+    def put(self, address: int, values: Sequence[int]):
+        """Store values read from (or written to) consecutive registers."""
+        now = time.monotonic()
+        with self._lock:
+            for register, value in enumerate(values, address):
+                ttl = self.ttl(register)
+                if ttl == 0:
+                    continue
+                self._entries[register] = (value, None if ttl is None else now + ttl)
+                self._entries.move_to_end(register)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+    
+    def write_through(self, address: int, values: Sequence[int]):
+        """
+        Update the cache after a successful write.
+        
+        Written registers take the new values, except words of a 32-bit
+        parameter that were not written as a pair: both words are dropped
+        so a half-written value is never served.
+        """
+        end = address + len(values)
+        torn = {
+            register for register in range(address, end)
+            if register in _PAIRED_WORDS and not address <= _PAIRED_WORDS[register] < end
+        }
+        self.put(address, [value & 0xFFFF for value in values])
+        if torn:
+            self.invalidate_many(torn | {_PAIRED_WORDS[register] for register in torn})
+    
+    def invalidate(self, address: int, count: int = 1):
+        """Drop cached registers."""
+        self.invalidate_many(range(address, address + count))
+    
+    def invalidate_many(self, addresses):
+        """Drop a set of cached registers."""
+        with self._lock:
+            for register in addresses:
+                if self._entries.pop(register, None) is not None:
+                    self._stats.invalidations += 1
+    
+    def clear(self):
+        """Drop all cached registers."""
+        with self._lock:
+            self._stats.invalidations += len(self._entries)
+            self._entries.clear()
+    
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the cache counters."""
+        with self._lock:
+            return replace(self._stats, entries=len(self._entries))
+    
+    def reset_stats(self):
+        """Reset hit/miss counters."""
+        with self._lock:
+            self._stats = CacheStats()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
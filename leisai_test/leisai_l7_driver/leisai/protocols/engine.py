@@ -0,0 +1,187 @@
+"""
+Single-owner serial I/O engine.
+
+With an :class:`IOEngine` one thread performs every Modbus transaction of
+a connection. Application threads hand their requests over through a
+queue and wait on a :class:`~concurrent.futures.Future`; framing,
+timeouts and retries run in the engine thread, so the port is only ever
+touched by that thread and callers never contend for its locks.
+"""
+
+import logging
+import time
+from concurrent.futures import Future
+from dataclasses import replace
+from queue import SimpleQueue
+from threading import Thread, get_ident
+from typing import Optional, Sequence, Tuple
+
+from ..core.exceptions import CommunicationError
+from .modbus import ModbusRTU, TransactionTiming
+
+logger = logging.getLogger(__name__)
+
+
+class IOEngine:
+    """
+    Owner thread of a serial connection.
+    
+    Requests are executed strictly in submission order. The engine still
+    takes the connection's transaction lock for each request (uncontended
+    unless a :class:`~leisai.protocols.keepalive.Keepalive` or another raw
+    frame sender is active), so such senders keep their priority.
+    
+    Normally created by ``SerialConnection(..., io_engine=True)``, which
+    starts it on connect and stops it on disconnect; :class:`ModbusRTU`
+    then routes its transactions through it.
+    
+    Parameters
+    ----------
+    serial_connection : SerialConnection
+        Connection to own
+        
+    Examples
+    --------
+    >>> driver = L7Driver('COM3', io_engine=True)
+    >>> driver.connect()   # every request now runs on the engine thread
+    """
+    
+    def __init__(self, serial_connection):
+        """Initialize I/O engine."""
+        self.serial = serial_connection
+        self._modbus = ModbusRTU(serial_connection, use_engine=False)
+        self._queue: SimpleQueue = SimpleQueue()
+        self._thread: Optional[Thread] = None
+        self._thread_id: Optional[int] = None
+        self.transactions = 0
+    
+    @property
+    def running(self) -> bool:
+        """True while the engine thread runs."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def backlog(self) -> int:
+        """Requests queued and not yet picked up (approximate)."""
+        return self._queue.qsize()
+    
+    def in_engine_thread(self) -> bool:
+        """True if called from the engine thread (e.g. a future callback)."""
+        return get_ident() == self._thread_id
+    
+    def start(self):
+        """Start the engine thread."""
+        if self.running:
+            return
+        self._thread = Thread(target=self._run, name=f'io-engine {self.serial.port}', daemon=True)
+        self._thread.start()
+        logger.debug(f"I/O engine started on {self.serial.port}")
+    
+    def stop(self, timeout: float = 2.0):
+        """
+        Stop the engine after the requests already queued.
+        
+        If the engine thread is still busy after ``timeout`` (e.g. a
+        transaction stuck in retries), it is left to finish on its own:
+        :attr:`running` stays True and requests queued behind the stop
+        marker are failed when the thread exits.
+        
+        Parameters
+        ----------
+        timeout : float
+            Maximum wait for the queue to drain in seconds
+        """
+        if not self.running:
+            return
+        self._queue.put(None)
+        if self.in_engine_thread():
+            return
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"I/O engine on {self.serial.port} still busy after {timeout:.1f}s")
+            return
+        self._thread = None
+        self._fail_pending()
+        logger.debug(f"I/O engine on {self.serial.port} stopped")
+    
+    def _fail_pending(self):
+        """Fail requests queued behind the stop marker (never executed)."""
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None and item[0].set_running_or_notify_cancel():
+                item[0].set_exception(CommunicationError("I/O engine stopped"))
+    
+    def submit(
+        self,
+        slave_id: int,
+        function_code: int,
+        address: int,
+        value: int,
+        response_length: int,
+        values: Optional[Sequence[int]] = None
+    ) -> 'Future[Tuple[bytes, Optional[TransactionTiming]]]':
+        """
+        Queue one Modbus transaction.
+        
+        Parameters
+        ----------
+        slave_id : int
+            Slave device ID
+        function_code : int
+            Request function code
+        address : int
+            Starting register address
+        value : int
+            Register value (0x06) or register count (0x03, 0x10)
+        response_length : int
+            Expected length of a normal response frame
+        values : Optional[Sequence[int]]
+            Register values for function code 0x10 (copied)
+            
+        Returns
+        -------
+        Future
+            Resolves to ``(response frame, timing)``; raises the
+            ModbusError / CommunicationError of the transaction
+            
+        Raises
+        ------
+        CommunicationError
+            If the engine is not running
+        """
+        if not self.running:
+            raise CommunicationError("I/O engine not running")
+        future: Future = Future()
+        if values is not None:
+            values = tuple(values)
+        self._queue.put((future, (slave_id, function_code, address, value, response_length, values),
+                         time.perf_counter()))
+        return future
+    
+    def _run(self):
+        """Engine thread: execute queued transactions one by one."""
+        self._thread_id = get_ident()
+        modbus = self._modbus
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._fail_pending()
+                break
+            future, request, queued = item
+            if not future.set_running_or_notify_cancel():
+                continue
+                
+            queue_wait = time.perf_counter() - queued
+            modbus.last_timing = None
+            try:
+                response = modbus._execute_transaction(*request)
+            except BaseException as e:
+                future.set_exception(e)
+                continue
+            self.transactions += 1
+            
+            timing = modbus.last_timing
+            if timing is not None:
+                timing = replace(timing, lock_wait=timing.lock_wait + queue_wait)
+            future.set_result((response, timing))
+        self._thread_id = None
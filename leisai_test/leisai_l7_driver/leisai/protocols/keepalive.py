@@ -0,0 +1,293 @@
+"""
+Real-time register keepalive.
+
+Some L7 commands only stay active while they are repeated, e.g. JOG
+(aux_function 0x4001/0x4002): the drive stops when the write is not
+renewed in time. :class:`Keepalive` repeats one prebuilt 0x06 frame on a
+drift-compensated schedule and takes the serial line at
+:attr:`PriorityLock.HIGH`, so queued status polls cannot push it past
+its deadline. Jitter statistics show how close it ran to the deadline.
+"""
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Thread, Event, Lock
+from typing import Optional, Deque
+
+from ..core.constants import MAX_RETRIES, RETRY_DELAY
+from ..core.exceptions import CommunicationError
+from .modbus import ModbusRTU, FrameBuffer
+from .serial import PriorityLock
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class KeepaliveStats:
+    """
+    Keepalive timing statistics (times in seconds).
+    
+    Attributes
+    ----------
+    sent : int
+        Frames acknowledged by the drive
+    failed : int
+        Frames without a valid echo
+    overruns : int
+        Periods skipped because a send overran its slot
+    deadline_misses : int
+        Gaps between acknowledged frames longer than the deadline
+    max_jitter : float
+        Largest delay between scheduled and actual send
+    max_latency : float
+        Largest send-to-echo time (including the wait for the line)
+    max_gap : float
+        Largest gap between acknowledged frames
+    """
+    sent: int = 0
+    failed: int = 0
+    overruns: int = 0
+    deadline_misses: int = 0
+    total_jitter: float = 0.0
+    max_jitter: float = 0.0
+    max_latency: float = 0.0
+    max_gap: float = 0.0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+    
+    @property
+    def mean_jitter(self) -> float:
+        """Mean delay between scheduled and actual send."""
+        total = self.sent + self.failed
+        return self.total_jitter / total if total else 0.0
+    
+    def percentile(self, percent: float) -> float:
+        """
+        Get a jitter percentile over the most recent sends.
+        
+        Parameters
+        ----------
+        percent : float
+            Percentile (0-100)
+            
+        Returns
+        -------
+        float
+            Jitter in seconds, 0.0 if no samples
+        """
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100.0))
+        return ordered[index]
+    
+    def copy(self) -> 'KeepaliveStats':
+        """Return a snapshot of these statistics."""
+        snapshot = KeepaliveStats(
+            self.sent, self.failed, self.overruns, self.deadline_misses,
+            self.total_jitter, self.max_jitter, self.max_latency, self.max_gap
+        )
+        snapshot.recent.extend(self.recent)
+        return snapshot
+
+
+class Keepalive:
+    """
+    Periodic single-register write on a dedicated timer thread.
+    
+    The request frame is built once; each tick writes it and compares
+    the echo byte for byte (a 0x06 response equals the request), without
+    going through the retry logic, the register cache or the parameter
+    manager. A failed tick is simply covered by the next one.
+    
+    Parameters
+    ----------
+    serial_connection : SerialConnection
+        Serial line of the drive
+    slave_id : int
+        Slave device ID
+    address : int
+        Register to write
+    value : int
+        Register value
+    period : float
+        Send period in seconds
+    deadline : Optional[float]
+        Longest tolerated gap between acknowledged frames (default:
+        four periods)
+    spin : float
+        Final part of each wait that is busy-waited instead of slept,
+        to beat coarse OS timer resolution
+        
+    Examples
+    --------
+    >>> keepalive = Keepalive(serial, 1, 0x0033, 0x4001, period=0.05)
+    >>> keepalive.start()
+    >>> keepalive.stats.percentile(99)
+    """
+    
+    def __init__(
+        self,
+        serial_connection,
+        slave_id: int,
+        address: int,
+        value: int,
+        period: float = 0.05,
+        deadline: Optional[float] = None,
+        spin: float = 0.001
+    ):
+        """Initialize keepalive."""
+        self.serial = serial_connection
+        self.period = period
+        self.deadline = deadline if deadline is not None else 4 * period
+        self.spin = spin
+        self.frame = bytes(FrameBuffer().request(
+            slave_id, ModbusRTU.WRITE_SINGLE_REGISTER, address, value
+        ))
+        
+        self._stats = KeepaliveStats()
+        self._stats_lock = Lock()
+        self._thread: Optional[Thread] = None
+        self._stop_event = Event()
+    
+    @property
+    def running(self) -> bool:
+        """True while the timer thread runs."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def stats(self) -> KeepaliveStats:
+        """Snapshot of the timing statistics."""
+        with self._stats_lock:
+            return self._stats.copy()
+    
+    @property
+    def stop_timeout(self) -> float:
+        """
+        Longest time the timer thread may need to notice a stop.
+        
+        A tick can wait for the line behind a transaction going through
+        all its retries, then make its own exchange.
+        """
+        timeout = self.serial.timeout
+        return MAX_RETRIES * (timeout + RETRY_DELAY) + timeout + self.period
+    
+    def start(self) -> bool:
+        """
+        Send the first frame now and start the timer thread.
+        
+        If a stopped timer thread has not exited yet, waits up to
+        :attr:`stop_timeout` for it; clearing the stop request while it
+        still runs would revive it next to the new one.
+        
+        Returns
+        -------
+        bool
+            True if the keepalive runs, False if the old thread is
+            still busy
+        """
+        if self._thread is not None and self._thread.is_alive():
+            if not self._stop_event.is_set():
+                return True
+            self._thread.join(self.stop_timeout)
+            if self._thread.is_alive():
+                logger.warning("Keepalive not restarted: previous timer thread still busy")
+                return False
+        self._stats = KeepaliveStats()
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, name='keepalive', daemon=True)
+        self._thread.start()
+        return True
+    
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop the timer thread.
+        
+        If the thread is still busy after ``timeout``, its reference is
+        kept (:attr:`running` stays True) and it exits after its current
+        send.
+        
+        Parameters
+        ----------
+        timeout : Optional[float]
+            Maximum wait in seconds (default: :attr:`stop_timeout`)
+            
+        Returns
+        -------
+        bool
+            True if the thread has exited
+        """
+        self._stop_event.set()
+        if self._thread is None:
+            return True
+        self._thread.join(self.stop_timeout if timeout is None else timeout)
+        if self._thread.is_alive():
+            logger.warning("Keepalive timer thread still busy after stop")
+            return False
+        self._thread = None
+        return True
+    
+    def send(self) -> bool:
+        """
+        Send the frame once at high priority.
+        
+        Returns
+        -------
+        bool
+            True if the drive echoed the frame
+        """
+        serial = self.serial
+        try:
+            with serial.transaction_lock.priority(PriorityLock.HIGH):
+                response = serial.exchange(self.frame, len(self.frame))
+        except CommunicationError as e:
+            logger.debug(f"Keepalive failed: {e}")
+            return False
+        return response == self.frame
+    
+    def _run(self):
+        """Timer thread: send on schedule, compensating drift."""
+        period = self.period
+        next_due = time.perf_counter()
+        last_ack = next_due
+        
+        while not self._stop_event.is_set():
+            # Sleep most of the way, then spin to the scheduled time
+            remaining = next_due - time.perf_counter()
+            if remaining > self.spin and self._stop_event.wait(remaining - self.spin):
+                break
+            while time.perf_counter() < next_due:
+                pass
+                
+            sent_at = time.perf_counter()
+            ok = self.send()
+            done = time.perf_counter()
+            self._record(sent_at - next_due, done - sent_at, ok, done - last_ack)
+            if ok:
+                last_ack = done
+                
+            # Next slot on the fixed grid; skip slots the send overran
+            next_due += period
+            if next_due < done:
+                skipped = int((done - next_due) / period) + 1
+                next_due += skipped * period
+                with self._stats_lock:
+                    self._stats.overruns += skipped
+    
+    def _record(self, jitter: float, latency: float, ok: bool, gap: float):
+        """Update statistics after one send."""
+        with self._stats_lock:
+            stats = self._stats
+            if ok:
+                stats.sent += 1
+                stats.max_gap = max(stats.max_gap, gap)
+                if gap > self.deadline:
+                    stats.deadline_misses += 1
+                    logger.warning(f"Keepalive gap {gap * 1e3:.1f} ms exceeded deadline")
+            else:
+                stats.failed += 1
+            stats.total_jitter += jitter
+            stats.max_jitter = max(stats.max_jitter, jitter)
+            stats.max_latency = max(stats.max_latency, latency)
+            stats.recent.append(jitter)
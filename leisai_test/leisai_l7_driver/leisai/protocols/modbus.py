@@ -8,7 +8,9 @@ with Leisai L7 servo drivers.
 import struct
 import time
 import logging
-from typing import Optional, List, Union, Tuple
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from typing import Optional, List, Union, Tuple, Callable, Sequence
 from dataclasses import dataclass
 
 from ..core.exceptions import (
@@ -17,9 +19,36 @@ from ..core.exceptions import (
     TimeoutError
 )
 from ..core.constants import MAX_RETRIES, RETRY_DELAY
+from .cache import RegisterCache
 
 logger = logging.getLogger(__name__)
 
+# Largest Modbus RTU frame: slave ID + 253-byte PDU + CRC
+MAX_FRAME_SIZE = 256
+
+# Precompiled frame layouts
+_CRC = struct.Struct('<H')
+_REQUEST = struct.Struct('>BBHH')            # slave, function, address, count/value
+_WRITE_MULTIPLE = struct.Struct('>BBHHB')    # slave, function, address, count, byte count
+
+
+@lru_cache(maxsize=None)
+def register_struct(count: int) -> struct.Struct:
+    """
+    Get the precompiled big-endian layout of ``count`` registers.
+    
+    Parameters
+    ----------
+    count : int
+        Number of 16-bit registers
+        
+    Returns
+    -------
+    struct.Struct
+        Cached ``'>{count}H'`` struct
+    """
+    return struct.Struct('>%dH' % count)
+
 
 @dataclass
 class ModbusFrame:
@@ -29,12 +58,29 @@ class ModbusFrame:
     data: bytes
     crc: Optional[int] = None
     
+    def pack_into(self, buffer: bytearray, offset: int = 0) -> int:
+        """
+        Write the frame with CRC into ``buffer`` at ``offset``.
+        
+        Returns
+        -------
+        int
+            Frame length in bytes
+        """
+        end = offset + 2 + len(self.data)
+        buffer[offset] = self.slave_id
+        buffer[offset + 1] = self.function_code
+        buffer[offset + 2:end] = self.data
+        if self.crc is None:
+            self.crc = calculate_crc16(memoryview(buffer)[offset:end])
+        _CRC.pack_into(buffer, end, self.crc)
+        return end + 2 - offset
+    
     def to_bytes(self) -> bytes:
         """Convert frame to bytes with CRC."""
-        frame = struct.pack('BB', self.slave_id, self.function_code) + self.data
-        if self.crc is None:
-            self.crc = calculate_crc16(frame)
-        return frame + struct.pack('<H', self.crc)
+        buffer = bytearray(4 + len(self.data))
+        self.pack_into(buffer)
+        return bytes(buffer)
     
     @classmethod
     def from_bytes(cls, data: bytes) -> 'ModbusFrame':
@@ -45,15 +91,146 @@ class ModbusFrame:
         slave_id = data[0]
         function_code = data[1]
         frame_data = data[2:-2]
-        crc = struct.unpack('<H', data[-2:])[0]
+        crc = _CRC.unpack_from(data, len(data) - 2)[0]
         
         return cls(slave_id, function_code, frame_data, crc)
 
 
+class FrameBuffer:
+    """
+    Preallocated buffer for building request frames in place.
+    
+    Frames are packed with precompiled structs straight into one
+    bytearray, and the CRC is computed over a memoryview of it. The
+    returned view stays valid until the next frame is built, so a
+    buffer must only be used by one transaction at a time.
+    
+    Parameters
+    ----------
+    size : int
+        Buffer size in bytes (default: MAX_FRAME_SIZE)
+    """
+    
+    __slots__ = ('_buffer', '_view')
+    
+    def __init__(self, size: int = MAX_FRAME_SIZE):
+        """Initialize frame buffer."""
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+    
+    def request(self, slave_id: int, function_code: int, address: int, value: int) -> memoryview:
+        """
+        Build a 0x03 or 0x06 request (address + count or value).
+        
+        Returns
+        -------
+        memoryview
+            Complete frame including CRC
+        """
+        _REQUEST.pack_into(self._buffer, 0, slave_id, function_code, address, value & 0xFFFF)
+        return self._finish(_REQUEST.size)
+    
+    def write_multiple(self, slave_id: int, address: int, values: Sequence[int]) -> memoryview:
+        """
+        Build a 0x10 request.
+        
+        Returns
+        -------
+        memoryview
+            Complete frame including CRC
+        """
+        count = len(values)
+        _WRITE_MULTIPLE.pack_into(
+            self._buffer, 0, slave_id, ModbusRTU.WRITE_MULTIPLE_REGISTERS,
+            address, count, count * 2
+        )
+        register_struct(count).pack_into(
+            self._buffer, _WRITE_MULTIPLE.size, *(value & 0xFFFF for value in values)
+        )
+        return self._finish(_WRITE_MULTIPLE.size + count * 2)
+    
+    def _finish(self, length: int) -> memoryview:
+        """Append the CRC and return a view of the frame."""
+        _CRC.pack_into(self._buffer, length, calculate_crc16(self._view[:length]))
+        return self._view[:length + 2]
+
+
+def check_response_crc(frame: bytes) -> None:
+    """
+    Verify the CRC of a received frame.
+    
+    Raises
+    ------
+    CommunicationError
+        If the CRC does not match
+    """
+    received = _CRC.unpack_from(frame, len(frame) - 2)[0]
+    calc_crc = calculate_crc16(memoryview(frame)[:-2])
+    if calc_crc != received:
+        raise CommunicationError(f"CRC mismatch: {calc_crc:04X} != {received:04X}")
+
+
+@dataclass
+class TransactionTiming:
+    """
+    Timing breakdown of one Modbus transaction.
+    
+    All times are in seconds.
+    """
+    function_code: int
+    request_size: int
+    response_size: int
+    wire_time: float
+    io_time: float
+    total_time: float
+    attempts: int = 1
+    lock_wait: float = 0.0
+    cpu_time: float = 0.0
+    
+    @property
+    def python_overhead(self) -> float:
+        """Time spent building, parsing and checking frames."""
+        return max(0.0, self.total_time - self.io_time - self.lock_wait)
+    
+    @property
+    def turnaround_time(self) -> float:
+        """I/O time not explained by characters on the wire."""
+        return max(0.0, self.io_time - self.wire_time)
+
+
+def _build_crc16_table() -> Tuple[int, ...]:
+    """Build the 256-entry lookup table for the Modbus polynomial (0xA001)."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_TABLE = _build_crc16_table()
+
+# Optional C implementation (``pip install leisai-l7-driver[speedups]``)
+try:
+    import crcmod.predefined
+    _crc16_native = crcmod.predefined.mkPredefinedCrcFun('modbus')
+except ImportError:
+    _crc16_native = None
+
+CRC16_BACKEND = 'crcmod' if _crc16_native is not None else 'table'
+
+
 def calculate_crc16(data: bytes) -> int:
     """
     Calculate Modbus CRC16.
     
+    Uses the C implementation from ``crcmod`` when it is installed and
+    falls back to a byte-wise table lookup otherwise.
+    
     Parameters
     ----------
     data : bytes
@@ -64,6 +241,24 @@ def calculate_crc16(data: bytes) -> int:
     int
         CRC16 value
     """
+    if _crc16_native is not None:
+        return _crc16_native(bytes(data))
+    return _crc16_table(data)
+
+
+def _crc16_table(data: bytes) -> int:
+    """Calculate Modbus CRC16 with the precomputed lookup table."""
+    crc = 0xFFFF
+    table = _CRC16_TABLE
+    
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    
+    return crc
+
+
+def _crc16_bitwise(data: bytes) -> int:
+    """Reference bit-by-bit Modbus CRC16, kept for verification."""
     crc = 0xFFFF
     
     for byte in data:
@@ -90,7 +285,10 @@ class ModbusRTU:
     WRITE_SINGLE_REGISTER = 0x06
     WRITE_MULTIPLE_REGISTERS = 0x10
     
-    def __init__(self, serial_connection):
+    # Slave ID + function code + exception code + CRC
+    EXCEPTION_RESPONSE_LENGTH = 5
+    
+    def __init__(self, serial_connection, use_engine: bool = True):
         """
         Initialize Modbus RTU handler.
         
@@ -98,9 +296,42 @@ class ModbusRTU:
         ----------
         serial_connection : SerialConnection
             Serial connection to use for communication
+        use_engine : bool
+            Hand transactions to the connection's I/O engine when it has one
         """
         self.serial = serial_connection
+        self.use_engine = use_engine
         self._transaction_id = 0
+        self._tx = FrameBuffer()
+        
+        # Timing of the most recent successful transaction
+        self.last_timing: Optional[TransactionTiming] = None
+        self.timing_callback: Optional[Callable[[TransactionTiming], None]] = None
+    
+    @classmethod
+    def response_length(cls, function_code: int, count: int = 1) -> int:
+        """
+        Get the length of a normal response frame.
+        
+        Parameters
+        ----------
+        function_code : int
+            Request function code
+        count : int
+            Number of registers requested (function code 0x03 only)
+            
+        Returns
+        -------
+        int
+            Response length in bytes including CRC
+        """
+        if function_code == cls.READ_HOLDING_REGISTERS:
+            # Slave ID + function + byte count + data + CRC
+            return 5 + count * 2
+        if function_code in (cls.WRITE_SINGLE_REGISTER, cls.WRITE_MULTIPLE_REGISTERS):
+            # Slave ID + function + address + value/count + CRC
+            return 8
+        raise CommunicationError(f"Unknown function code: {function_code}")
     
     def read_holding_registers(
         self, 
@@ -132,24 +363,18 @@ class ModbusRTU:
         CommunicationError
             If communication fails
         """
-        # Build request
-        data = struct.pack('>HH', address, count)
-        request = ModbusFrame(slave_id, self.READ_HOLDING_REGISTERS, data)
-        
         # Send and receive
-        response = self._execute_transaction(request)
+        response = self._execute_transaction(
+            slave_id, self.READ_HOLDING_REGISTERS, address, count,
+            self.response_length(self.READ_HOLDING_REGISTERS, count)
+        )
         
         # Parse response
-        byte_count = response.data[0]
+        byte_count = response[2]
         if byte_count != count * 2:
             raise CommunicationError(f"Invalid byte count: {byte_count}")
         
-        values = []
-        for i in range(1, byte_count + 1, 2):
-            value = struct.unpack('>H', response.data[i:i+2])[0]
-            values.append(value)
-        
-        return values
+        return list(register_struct(count).unpack_from(response, 3))
     
     def write_single_register(
         self,
@@ -181,15 +406,14 @@ class ModbusRTU:
         CommunicationError
             If communication fails
         """
-        # Build request
-        data = struct.pack('>HH', address, value & 0xFFFF)
-        request = ModbusFrame(slave_id, self.WRITE_SINGLE_REGISTER, data)
-        
         # Send and receive
-        response = self._execute_transaction(request)
+        response = self._execute_transaction(
+            slave_id, self.WRITE_SINGLE_REGISTER, address, value,
+            self.response_length(self.WRITE_SINGLE_REGISTER)
+        )
         
         # Verify response
-        resp_addr, resp_value = struct.unpack('>HH', response.data)
+        _, _, resp_addr, resp_value = _REQUEST.unpack_from(response)
         if resp_addr != address or resp_value != (value & 0xFFFF):
             raise CommunicationError("Write verification failed")
         
@@ -225,39 +449,55 @@ class ModbusRTU:
         CommunicationError
             If communication fails
         """
-        # Build request
         count = len(values)
-        byte_count = count * 2
-        
-        data = struct.pack('>HHB', address, count, byte_count)
-        for value in values:
-            data += struct.pack('>H', value & 0xFFFF)
-        
-        request = ModbusFrame(slave_id, self.WRITE_MULTIPLE_REGISTERS, data)
         
         # Send and receive
-        response = self._execute_transaction(request)
+        response = self._execute_transaction(
+            slave_id, self.WRITE_MULTIPLE_REGISTERS, address, count,
+            self.response_length(self.WRITE_MULTIPLE_REGISTERS), values
+        )
         
         # Verify response
-        resp_addr, resp_count = struct.unpack('>HH', response.data)
+        _, _, resp_addr, resp_count = _REQUEST.unpack_from(response)
         if resp_addr != address or resp_count != count:
             raise CommunicationError("Write verification failed")
         
         return True
     
-    def _execute_transaction(self, request: ModbusFrame) -> ModbusFrame:
+    def _execute_transaction(
+        self,
+        slave_id: int,
+        function_code: int,
+        address: int,
+        value: int,
+        response_length: int,
+        values: Optional[Sequence[int]] = None
+    ) -> bytes:
         """
         Execute a Modbus transaction with retry logic.
         
+        The request is built in the preallocated frame buffer while the
+        transaction lock is held.
+        
         Parameters
         ----------
-        request : ModbusFrame
-            Request frame to send
+        slave_id : int
+            Slave device ID
+        function_code : int
+            Request function code
+        address : int
+            Starting register address
+        value : int
+            Register value (0x06) or register count (0x03, 0x10)
+        response_length : int
+            Expected length of a normal response frame
+        values : Optional[Sequence[int]]
+            Register values for function code 0x10
             
         Returns
         -------
-        ModbusFrame
-            Response frame
+        bytes
+            Response frame (CRC checked)
             
         Raises
         ------
@@ -266,38 +506,56 @@ class ModbusRTU:
         CommunicationError
             If communication fails after retries
         """
+        engine = self.serial.engine if self.use_engine else None
+        if engine is not None and engine.running and not engine.in_engine_thread():
+            return self._engine_transaction(
+                engine, slave_id, function_code, address, value, response_length, values
+            )
+            
         self._transaction_id += 1
         transaction_id = self._transaction_id
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        lock_wait = 0.0
         
         for attempt in range(MAX_RETRIES):
             try:
                 logger.debug(f"Transaction {transaction_id} attempt {attempt + 1}")
                 
-                # Clear buffers
-                self.serial.reset_buffers()
-                
-                # Send request
-                request_bytes = request.to_bytes()
-                logger.info(f"TX: {request_bytes.hex(' ').upper()}")
-                self.serial.write(request_bytes)
-                
-                # Receive response
-                response_bytes = self._receive_response(request.slave_id, request.function_code)
-                logger.info(f"RX: {response_bytes.hex(' ').upper()}")
-                
-                # Parse response
-                response = ModbusFrame.from_bytes(response_bytes)
+                # Request and response must not interleave with other clients
+                wait_start = time.perf_counter()
+                with self.serial.transaction_lock:
+                    io_start = time.perf_counter()
+                    lock_wait += io_start - wait_start
+                    
+                    # Build request in place
+                    if values is None:
+                        request = self._tx.request(slave_id, function_code, address, value)
+                    else:
+                        request = self._tx.write_multiple(slave_id, address, values)
+                    request_size = len(request)
+                    
+                    # Send request and receive response in one port access
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(f"TX: {request.hex(' ').upper()}")
+                    frame = self.serial.exchange(request, response_length)
+                    response = self._receive_response(slave_id, function_code, response_length, frame)
+                    io_time = time.perf_counter() - io_start
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"RX: {response.hex(' ').upper()}")
                 
                 # Verify CRC
-                calc_crc = calculate_crc16(response_bytes[:-2])
-                if calc_crc != response.crc:
-                    raise CommunicationError(f"CRC mismatch: {calc_crc:04X} != {response.crc:04X}")
+                check_response_crc(response)
                 
                 # Check for exception
-                if response.function_code & 0x80:
-                    exception_code = response.data[0]
-                    raise ModbusError(exception_code)
+                if response[1] & 0x80:
+                    raise ModbusError(response[2])
                 
+                self._record_timing(
+                    function_code, request_size, len(response),
+                    io_time, time.perf_counter() - start, attempt + 1,
+                    lock_wait, time.thread_time() - cpu_start
+                )
                 return response
                 
             except TimeoutError:
@@ -307,6 +565,14 @@ class ModbusRTU:
                     continue
                 raise
             
+            except ModbusError as e:
+                # The slave answered; only a busy slave is worth asking again
+                logger.warning(f"Transaction {transaction_id}: {e}")
+                if e.exception_code in (0x05, 0x06) and attempt < MAX_RETRIES - 1:
+                    time.sleep(RETRY_DELAY)
+                    continue
+                raise
+                
             except Exception as e:
                 logger.error(f"Transaction {transaction_id} failed: {e}")
                 if attempt < MAX_RETRIES - 1:
@@ -316,9 +582,78 @@ class ModbusRTU:
         
         raise CommunicationError(f"Transaction failed after {MAX_RETRIES} attempts")
     
-    def _receive_response(self, slave_id: int, function_code: int) -> bytes:
+    def _engine_transaction(
+        self,
+        engine,
+        slave_id: int,
+        function_code: int,
+        address: int,
+        value: int,
+        response_length: int,
+        values: Optional[Sequence[int]]
+    ) -> bytes:
         """
-        Receive and validate response.
+        Run a transaction on the I/O engine thread and wait for it.
+        
+        The wait is bounded: a request submitted just as the engine
+        thread exits is never picked up, so its future would stay
+        pending forever. The bound grows with the requests queued ahead,
+        since the wait includes their turn on the line.
+        """
+        start = time.perf_counter()
+        # Queued requests and the one in flight may each use all retries
+        ahead = engine.backlog + 1
+        future = engine.submit(slave_id, function_code, address, value, response_length, values)
+        wait = (ahead + 1) * MAX_RETRIES * (self.serial.timeout + RETRY_DELAY)
+        try:
+            response, timing = future.result(timeout=wait)
+        except FutureTimeoutError:
+            future.cancel()
+            raise CommunicationError(f"I/O engine did not answer within {wait:.1f}s")
+        if timing is not None:
+            self._record_timing(
+                timing.function_code, timing.request_size, timing.response_size,
+                timing.io_time, time.perf_counter() - start, timing.attempts,
+                timing.lock_wait, timing.cpu_time
+            )
+        return response
+    
+    def _record_timing(
+        self,
+        function_code: int,
+        request_size: int,
+        response_size: int,
+        io_time: float,
+        total_time: float,
+        attempts: int,
+        lock_wait: float = 0.0,
+        cpu_time: float = 0.0
+    ):
+        """Store timing of a completed transaction and notify the callback."""
+        wire_time = (request_size + response_size) * self.serial.char_time
+        timing = TransactionTiming(
+            function_code, request_size, response_size,
+            wire_time, io_time, total_time, attempts, lock_wait, cpu_time
+        )
+        self.last_timing = timing
+        
+        logger.debug(
+            f"Timing: wire {wire_time * 1e3:.2f} ms, io {io_time * 1e3:.2f} ms, "
+            f"lock {lock_wait * 1e3:.2f} ms, python {timing.python_overhead * 1e3:.2f} ms"
+        )
+        
+        if self.timing_callback:
+            try:
+                self.timing_callback(timing)
+            except Exception as e:
+                logger.error(f"Timing callback error: {e}")
+    
+    def _receive_response(self, slave_id: int, function_code: int, length: int, frame: bytes) -> bytes:
+        """
+        Validate a response and complete it if it was cut short.
+        
+        ``frame`` comes from one bulk read of the expected length; an
+        exception response ends early on the inter-frame silence.
         
         Parameters
         ----------
@@ -326,6 +661,10 @@ class ModbusRTU:
             Expected slave ID
         function_code : int
             Expected function code (without error bit)
+        length : int
+            Expected length of a normal response frame
+        frame : bytes
+            Data received for the response
             
         Returns
         -------
@@ -339,12 +678,10 @@ class ModbusRTU:
         CommunicationError
             If response is invalid
         """
-        # Read header (slave ID + function code)
-        header = self.serial.read(2)
-        if len(header) < 2:
+        if len(frame) < 2:
             raise TimeoutError("Response timeout")
         
-        recv_slave_id, recv_function = struct.unpack('BB', header)
+        recv_slave_id, recv_function = frame[0], frame[1]
         
         # Validate slave ID
         if recv_slave_id != slave_id:
@@ -352,39 +689,26 @@ class ModbusRTU:
         
         # Check if exception response
         if recv_function & 0x80:
-            # Exception response: 1 byte exception code + 2 bytes CRC
-            exception_data = self.serial.read(3)
-            if len(exception_data) < 3:
+            if len(frame) < self.EXCEPTION_RESPONSE_LENGTH:
                 raise TimeoutError("Exception response incomplete")
-            return header + exception_data
+            return frame[:self.EXCEPTION_RESPONSE_LENGTH]
         
         # Normal response
         if recv_function != function_code:
             raise CommunicationError(f"Function code mismatch: {recv_function} != {function_code}")
         
-        # Read rest of frame based on function code
-        if function_code == self.READ_HOLDING_REGISTERS:
-            # Byte count + data + CRC
-            byte_count_data = self.serial.read(1)
-            if not byte_count_data:
-                raise TimeoutError("Byte count missing")
-            
-            byte_count = byte_count_data[0]
-            data_and_crc = self.serial.read(byte_count + 2)
-            if len(data_and_crc) < byte_count + 2:
+        # A gap inside the frame (e.g. USB adapter latency) ended the
+        # bulk read early; collect the rest until the line times out.
+        while len(frame) < length:
+            try:
+                frame += self.serial.read(length - len(frame))
+            except TimeoutError:
                 raise TimeoutError("Response data incomplete")
-            
-            return header + byte_count_data + data_and_crc
         
-        elif function_code in [self.WRITE_SINGLE_REGISTER, self.WRITE_MULTIPLE_REGISTERS]:
-            # Address (2) + value/count (2) + CRC (2)
-            data = self.serial.read(6)
-            if len(data) < 6:
-                raise TimeoutError("Response data incomplete")
-            return header + data
+        if function_code == self.READ_HOLDING_REGISTERS and frame[2] != length - 5:
+            raise CommunicationError(f"Invalid byte count: {frame[2]}")
         
-        else:
-            raise CommunicationError(f"Unknown function code: {function_code}")
+        return frame
 
 
 class ModbusClient:
@@ -393,9 +717,13 @@ class ModbusClient:
     
     This class provides a simplified interface for Modbus operations
     with automatic connection management and error handling.
+    
+    Every successful read and write updates :attr:`cache`. Reads are
+    served from it when ``use_cache`` is True, or when it is None and
+    ``cache.enabled`` is set.
     """
     
-    def __init__(self, serial_connection, slave_id: int = 1):
+    def __init__(self, serial_connection, slave_id: int = 1, cache: Optional[RegisterCache] = None):
         """
         Initialize Modbus client.
         
@@ -405,13 +733,15 @@ class ModbusClient:
             Serial connection to use
         slave_id : int
             Default slave ID
+        cache : Optional[RegisterCache]
+            Register cache (default: a new, disabled cache)
         """
+        self.serial = serial_connection
         self.modbus = ModbusRTU(serial_connection)
         self.slave_id = slave_id
-        self._cache = {}
-        self._cache_timeout = 0.1  # 100ms cache
+        self.cache = cache if cache is not None else RegisterCache()
         
-    def read_register(self, address: int, use_cache: bool = False) -> Optional[int]:
+    def read_register(self, address: int, use_cache: Optional[bool] = None) -> Optional[int]:
         """
         Read single register with optional caching.
         
@@ -419,34 +749,17 @@ class ModbusClient:
         ----------
         address : int
             Register address
-        use_cache : bool
+        use_cache : Optional[bool]
             Whether to use cached value if available
+            (default: ``cache.enabled``)
             
         Returns
         -------
         Optional[int]
             Register value or None if failed
         """
-        try:
-            # Check cache
-            if use_cache:
-                cached = self._get_cached(address)
-                if cached is not None:
-                    return cached
-            
-            # Read from device
-            values = self.modbus.read_holding_registers(self.slave_id, address, 1)
-            value = values[0] if values else None
-            
-            # Update cache
-            if value is not None:
-                self._set_cached(address, value)
-            
-            return value
-            
-        except Exception as e:
-            logger.error(f"Failed to read register 0x{address:04X}: {e}")
-            return None
+        values = self.read_registers(address, 1, use_cache)
+        return values[0] if values else None
     
     def write_register(self, address: int, value: int) -> bool:
         """
@@ -467,9 +780,9 @@ class ModbusClient:
         try:
             success = self.modbus.write_single_register(self.slave_id, address, value)
             
-            # Invalidate cache
+            # Write through cache
             if success:
-                self._invalidate_cache(address)
+                self.cache.write_through(address, [value])
             
             return success
             
@@ -477,7 +790,13 @@ class ModbusClient:
             logger.error(f"Failed to write register 0x{address:04X}: {e}")
             return False
     
-    def read_registers(self, address: int, count: int) -> Optional[List[int]]:
+    def read_registers(
+        self,
+        address: int,
+        count: int,
+        use_cache: Optional[bool] = None,
+        raise_errors: bool = False
+    ) -> Optional[List[int]]:
         """
         Read multiple registers.
         
@@ -487,15 +806,30 @@ class ModbusClient:
             Starting address
         count : int
             Number of registers
+        use_cache : Optional[bool]
+            Whether to use cached values if all are available
+            (default: ``cache.enabled``)
+        raise_errors : bool
+            Raise the ModbusError / CommunicationError of a failed read
+            instead of returning None
             
         Returns
         -------
         Optional[List[int]]
             Register values or None if failed
         """
+        if use_cache if use_cache is not None else self.cache.enabled:
+            values = self.cache.get(address, count)
+            if values is not None:
+                return values
+                
         try:
-            return self.modbus.read_holding_registers(self.slave_id, address, count)
+            values = self.modbus.read_holding_registers(self.slave_id, address, count)
+            self.cache.put(address, values)
+            return values
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"Failed to read {count} registers from 0x{address:04X}: {e}")
             return None
     
@@ -518,10 +852,9 @@ class ModbusClient:
         try:
             success = self.modbus.write_multiple_registers(self.slave_id, address, values)
             
-            # Invalidate cache
+            # Write through cache
             if success:
-                for i in range(len(values)):
-                    self._invalidate_cache(address + i)
+                self.cache.write_through(address, values)
             
             return success
             
@@ -529,7 +862,7 @@ class ModbusClient:
             logger.error(f"Failed to write {len(values)} registers to 0x{address:04X}: {e}")
             return False
     
-    def read_32bit(self, address: int) -> Optional[int]:
+    def read_32bit(self, address: int, use_cache: Optional[bool] = None) -> Optional[int]:
         """
         Read 32-bit value from two consecutive registers.
         
@@ -537,13 +870,16 @@ class ModbusClient:
         ----------
         address : int
             Starting address
+        use_cache : Optional[bool]
+            Whether to use cached values if available
+            (default: ``cache.enabled``)
             
         Returns
         -------
         Optional[int]
             32-bit value or None if failed
         """
-        values = self.read_registers(address, 2)
+        values = self.read_registers(address, 2, use_cache)
         if values and len(values) == 2:
             # 高位在前，低位在后 (big-endian)
             value = (values[0] << 16) | values[1]
@@ -574,21 +910,9 @@ class ModbusClient:
         high = (value >> 16) & 0xFFFF
         return self.write_registers(address, [low, high])
     
-    def _get_cached(self, address: int) -> Optional[int]:
-        """Get cached value if not expired."""
-        if address in self._cache:
-            value, timestamp = self._cache[address]
-            if time.time() - timestamp < self._cache_timeout:
-                return value
-        return None
-    
-    def _set_cached(self, address: int, value: int):
-        """Store value in cache."""
-        self._cache[address] = (value, time.time())
-    
     def _invalidate_cache(self, address: int = None):
         """Invalidate cache for address or all."""
         if address is None:
-            self._cache.clear()
+            self.cache.clear()
         else:
-            self._cache.pop(address, None)
\ No newline at end of file
+            self.cache.invalidate(address)
@@ -4,18 +4,159 @@ Serial communication layer.
 This module provides the serial communication interface for the Modbus protocol.
 """
 
+import os
 import serial
 import time
+import heapq
+import select
 import logging
-from typing import Optional, Union
-from threading import Lock
+import itertools
+from contextlib import contextmanager
+from typing import Optional, Union, List, Tuple, Iterator
+from threading import Lock, Condition
 
 from ..core.exceptions import ConnectionError, TimeoutError, CommunicationError
 from ..core.constants import DEFAULT_BAUDRATE, DEFAULT_TIMEOUT
+from .engine import IOEngine
 
 logger = logging.getLogger(__name__)
 
 
+class _FrameSerial(serial.Serial):
+    """
+    pyserial port whose ``read`` ends on short inter-byte gaps.
+    
+    pyserial's POSIX backend maps ``inter_byte_timeout`` onto termios
+    VTIME, which counts in 0.1 s steps, so a Modbus frame silence of a
+    few milliseconds is rounded away to nothing. Below 0.1 s this port
+    waits for each further byte in ``select`` itself; other platforms
+    and longer gaps use the pyserial implementation.
+    """
+    
+    def read(self, size: int = 1) -> bytes:
+        gap = self._inter_byte_timeout
+        if gap is None or gap >= 0.1 or not hasattr(self, 'fd'):
+            return super().read(size)
+        if not self.is_open:
+            raise serial.PortNotOpenError()
+            
+        data = bytearray()
+        timeout = serial.Timeout(self._timeout)
+        while len(data) < size:
+            wait = timeout.time_left()
+            if data:
+                wait = gap if wait is None else min(gap, wait)
+            try:
+                ready, _, _ = select.select([self.fd], [], [], wait)
+                if not ready:
+                    break
+                chunk = os.read(self.fd, size - len(data))
+            except (BlockingIOError, InterruptedError):
+                continue
+            except OSError as e:
+                raise serial.SerialException(f"read failed: {e}")
+            if not chunk:
+                raise serial.SerialException(
+                    "device reports readiness to read but returned no data"
+                )
+            data.extend(chunk)
+            if timeout.expired():
+                break
+        return bytes(data)
+
+
+class PriorityLock:
+    """
+    Lock that hands ownership to waiters in priority order.
+    
+    Lower values go first; waiters of equal priority are served FIFO.
+    A transaction already on the wire is never interrupted, but a
+    high-priority waiter takes the line at the next transaction boundary
+    ahead of everyone queued behind the current owner.
+    
+    Used as a plain lock (``with lock:``) it acquires at :attr:`NORMAL`.
+    """
+    
+    HIGH = 0
+    NORMAL = 10
+    
+    def __init__(self):
+        self._condition = Condition(Lock())
+        self._owned = False
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+    
+    def acquire(self, blocking: bool = True, timeout: float = -1, priority: int = NORMAL) -> bool:
+        """
+        Acquire the lock.
+        
+        Parameters
+        ----------
+        blocking : bool
+            Wait for the lock if it is held
+        timeout : float
+            Maximum wait in seconds (-1: no limit)
+        priority : int
+            Waiter priority (lower first)
+            
+        Returns
+        -------
+        bool
+            True if the lock was acquired
+        """
+        with self._condition:
+            if not self._owned and not self._waiters:
+                self._owned = True
+                return True
+            if not blocking:
+                return False
+                
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiters, ticket)
+            deadline = None if timeout < 0 else time.monotonic() + timeout
+            while self._owned or self._waiters[0] != ticket:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                    self._condition.notify_all()
+                    return False
+                self._condition.wait(remaining)
+                
+            heapq.heappop(self._waiters)
+            self._owned = True
+            return True
+    
+    def release(self):
+        """Release the lock and wake the highest-priority waiter."""
+        with self._condition:
+            if not self._owned:
+                raise RuntimeError("release unlocked lock")
+            self._owned = False
+            if self._waiters:
+                self._condition.notify_all()
+    
+    def locked(self) -> bool:
+        """True if the lock is held."""
+        return self._owned
+    
+    @contextmanager
+    def priority(self, level: int) -> Iterator[None]:
+        """Hold the lock, acquired at ``level``."""
+        self.acquire(priority=level)
+        try:
+            yield
+        finally:
+            self.release()
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
 class SerialConnection:
     """
     Thread-safe serial connection handler.
@@ -29,6 +170,7 @@ class SerialConnection:
         port: str,
         baudrate: int = DEFAULT_BAUDRATE,
         timeout: float = DEFAULT_TIMEOUT,
+        io_engine: bool = False,
         **kwargs
     ):
         """
@@ -42,8 +184,12 @@ class SerialConnection:
             Baud rate (default: 38400)
         timeout : float
             Read timeout in seconds (default: 1.0)
+        io_engine : bool
+            Run all Modbus transactions on one I/O thread while connected
+            (see :class:`~leisai.protocols.engine.IOEngine`)
         **kwargs
-            Additional arguments passed to serial.Serial
+            Additional arguments passed to serial.Serial. Without an
+            ``inter_byte_timeout`` the port uses :attr:`frame_silence`.
         """
         self.port = port
         self.baudrate = baudrate
@@ -61,8 +207,48 @@ class SerialConnection:
         
         self._serial: Optional[serial.Serial] = None
         self._lock = Lock()
+        self._transaction_lock = PriorityLock()
         self._connected = False
         
+        self.io_engine = io_engine
+        self.engine: Optional[IOEngine] = None
+        
+    @property
+    def transaction_lock(self) -> PriorityLock:
+        """
+        Lock held for the duration of one request/response exchange.
+        
+        Acquire it at :attr:`PriorityLock.HIGH` for time-critical frames
+        (e.g. the JOG keepalive) to get the line before queued requests.
+        """
+        return self._transaction_lock
+    
+    @property
+    def char_time(self) -> float:
+        """Time in seconds to transmit one character at the current settings."""
+        bits = 1 + self.serial_args['bytesize'] + self.serial_args['stopbits']
+        if self.serial_args['parity'] != serial.PARITY_NONE:
+            bits += 1
+        return bits / self.baudrate
+    
+    @property
+    def frame_silence(self) -> float:
+        """
+        Modbus RTU inter-frame silence (3.5 character times).
+        
+        The Modbus serial line spec fixes it at 1.75 ms above 19200 baud.
+        """
+        if self.baudrate > 19200:
+            return 0.00175
+        return 3.5 * self.char_time
+    
+    @property
+    def inter_byte_timeout(self) -> float:
+        """Line gap that ends a frame read (default: :attr:`frame_silence`)."""
+        if self.serial_args['inter_byte_timeout'] is None:
+            return self.frame_silence
+        return self.serial_args['inter_byte_timeout']
+    
     @property
     def is_connected(self) -> bool:
         """Check if serial port is connected and open."""
@@ -90,12 +276,8 @@ class SerialConnection:
             try:
                 logger.info(f"Opening serial port {self.port} at {self.baudrate} baud")
                 
-                self._serial = serial.Serial(
-                    port=self.port,
-                    baudrate=self.baudrate,
-                    timeout=self.timeout,
-                    **self.serial_args
-                )
+                self._serial = self._open_port()
+                self._serial.inter_byte_timeout = self.inter_byte_timeout
                 
                 # Clear buffers
                 self._serial.reset_input_buffer()
@@ -103,6 +285,10 @@ class SerialConnection:
                 
                 self._connected = True
                 logger.info(f"Serial port {self.port} opened successfully")
+                
+                if self.io_engine:
+                    self.engine = IOEngine(self)
+                    self.engine.start()
                 return True
                 
             except serial.SerialException as e:
@@ -112,8 +298,30 @@ class SerialConnection:
                 logger.error(f"Unexpected error opening serial port: {e}")
                 raise ConnectionError(f"Serial connection failed: {e}")
     
+    def _open_port(self) -> serial.Serial:
+        """Open the underlying pyserial port."""
+        return _FrameSerial(
+            port=self.port,
+            baudrate=self.baudrate,
+            timeout=self.timeout,
+            **self.serial_args
+        )
+    
     def disconnect(self):
-        """Close serial connection."""
+        """
+        Close serial connection.
+        
+        If the I/O engine is still inside a transaction after its stop
+        timeout, the engine and the port are kept so the thread can
+        finish; call again to close once it has exited.
+        """
+        if self.engine is not None:
+            self.engine.stop()
+            if self.engine.running:
+                logger.warning(f"Serial port {self.port} left open: I/O engine still busy")
+                return
+            self.engine = None
+            
         with self._lock:
             if self._serial:
                 try:
@@ -195,6 +403,92 @@ class SerialConnection:
                 self._connected = False
                 raise CommunicationError(f"Serial read error: {e}")
     
+    def read_frame(self, size: int) -> bytes:
+        """
+        Read one frame of up to ``size`` bytes under a single lock.
+        
+        The whole frame is requested in one bulk read, which also ends
+        when the line stays silent for :attr:`inter_byte_timeout`, so
+        short frames (e.g. Modbus exception responses) do not wait for
+        the full timeout.
+        
+        Parameters
+        ----------
+        size : int
+            Expected frame length in bytes
+            
+        Returns
+        -------
+        bytes
+            Frame data (may be shorter than ``size`` on timeout or
+            when the frame ended early)
+            
+        Raises
+        ------
+        TimeoutError
+            If no data received within timeout
+        CommunicationError
+            If read fails
+        """
+        if not self.is_connected:
+            raise CommunicationError("Serial port not connected")
+        
+        with self._lock:
+            try:
+                return self._read_frame(size)
+            except serial.SerialException as e:
+                self._connected = False
+                raise CommunicationError(f"Serial read error: {e}")
+    
+    def exchange(self, request: bytes, size: int) -> bytes:
+        """
+        Send a request and read its response frame under a single lock.
+        
+        Same as :meth:`reset_buffers`, :meth:`write` and :meth:`read_frame`
+        in a row, but the port lock is taken once for the whole exchange.
+        
+        Parameters
+        ----------
+        request : bytes
+            Request frame
+        size : int
+            Expected response length in bytes
+            
+        Returns
+        -------
+        bytes
+            Response data (may be shorter than ``size``, see :meth:`read_frame`)
+            
+        Raises
+        ------
+        TimeoutError
+            If the write or the response times out
+        CommunicationError
+            If the port fails
+        """
+        if not self.is_connected:
+            raise CommunicationError("Serial port not connected")
+        
+        with self._lock:
+            try:
+                self._serial.reset_input_buffer()
+                self._serial.reset_output_buffer()
+                self._serial.write(request)
+                self._serial.flush()
+                return self._read_frame(size)
+            except serial.SerialTimeoutException:
+                raise TimeoutError("Serial write timeout")
+            except serial.SerialException as e:
+                self._connected = False
+                raise CommunicationError(f"Serial I/O error: {e}")
+    
+    def _read_frame(self, size: int) -> bytes:
+        """Single bulk frame read, ended early by line silence (lock held)."""
+        data = self._serial.read(size)
+        if not data:
+            raise TimeoutError("Serial read timeout")
+        return data
+    
     def read_until(self, terminator: bytes = b'\n', size: Optional[int] = None) -> bytes:
         """
         Read data until terminator is found.
@@ -296,6 +590,7 @@ class SerialConnection:
             try:
                 self._serial.baudrate = baudrate
                 self.baudrate = baudrate
+                self._serial.inter_byte_timeout = self.inter_byte_timeout
                 logger.info(f"Baudrate changed to {baudrate}")
             except Exception as e:
                 logger.error(f"Failed to change baudrate: {e}")
@@ -0,0 +1,476 @@
+"""
+Micro-benchmarks for the protocol layer.
+
+Run from the command line::
+
+    python -m leisai.tools.benchmark --frames 10000 --repeat 5
+    python -m leisai.tools.benchmark --suite modbus --pattern block --concurrency 4 --json out.json
+
+The Modbus suite runs against the in-process simulator unless ``--port``
+names a real (or pty) serial port.
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Any, Tuple
+
+from ..core.constants import PARAMETER_ADDRESS
+from ..protocols import modbus
+from ..protocols.modbus import ModbusClient, TransactionTiming
+from ..protocols.serial import SerialConnection
+
+
+def random_frames(
+    count: int,
+    min_length: int = 6,
+    max_length: int = 64,
+    seed: Optional[int] = None
+) -> List[bytes]:
+    """
+    Generate random Modbus-sized frames.
+    
+    Parameters
+    ----------
+    count : int
+        Number of frames
+    min_length : int
+        Minimum frame length in bytes
+    max_length : int
+        Maximum frame length in bytes
+    seed : Optional[int]
+        Random seed for reproducible runs
+        
+    Returns
+    -------
+    List[bytes]
+        Random frames
+    """
+    rng = random.Random(seed)
+    return [
+        bytes(rng.getrandbits(8) for _ in range(rng.randint(min_length, max_length)))
+        for _ in range(count)
+    ]
+
+
+def check_crc16_equivalence(frames: List[bytes]) -> int:
+    """
+    Check every CRC16 implementation against the bitwise reference.
+    
+    Parameters
+    ----------
+    frames : List[bytes]
+        Frames to check
+        
+    Returns
+    -------
+    int
+        Number of frames checked
+        
+    Raises
+    ------
+    AssertionError
+        If any implementation disagrees with the reference
+    """
+    for frame in frames:
+        expected = modbus._crc16_bitwise(frame)
+        for name, func in _crc16_implementations().items():
+            actual = func(frame)
+            if actual != expected:
+                raise AssertionError(
+                    f"{name} CRC mismatch for {frame.hex()}: "
+                    f"{actual:04X} != {expected:04X}"
+                )
+    return len(frames)
+
+
+def benchmark_crc16(
+    frame_count: int = 10000,
+    repeat: int = 5,
+    seed: Optional[int] = 0
+) -> Dict[str, float]:
+    """
+    Time each CRC16 implementation over the same random frames.
+    
+    Parameters
+    ----------
+    frame_count : int
+        Number of frames per run
+    repeat : int
+        Number of runs; the best run is reported
+    seed : Optional[int]
+        Random seed for the frame set
+        
+    Returns
+    -------
+    Dict[str, float]
+        Best time per frame in microseconds, keyed by implementation
+    """
+    frames = random_frames(frame_count, seed=seed)
+    check_crc16_equivalence(frames)
+    
+    results = {}
+    for name, func in _crc16_implementations().items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for frame in frames:
+                func(frame)
+            best = min(best, time.perf_counter() - start)
+        results[name] = best / frame_count * 1e6
+    return results
+
+
+def _crc16_implementations() -> Dict[str, Callable[[bytes], int]]:
+    """Return the CRC16 implementations available in this environment."""
+    implementations = {
+        'bitwise': modbus._crc16_bitwise,
+        'table': modbus._crc16_table,
+    }
+    if modbus._crc16_native is not None:
+        implementations['crcmod'] = modbus._crc16_native
+    return implementations
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in the style of HdrHistogram.
+    
+    Values are recorded in microseconds into buckets whose width grows
+    with magnitude, so every recorded value keeps ``significant_digits``
+    decimal digits of precision at constant memory.
+    
+    Parameters
+    ----------
+    significant_digits : int
+        Decimal digits of precision (default: 2, i.e. within 1%)
+    """
+    
+    def __init__(self, significant_digits: int = 2):
+        """Initialize empty histogram."""
+        self.significant_digits = significant_digits
+        self._sub_buckets = 2 ** math.ceil(math.log2(2 * 10 ** significant_digits))
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+    
+    def _index(self, value: int) -> int:
+        """Bucket index of a value in microseconds."""
+        if value < self._sub_buckets:
+            return value
+        half = self._sub_buckets // 2
+        exponent = value.bit_length() - self._sub_buckets.bit_length() + 1
+        return self._sub_buckets + (exponent - 1) * half + (value >> exponent) - half
+    
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """Lowest and highest value in microseconds of a bucket."""
+        if index < self._sub_buckets:
+            return index, index
+        half = self._sub_buckets // 2
+        exponent, sub = divmod(index - self._sub_buckets, half)
+        exponent += 1
+        lowest = (sub + half) << exponent
+        return lowest, lowest + (1 << exponent) - 1
+    
+    def record(self, seconds: float):
+        """Record one latency in seconds."""
+        value = max(0, int(round(seconds * 1e6)))
+        index = self._index(value)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    def merge(self, other: 'LatencyHistogram'):
+        """Add the counts of another histogram with the same precision."""
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+    
+    @property
+    def mean(self) -> float:
+        """Mean latency in seconds."""
+        return self.total / self.count / 1e6 if self.count else 0.0
+    
+    def percentile(self, percent: float) -> float:
+        """
+        Get a latency percentile.
+        
+        Parameters
+        ----------
+        percent : float
+            Percentile (0-100)
+            
+        Returns
+        -------
+        float
+            Latency in seconds (upper edge of the bucket, capped at max)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100.0 * self.count))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(self._bounds(index)[1], self.max) / 1e6
+        return self.max / 1e6
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary and non-empty buckets (microseconds) for JSON output."""
+        return {
+            'count': self.count,
+            'min_us': self.min or 0,
+            'mean_us': self.mean * 1e6,
+            'max_us': self.max or 0,
+            'percentiles_us': {
+                str(p): self.percentile(p) * 1e6 for p in (50, 90, 99, 99.9)
+            },
+            'buckets': [
+                [*self._bounds(index), self._counts[index]]
+                for index in sorted(self._counts)
+            ],
+        }
+
+
+@dataclass
+class TransactionBenchmark:
+    """
+    Result of a Modbus transaction benchmark.
+    
+    Times are in seconds; the breakdown histograms are per transaction.
+    """
+    pattern: str
+    concurrency: int
+    duration: float
+    transactions: int = 0
+    failures: int = 0
+    retries: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    wire: LatencyHistogram = field(default_factory=LatencyHistogram)
+    lock_wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+    cpu: LatencyHistogram = field(default_factory=LatencyHistogram)
+    
+    @property
+    def throughput(self) -> float:
+        """Completed transactions per second."""
+        return self.transactions / self.duration if self.duration else 0.0
+    
+    @property
+    def retry_rate(self) -> float:
+        """Retried attempts per completed transaction."""
+        return self.retries / self.transactions if self.transactions else 0.0
+    
+    def add(self, timing: TransactionTiming):
+        """Record the timing of one completed transaction."""
+        self.transactions += 1
+        self.retries += timing.attempts - 1
+        self.latency.record(timing.total_time)
+        self.wire.record(timing.wire_time)
+        self.lock_wait.record(timing.lock_wait)
+        self.cpu.record(timing.cpu_time)
+    
+    def merge(self, other: 'TransactionBenchmark'):
+        """Add the results of another worker."""
+        self.transactions += other.transactions
+        self.failures += other.failures
+        self.retries += other.retries
+        for name in ('latency', 'wire', 'lock_wait', 'cpu'):
+            getattr(self, name).merge(getattr(other, name))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Result as a JSON-serialisable dictionary."""
+        return {
+            'pattern': self.pattern,
+            'concurrency': self.concurrency,
+            'duration_s': self.duration,
+            'transactions': self.transactions,
+            'failures': self.failures,
+            'retries': self.retries,
+            'throughput_tps': self.throughput,
+            'retry_rate': self.retry_rate,
+            'latency': self.latency.to_dict(),
+            'wire': self.wire.to_dict(),
+            'lock_wait': self.lock_wait.to_dict(),
+            'cpu': self.cpu.to_dict(),
+        }
+
+
+# Request patterns: one ModbusClient call per transaction
+TRANSACTION_PATTERNS: Dict[str, Callable[[ModbusClient], Any]] = {
+    'read': lambda client: client.read_register(PARAMETER_ADDRESS['servo_status']),
+    'write': lambda client: client.write_register(PARAMETER_ADDRESS['pr_jog_speed'], 100),
+    'read_32bit': lambda client: client.read_32bit(PARAMETER_ADDRESS['encoder_position']),
+    'block': lambda client: client.read_registers(0x0B14, 12),
+}
+
+
+def benchmark_transactions(
+    connection: SerialConnection,
+    pattern: str = 'read',
+    count: int = 1000,
+    concurrency: int = 1,
+    slave_ids: Optional[List[int]] = None
+) -> TransactionBenchmark:
+    """
+    Run ``count`` transactions per worker thread and collect timings.
+    
+    All workers share ``connection``; each has its own ModbusClient
+    (worker ``i`` talks to ``slave_ids[i % len(slave_ids)]``), so the
+    lock wait shows the cost of contention on the serial line.
+    
+    Parameters
+    ----------
+    connection : SerialConnection
+        Open connection to the slave(s), e.g. a SimulatorConnection
+    pattern : str
+        Request pattern from TRANSACTION_PATTERNS
+    count : int
+        Transactions per worker
+    concurrency : int
+        Number of worker threads
+    slave_ids : Optional[List[int]]
+        Slave IDs to spread workers over (default: [1])
+        
+    Returns
+    -------
+    TransactionBenchmark
+        Merged results of all workers
+    """
+    request = TRANSACTION_PATTERNS[pattern]
+    slave_ids = slave_ids or [1]
+    workers = [
+        TransactionBenchmark(pattern, concurrency, 0.0) for _ in range(concurrency)
+    ]
+    barrier = threading.Barrier(concurrency + 1)
+    
+    def worker(result: TransactionBenchmark, slave_id: int):
+        client = ModbusClient(connection, slave_id)
+        client.modbus.timing_callback = result.add
+        barrier.wait()
+        for _ in range(count):
+            response = request(client)
+            if response is None or response is False:
+                result.failures += 1
+                
+    threads = [
+        threading.Thread(target=worker, args=(result, slave_ids[i % len(slave_ids)]), daemon=True)
+        for i, result in enumerate(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+        
+    total = TransactionBenchmark(pattern, concurrency, time.perf_counter() - start)
+    for result in workers:
+        total.merge(result)
+    return total
+
+
+def _run_modbus_suite(args) -> Dict[str, Any]:
+    """Run the Modbus transaction benchmark from parsed arguments."""
+    from .simulator import L7Simulator, SimulatorConfig, SimulatorConnection
+    
+    slave_ids = list(range(1, args.slaves + 1))
+    if args.port:
+        connection = SerialConnection(args.port, args.baudrate)
+    else:
+        config = SimulatorConfig(
+            response_delay=args.delay, drop_rate=args.drop, seed=args.seed
+        )
+        connection = SimulatorConnection(
+            [L7Simulator(slave_id, config) for slave_id in slave_ids], args.baudrate
+        )
+        
+    patterns = list(TRANSACTION_PATTERNS) if args.pattern == 'all' else [args.pattern]
+    results = []
+    with connection:
+        for pattern in patterns:
+            result = benchmark_transactions(
+                connection, pattern, args.count, args.concurrency, slave_ids
+            )
+            results.append(result)
+            
+            print(f"{pattern:<10} {result.throughput:8.1f} tps  "
+                  f"p50 {result.latency.percentile(50) * 1e3:6.2f} ms  "
+                  f"p99 {result.latency.percentile(99) * 1e3:6.2f} ms  "
+                  f"retries {result.retry_rate:.3f}/tx  failures {result.failures}")
+            print(f"{'':<10} mean wire {result.wire.mean * 1e3:.2f} ms  "
+                  f"lock {result.lock_wait.mean * 1e3:.2f} ms  "
+                  f"cpu {result.cpu.mean * 1e3:.3f} ms")
+                  
+    return {
+        'suite': 'modbus',
+        'port': args.port or 'simulator',
+        'baudrate': args.baudrate,
+        'python': platform.python_version(),
+        'crc_backend': modbus.CRC16_BACKEND,
+        'results': [result.to_dict() for result in results],
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Leisai protocol micro-benchmarks')
+    parser.add_argument('--suite', choices=('crc', 'modbus'), default='crc',
+                        help='benchmark to run (default: crc)')
+    parser.add_argument('--frames', type=int, default=10000,
+                        help='number of random frames (default: 10000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of runs, best is reported (default: 5)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='random seed (default: 0)')
+    parser.add_argument('--pattern', choices=tuple(TRANSACTION_PATTERNS) + ('all',),
+                        default='all', help='modbus request pattern (default: all)')
+    parser.add_argument('--count', type=int, default=1000,
+                        help='modbus transactions per worker (default: 1000)')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='modbus worker threads (default: 1)')
+    parser.add_argument('--slaves', type=int, default=1,
+                        help='slaves to spread workers over (default: 1)')
+    parser.add_argument('--port', default=None,
+                        help='serial port to benchmark instead of the simulator')
+    parser.add_argument('--baudrate', type=int, default=38400,
+                        help='baud rate (default: 38400)')
+    parser.add_argument('--delay', type=float, default=0.001,
+                        help='simulated slave turnaround in seconds (default: 0.001)')
+    parser.add_argument('--drop', type=float, default=0.0,
+                        help='simulated dropped response rate (default: 0)')
+    parser.add_argument('--json', default=None,
+                        help='write results to this JSON file')
+    args = parser.parse_args(argv)
+    
+    if args.suite == 'modbus':
+        output = _run_modbus_suite(args)
+    else:
+        results = benchmark_crc16(args.frames, args.repeat, args.seed)
+        baseline = results['bitwise']
+        
+        print(f"CRC16 over {args.frames} frames (active backend: {modbus.CRC16_BACKEND})")
+        for name, per_frame in results.items():
+            print(f"  {name:<8} {per_frame:8.2f} us/frame  {baseline / per_frame:6.1f}x")
+        output = {'suite': 'crc', 'backend': modbus.CRC16_BACKEND, 'us_per_frame': results}
+        
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(output, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
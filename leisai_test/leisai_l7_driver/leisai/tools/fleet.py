@@ -0,0 +1,317 @@
+"""
+Parameter rollout to many drives in parallel.
+
+Drives are grouped by serial port: every port gets one worker thread and
+one shared :class:`ModbusBus`, and the slaves on a port are handled one
+after another. Rollout time therefore grows with the number of buses,
+not the number of drives. Results stream back as each drive finishes.
+
+Run from the command line::
+
+    python -m leisai.tools.fleet params.json COM3:1 COM3:2 COM4:1 --json report.json
+"""
+
+import argparse
+import json
+import logging
+import queue
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Union, Iterable, Iterator, Callable
+
+from ..core.constants import DEFAULT_BAUDRATE, DEFAULT_TIMEOUT
+from ..core.exceptions import ConnectionError
+from ..core.sync import SyncReport
+from ..protocols.bus import ModbusBus
+from ..protocols.serial import SerialConnection
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FleetTarget:
+    """One drive: serial port and slave ID."""
+    port: str
+    slave_id: int = 1
+    
+    @classmethod
+    def parse(cls, text: str) -> 'FleetTarget':
+        """Parse ``PORT[:SLAVE]`` (e.g. ``COM3:2`` or ``/dev/ttyUSB0``)."""
+        port, sep, slave = text.rpartition(':')
+        if sep and port and slave.isdigit():
+            return cls(port, int(slave))
+        return cls(text)
+    
+    def __str__(self) -> str:
+        return f"{self.port}:{self.slave_id}"
+
+
+@dataclass
+class DriveResult:
+    """
+    Rollout result of one drive.
+    
+    Attributes
+    ----------
+    target : FleetTarget
+        Drive
+    ok : bool
+        True if the drive holds the target parameters afterwards
+    report : Optional[SyncReport]
+        Sync report (None if the drive was not reached)
+    error : Optional[str]
+        Reason of a failure
+    elapsed : float
+        Seconds spent on this drive
+    """
+    target: FleetTarget
+    ok: bool
+    report: Optional[SyncReport] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Result as a JSON-serialisable dictionary."""
+        return {
+            'port': self.target.port,
+            'slave_id': self.target.slave_id,
+            'ok': self.ok,
+            'error': self.error,
+            'elapsed_s': self.elapsed,
+            'report': self.report.to_dict() if self.report else None,
+        }
+
+
+@dataclass
+class FleetReport:
+    """Aggregated rollout results."""
+    results: List[DriveResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    
+    @property
+    def passed(self) -> List[DriveResult]:
+        """Drives that hold the target parameters."""
+        return [result for result in self.results if result.ok]
+    
+    @property
+    def failed(self) -> List[DriveResult]:
+        """Drives that were not reached or could not be brought in sync."""
+        return [result for result in self.results if not result.ok]
+    
+    @property
+    def ok(self) -> bool:
+        """True if every drive passed."""
+        return not self.failed
+    
+    def summary(self) -> str:
+        """One-line summary."""
+        ports = len({result.target.port for result in self.results})
+        return (f"{len(self.passed)}/{len(self.results)} drives passed on {ports} ports "
+                f"in {self.elapsed:.1f} s")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Report as a JSON-serialisable dictionary."""
+        return {
+            'ok': self.ok,
+            'passed': len(self.passed),
+            'failed': len(self.failed),
+            'elapsed_s': self.elapsed,
+            'drives': [result.to_dict() for result in self.results],
+        }
+
+
+ConnectionFactory = Callable[[str], SerialConnection]
+
+
+class FleetRollout:
+    """
+    Push one parameter set to many drives.
+    
+    Parameters
+    ----------
+    parameters : Union[str, Dict[str, Any]]
+        Parameter file or name-value pairs
+    dry_run : bool
+        Only compare, write nothing
+    verify : bool
+        Compare again after writing; a drive passes only if nothing differs
+    baudrate : int
+        Serial baudrate (default: 38400)
+    timeout : float
+        Communication timeout in seconds (default: 1.0)
+    connection_factory : Optional[Callable[[str], SerialConnection]]
+        Creates the connection of a port (default: SerialConnection)
+        
+    Examples
+    --------
+    >>> rollout = FleetRollout('params.json')
+    >>> for result in rollout.run_iter([FleetTarget('COM3', 1), FleetTarget('COM4', 1)]):
+    ...     print(result.target, result.ok)
+    """
+    
+    def __init__(
+        self,
+        parameters: Union[str, Dict[str, Any]],
+        dry_run: bool = False,
+        verify: bool = True,
+        baudrate: int = DEFAULT_BAUDRATE,
+        timeout: float = DEFAULT_TIMEOUT,
+        connection_factory: Optional[ConnectionFactory] = None
+    ):
+        """Initialize fleet rollout."""
+        if isinstance(parameters, str):
+            with open(parameters, 'r') as f:
+                parameters = json.load(f)
+        self.parameters: Dict[str, Any] = parameters
+        self.dry_run = dry_run
+        self.verify = verify
+        self.connection_factory = connection_factory or (
+            lambda port: SerialConnection(port, baudrate, timeout)
+        )
+    
+    def run_iter(self, targets: Iterable[FleetTarget]) -> Iterator[DriveResult]:
+        """
+        Roll out to all targets, yielding each result as it finishes.
+        
+        Parameters
+        ----------
+        targets : Iterable[FleetTarget]
+            Drives to update
+            
+        Yields
+        ------
+        DriveResult
+            Result of one drive, in completion order
+        """
+        ports: 'OrderedDict[str, List[int]]' = OrderedDict()
+        for target in targets:
+            slaves = ports.setdefault(target.port, [])
+            if target.slave_id not in slaves:
+                slaves.append(target.slave_id)
+        total = sum(len(slaves) for slaves in ports.values())
+        if not total:
+            return
+            
+        results: 'queue.Queue[DriveResult]' = queue.Queue()
+        with ThreadPoolExecutor(max_workers=len(ports), thread_name_prefix='fleet') as pool:
+            for port, slaves in ports.items():
+                pool.submit(self._run_port, port, slaves, results.put)
+            for _ in range(total):
+                yield results.get()
+    
+    def run(
+        self,
+        targets: Iterable[FleetTarget],
+        on_result: Optional[Callable[[DriveResult], None]] = None
+    ) -> FleetReport:
+        """
+        Roll out to all targets and aggregate the results.
+        
+        Parameters
+        ----------
+        targets : Iterable[FleetTarget]
+            Drives to update
+        on_result : Optional[Callable[[DriveResult], None]]
+            Called as each drive finishes
+            
+        Returns
+        -------
+        FleetReport
+            Pass/fail report of all drives
+        """
+        report = FleetReport()
+        start = time.perf_counter()
+        for result in self.run_iter(targets):
+            report.results.append(result)
+            if on_result:
+                on_result(result)
+        report.elapsed = time.perf_counter() - start
+        return report
+    
+    def _run_port(self, port: str, slaves: List[int], emit: Callable[[DriveResult], None]):
+        """Handle all slaves of one port in order over a shared bus."""
+        try:
+            bus = ModbusBus(self.connection_factory(port))
+            if not bus.connect():
+                raise ConnectionError(f"Cannot open {port}")
+        except Exception as e:
+            for slave_id in slaves:
+                emit(DriveResult(FleetTarget(port, slave_id), False, error=str(e)))
+            return
+            
+        try:
+            for slave_id in slaves:
+                emit(self._run_drive(bus, FleetTarget(port, slave_id)))
+        finally:
+            bus.disconnect()
+    
+    def _run_drive(self, bus: ModbusBus, target: FleetTarget) -> DriveResult:
+        """Sync one drive."""
+        start = time.perf_counter()
+        driver = None
+        try:
+            driver = bus.create_driver(target.slave_id)
+            if not driver.connect():
+                return DriveResult(target, False, error="No response",
+                                   elapsed=time.perf_counter() - start)
+                                   
+            report = driver.sync_parameters(self.parameters, dry_run=self.dry_run)
+            ok = report.in_sync and not report.missing
+            error = None
+            if report.failed:
+                error = f"{len(report.failed)} writes failed"
+            elif report.dry_run and report.changed:
+                error = f"{len(report.changed)} parameters differ"
+                
+            if ok and self.verify and not self.dry_run and report.changed:
+                check = driver.compare_parameters(self.parameters)
+                if check.changed or check.missing:
+                    ok = False
+                    error = f"Verification failed: {', '.join(check.changed or check.missing)}"
+                    
+            return DriveResult(target, ok, report, error, time.perf_counter() - start)
+            
+        except Exception as e:
+            logger.error(f"Rollout to {target} failed: {e}")
+            return DriveResult(target, False, error=str(e), elapsed=time.perf_counter() - start)
+        finally:
+            if driver is not None:
+                driver.disconnect()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Push a parameter file to many L7 drives')
+    parser.add_argument('parameters', help='parameter JSON file')
+    parser.add_argument('targets', nargs='+', help='drives as PORT[:SLAVE], e.g. COM3:2')
+    parser.add_argument('--baudrate', type=int, default=DEFAULT_BAUDRATE)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument('--dry-run', action='store_true', help='only compare, write nothing')
+    parser.add_argument('--no-verify', action='store_true', help='skip the compare after writing')
+    parser.add_argument('--json', default=None, help='write the report to this JSON file')
+    args = parser.parse_args(argv)
+    
+    rollout = FleetRollout(
+        args.parameters, args.dry_run, not args.no_verify, args.baudrate, args.timeout
+    )
+    
+    def show(result: DriveResult):
+        status = 'PASS' if result.ok else 'FAIL'
+        detail = result.report.summary() if result.report else ''
+        if result.error:
+            detail = f"{detail} ({result.error})" if detail else result.error
+        print(f"[{status}] {result.target} {result.elapsed:.1f} s  {detail}", flush=True)
+        
+    report = rollout.run([FleetTarget.parse(text) for text in args.targets], show)
+    print(report.summary())
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report.to_dict(), f, indent=2)
+    return 0 if report.ok else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
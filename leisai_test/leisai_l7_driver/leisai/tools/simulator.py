@@ -0,0 +1,858 @@
+"""
+Virtual L7 servo for tests and benchmarks without hardware.
+
+The simulator answers Modbus RTU function codes 0x03/0x06/0x10 over the
+real PARAMETER_ADDRESS map and models PR paths (0x6002 trigger and the
+0x6200 path table), JOG, homing, the alarm registers and the mapping
+parameters. Response delay, baud-rate timing, CRC errors and dropped
+frames can be injected.
+
+In process, through the normal SerialConnection code path::
+
+    >>> sim = L7Simulator(slave_id=1)
+    >>> driver = L7Driver('sim', connection=SimulatorConnection(sim))
+    >>> driver.connect()
+
+Or on a pseudo terminal, for any program that opens a serial port::
+
+    python -m leisai.tools.simulator --slaves 1 2 --delay 0.002
+"""
+
+import argparse
+import logging
+import os
+import random
+import select
+import struct
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, asdict
+from typing import Optional, List, Dict, Tuple, Union, Iterable
+
+from ..core.constants import (
+    PARAMETER_ADDRESS, PARAMETER_32BIT, PR_PATH_BASE, PR_PATH_SIZE, PR_PATH_COUNT,
+    PR_CONTROL_ADDRESS, PR_MODE_ABSOLUTE,
+    MAPPING_VALUE_BASE, MAPPING_POINTER_BASE, MAPPING_SLOTS,
+    MAX_READ_REGISTERS, DEFAULT_BAUDRATE, DEFAULT_TIMEOUT
+)
+from ..protocols.modbus import ModbusRTU, calculate_crc16
+from ..protocols.serial import SerialConnection
+
+logger = logging.getLogger(__name__)
+
+# Modbus exception codes
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+ILLEGAL_DATA_VALUE = 0x03
+
+# Status registers (PAB.xx): 16-bit PAB.00-18, 32-bit PAB.20-25 (0x0B14-0x0B1F)
+STATUS_REGISTERS = list(range(0x0B00, 0x0B13)) + list(range(0x0B14, 0x0B22))
+CURRENT_ALARM_ADDRESS = 0x0B03
+
+# 0x6002 readback (PA8.02)
+PR_STATE_RUNNING = 0x0100
+PR_STATE_SETTLING = 0x0200
+
+
+@dataclass
+class SimulatorConfig:
+    """
+    Fault injection and timing settings of a simulated slave.
+    
+    Attributes
+    ----------
+    response_delay : float
+        Slave turnaround time before the response starts (s)
+    drop_rate : float
+        Probability that a request gets no response
+    crc_error_rate : float
+        Probability that a response has a corrupted CRC
+    settle_time : float
+        Time between end of a PR profile and "positioning complete" (s)
+    jog_timeout : float
+        JOG stops when no keepalive arrives within this time (s)
+    seed : Optional[int]
+        Random seed for reproducible fault injection
+    """
+    response_delay: float = 0.001
+    drop_rate: float = 0.0
+    crc_error_rate: float = 0.0
+    settle_time: float = 0.01
+    jog_timeout: float = 0.2
+    seed: Optional[int] = None
+
+
+@dataclass
+class SimulatorStats:
+    """Request counters of a simulated slave."""
+    requests: int = 0
+    responses: int = 0
+    exceptions: int = 0
+    dropped: int = 0
+    corrupted: int = 0
+    bad_requests: int = 0
+
+
+def _crc_frame(payload: bytes) -> bytes:
+    """Append the Modbus CRC to a frame."""
+    return payload + struct.pack('<H', calculate_crc16(payload))
+
+
+def _to_signed32(high: int, low: int) -> int:
+    value = (high << 16) | low
+    return value - 0x100000000 if value & 0x80000000 else value
+
+
+def split_requests(buffer: bytearray) -> List[bytes]:
+    """
+    Cut complete request frames from the front of a byte stream.
+    
+    Complete frames are removed from ``buffer``; an incomplete tail is
+    left in place. Bytes that do not start a frame with a valid CRC are
+    skipped one at a time to resynchronise.
+    
+    Parameters
+    ----------
+    buffer : bytearray
+        Received bytes
+        
+    Returns
+    -------
+    List[bytes]
+        Complete frames (CRC checked)
+    """
+    frames = []
+    while len(buffer) >= 8:
+        function_code = buffer[1]
+        if function_code == ModbusRTU.WRITE_MULTIPLE_REGISTERS:
+            length = 9 + buffer[6]
+        else:
+            length = 8
+        if len(buffer) < length:
+            break
+            
+        frame = bytes(buffer[:length])
+        if calculate_crc16(frame[:-2]) == struct.unpack('<H', frame[-2:])[0]:
+            frames.append(frame)
+            del buffer[:length]
+        else:
+            del buffer[0]
+    return frames
+
+
+class L7Simulator:
+    """
+    Register-level model of one L7 drive.
+    
+    Parameters
+    ----------
+    slave_id : int
+        Modbus slave ID
+    config : Optional[SimulatorConfig]
+        Timing and fault injection settings
+        
+    Attributes
+    ----------
+    registers : Dict[int, int]
+        Register values; addresses not in the map answer with
+        "illegal data address"
+    stats : SimulatorStats
+        Request counters
+    """
+    
+    COUNTS_PER_REV = 10000
+    
+    def __init__(self, slave_id: int = 1, config: Optional[SimulatorConfig] = None):
+        """Initialize simulated drive."""
+        self.slave_id = slave_id
+        self.config = config or SimulatorConfig()
+        self.stats = SimulatorStats()
+        self.registers: Dict[int, int] = {}
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.RLock()
+        
+        # Motion state (command units, counts/s)
+        self._position = 0.0
+        self._velocity = 0.0
+        self._target = 0.0
+        self._motion: Optional[str] = None
+        self._pr_path = 0
+        self._settle_until = 0.0
+        self._jog_deadline = 0.0
+        self._homed = False
+        self._last_update = time.perf_counter()
+        
+        self._init_registers()
+        self._refresh_status()
+    
+    # ==================== Register Map ====================
+    
+    def _init_registers(self):
+        """Create the register map with factory defaults."""
+        regs = self.registers
+        for name, address in PARAMETER_ADDRESS.items():
+            regs[address] = 0
+            if name in PARAMETER_32BIT:
+                regs[address + 1] = 0
+        for address in STATUS_REGISTERS:
+            regs[address] = 0
+        for address in range(MAPPING_VALUE_BASE, MAPPING_POINTER_BASE + 2 * MAPPING_SLOTS):
+            regs[address] = 0
+        for slot in range(MAPPING_SLOTS):
+            # Factory default pointer 0x00490049
+            regs[MAPPING_POINTER_BASE + 2 * slot] = 0x0049
+            regs[MAPPING_POINTER_BASE + 2 * slot + 1] = 0x0049
+        for address in range(0x6000, 0x6030):
+            regs[address] = 0
+        for path in range(PR_PATH_COUNT):
+            base = PR_PATH_BASE + path * PR_PATH_SIZE
+            regs.update({base + i: 0 for i in range(PR_PATH_SIZE)})
+            regs[base + 3] = 60    # Speed (rpm)
+            regs[base + 4] = 100   # Acceleration (ms/1000rpm)
+            regs[base + 5] = 100   # Deceleration (ms/1000rpm)
+            
+        regs[0x0B00] = 0x0100                            # Software version
+        regs[PARAMETER_ADDRESS['dc_bus_voltage']] = 3100     # 310.0 V
+        regs[PARAMETER_ADDRESS['driver_temperature']] = 350  # 35.0 °C
+        regs[PARAMETER_ADDRESS['pr_jog_speed']] = 100
+        regs[PARAMETER_ADDRESS['pr_home_speed_high']] = 100
+        regs[PARAMETER_ADDRESS['pr_home_speed_low']] = 10
+    
+    def is_valid(self, address: int) -> bool:
+        """Check if a register exists on the simulated drive."""
+        return address in self.registers
+    
+    @staticmethod
+    def is_read_only(address: int) -> bool:
+        """Check if a register is read-only (status class PAB)."""
+        return 0x0B00 <= address <= 0x0BFF
+    
+    def get_parameter(self, name: str) -> int:
+        """Get a parameter value by name (32-bit values signed)."""
+        with self._lock:
+            self._update()
+            address = PARAMETER_ADDRESS[name]
+            if name in PARAMETER_32BIT:
+                return _to_signed32(self.registers[address], self.registers[address + 1])
+            return self.registers[address]
+    
+    def set_parameter(self, name: str, value: int):
+        """Set a parameter value by name, bypassing write protection."""
+        with self._lock:
+            address = PARAMETER_ADDRESS[name]
+            if name in PARAMETER_32BIT:
+                self.registers[address] = (value >> 16) & 0xFFFF
+                self.registers[address + 1] = value & 0xFFFF
+            else:
+                self.registers[address] = value & 0xFFFF
+    
+    def set_pr_path(self, path_id: int, position: int, speed: int = 60,
+                    acceleration: int = 100, deceleration: int = 100,
+                    dwell: int = 0, mode: int = PR_MODE_ABSOLUTE):
+        """Program a path in the PR table directly."""
+        base = PR_PATH_BASE + path_id * PR_PATH_SIZE
+        with self._lock:
+            self.registers.update({
+                base: mode,
+                base + 1: (position >> 16) & 0xFFFF,
+                base + 2: position & 0xFFFF,
+                base + 3: speed,
+                base + 4: acceleration,
+                base + 5: deceleration,
+                base + 6: dwell,
+            })
+    
+    # ==================== Alarms ====================
+    
+    @property
+    def alarm(self) -> int:
+        """Active alarm code (0 if none)."""
+        return self.registers[CURRENT_ALARM_ADDRESS]
+    
+    def raise_alarm(self, code: int):
+        """Raise an alarm: motion stops and triggers are ignored until reset."""
+        with self._lock:
+            self._update()
+            self.registers[CURRENT_ALARM_ADDRESS] = code
+            self._stop()
+            self._refresh_status()
+    
+    def clear_alarm(self):
+        """Clear the active alarm (same as writing 0x1111 to PA0.25)."""
+        with self._lock:
+            self.registers[CURRENT_ALARM_ADDRESS] = 0
+            self._refresh_status()
+    
+    # ==================== Modbus ====================
+    
+    def process(self, request: bytes) -> Optional[bytes]:
+        """
+        Handle one request frame.
+        
+        Parameters
+        ----------
+        request : bytes
+            Request frame including CRC
+            
+        Returns
+        -------
+        Optional[bytes]
+            Response frame, None if the request is ignored (other slave,
+            broadcast, bad CRC or an injected drop)
+        """
+        if len(request) < 4 or request[0] not in (0, self.slave_id):
+            return None
+            
+        with self._lock:
+            self.stats.requests += 1
+            if calculate_crc16(request[:-2]) != struct.unpack('<H', request[-2:])[0]:
+                self.stats.bad_requests += 1
+                return None
+                
+            if self.config.drop_rate and self._rng.random() < self.config.drop_rate:
+                self.stats.dropped += 1
+                return None
+                
+            self._update()
+            payload = self._handle(request[1], request[2:-2])
+            self._refresh_status()
+            
+            if request[0] == 0:
+                # Broadcast: executed, never answered
+                return None
+                
+            if payload[0] & 0x80:
+                self.stats.exceptions += 1
+            self.stats.responses += 1
+            response = _crc_frame(bytes([self.slave_id]) + payload)
+            
+            if self.config.crc_error_rate and self._rng.random() < self.config.crc_error_rate:
+                self.stats.corrupted += 1
+                response = response[:-1] + bytes([response[-1] ^ 0xFF])
+            return response
+    
+    def _handle(self, function_code: int, data: bytes) -> bytes:
+        """Execute a request and build the response PDU."""
+        def exception(code):
+            return bytes([function_code | 0x80, code])
+            
+        if function_code == ModbusRTU.READ_HOLDING_REGISTERS:
+            if len(data) != 4:
+                return exception(ILLEGAL_DATA_VALUE)
+            address, count = struct.unpack('>HH', data)
+            if not 1 <= count <= MAX_READ_REGISTERS:
+                return exception(ILLEGAL_DATA_VALUE)
+            if not all(self.is_valid(a) for a in range(address, address + count)):
+                return exception(ILLEGAL_DATA_ADDRESS)
+            values = [self._read(a) for a in range(address, address + count)]
+            return struct.pack('>BB%dH' % count, function_code, 2 * count, *values)
+            
+        if function_code == ModbusRTU.WRITE_SINGLE_REGISTER:
+            if len(data) != 4:
+                return exception(ILLEGAL_DATA_VALUE)
+            address, value = struct.unpack('>HH', data)
+            if not self.is_valid(address) or self.is_read_only(address):
+                return exception(ILLEGAL_DATA_ADDRESS)
+            self._write(address, value)
+            return bytes([function_code]) + data
+            
+        if function_code == ModbusRTU.WRITE_MULTIPLE_REGISTERS:
+            if len(data) < 5:
+                return exception(ILLEGAL_DATA_VALUE)
+            address, count, byte_count = struct.unpack('>HHB', data[:5])
+            if byte_count != 2 * count or len(data) != 5 + byte_count or count < 1:
+                return exception(ILLEGAL_DATA_VALUE)
+            addresses = range(address, address + count)
+            if not all(self.is_valid(a) and not self.is_read_only(a) for a in addresses):
+                return exception(ILLEGAL_DATA_ADDRESS)
+            values = struct.unpack('>%dH' % count, data[5:])
+            for a, value in zip(addresses, values):
+                self._write(a, value)
+            return bytes([function_code]) + data[:4]
+            
+        return exception(ILLEGAL_FUNCTION)
+    
+    def _read(self, address: int) -> int:
+        """Read a register, resolving mapping parameters."""
+        if MAPPING_VALUE_BASE <= address < MAPPING_VALUE_BASE + 2 * MAPPING_SLOTS:
+            return self._read_mapped(address)
+        return self.registers[address]
+    
+    def _write(self, address: int, value: int):
+        """Write a register and apply its side effects."""
+        self.registers[address] = value
+        
+        if address == PR_CONTROL_ADDRESS:
+            self._control_command(value)
+        elif address == PR_PATH_BASE + 7 and value == 0x0010:
+            # PR0 special parameter maps to PA8.02: immediate PR0 trigger
+            self._control_command(0x0010)
+        elif address == PARAMETER_ADDRESS['aux_function']:
+            self._aux_command(value)
+        elif address == PARAMETER_ADDRESS['pr_control']:
+            if value & 0x0001:
+                self._control_command(0x0020)
+            elif value & 0x0004:
+                self._control_command(0x0010 | ((value >> 4) & 0x0F))
+    
+    # ==================== Mapping Parameters ====================
+    
+    @staticmethod
+    def _pointer_target(pointer: int) -> Optional[Tuple[int, int]]:
+        """Resolve a mapping pointer to (address, width) for class PAB."""
+        if (pointer >> 8) & 0x0F != 0x0B:
+            return None
+        number = ((pointer >> 4) & 0x0F) * 10 + (pointer & 0x0F)
+        if number < 20:
+            return 0x0B00 + number, 1
+        if number <= 25:
+            return 0x0B14 + 2 * (number - 20), 2
+        return None
+    
+    def _read_mapped(self, address: int) -> int:
+        """Value of a mapping parameter register (PA0.40-47)."""
+        offset = address - MAPPING_VALUE_BASE
+        slot, word = divmod(offset, 2)
+        high = self.registers[MAPPING_POINTER_BASE + 2 * slot]
+        low = self.registers[MAPPING_POINTER_BASE + 2 * slot + 1]
+        
+        if high == low:
+            target = self._pointer_target(high)
+            if target is None:
+                return 0
+            source, width = target
+            if width == 2:
+                return self.registers[source + word]
+            return self.registers.get(source, 0) if word else 0
+            
+        target = self._pointer_target(low if word else high)
+        if target is None:
+            return 0
+        source, width = target
+        # 16-bit view of a 32-bit parameter is its low word
+        return self.registers.get(source + width - 1, 0)
+    
+    # ==================== Motion Model ====================
+    
+    def _control_command(self, command: int):
+        """Execute a PA8.02 command."""
+        if self.alarm:
+            return
+            
+        if command & 0xFFF0 == 0x0010:
+            self._start_path(command & 0x000F)
+        elif command == 0x0020:
+            speed = self.registers[PARAMETER_ADDRESS['pr_home_speed_high']] or 60
+            self._start_move(0.0, speed, 'home')
+        elif command == 0x0021:
+            self._position = self._target = 0.0
+            self._homed = True
+            self.registers[PR_CONTROL_ADDRESS] = 0
+        elif command == 0x0040:
+            self._stop()
+            self.registers[PR_CONTROL_ADDRESS] = 0
+    
+    def _start_path(self, path_id: int):
+        """Start a PR path from the path table."""
+        base = PR_PATH_BASE + path_id * PR_PATH_SIZE
+        mode = self.registers[base]
+        position = _to_signed32(self.registers[base + 1], self.registers[base + 2])
+        reference = (mode >> 6) & 0x03
+        
+        if reference == 1:
+            target = self._target + position      # INC: relative to command
+        elif reference == 2:
+            target = self._position + position    # REL: relative to motor
+        else:
+            target = float(position)              # ABS
+            
+        self._pr_path = path_id
+        self._start_move(target, self.registers[base + 3] or 60, 'pr')
+        self.registers[PR_CONTROL_ADDRESS] = PR_STATE_RUNNING | path_id
+    
+    def _start_move(self, target: float, speed_rpm: int, kind: str):
+        self._target = target
+        self._velocity = speed_rpm * self.COUNTS_PER_REV / 60.0
+        if target < self._position:
+            self._velocity = -self._velocity
+        self._motion = kind
+        self._settle_until = 0.0
+        self.registers[PARAMETER_ADDRESS['pr_status']] &= ~0x0003 & 0xFFFF
+    
+    def _aux_command(self, command: int):
+        """Execute a PA0.25 auxiliary function."""
+        if command == 0x1111:
+            self.registers[CURRENT_ALARM_ADDRESS] = 0
+        elif command in (0x4001, 0x4002):
+            if self.alarm:
+                return
+            speed = self.registers[PARAMETER_ADDRESS['pr_jog_speed']]
+            self._velocity = speed * self.COUNTS_PER_REV / 60.0
+            if command == 0x4002:
+                self._velocity = -self._velocity
+            self._motion = 'jog'
+            self._jog_deadline = time.perf_counter() + self.config.jog_timeout
+        elif command == 0 and self._motion == 'jog':
+            self._stop()
+    
+    def _stop(self):
+        self._velocity = 0.0
+        self._motion = None
+        self._target = self._position
+    
+    def _update(self):
+        """Advance the motion model to the current time."""
+        now = time.perf_counter()
+        dt = now - self._last_update
+        self._last_update = now
+        
+        if self._motion == 'jog':
+            if now > self._jog_deadline:
+                dt -= now - self._jog_deadline
+                self._position += self._velocity * max(0.0, dt)
+                self._stop()
+            else:
+                self._position += self._velocity * dt
+                
+        elif self._motion in ('pr', 'home'):
+            step = self._velocity * dt
+            distance = abs(self._target - self._position)
+            if distance <= abs(step):
+                # Settling starts when the target was reached, not at this request
+                arrived = now - (abs(step) - distance) / abs(self._velocity) if step else now
+                self._position = self._target
+                if self._motion == 'home':
+                    self._homed = True
+                    self.registers[PARAMETER_ADDRESS['pr_status']] |= 0x0001
+                self._velocity = 0.0
+                self._motion = None
+                self._settle_until = arrived + self.config.settle_time
+                self.registers[PR_CONTROL_ADDRESS] = PR_STATE_SETTLING
+            else:
+                self._position += step
+                
+        if self._settle_until and now >= self._settle_until:
+            self._settle_until = 0.0
+            self.registers[PR_CONTROL_ADDRESS] = self._pr_path
+            self.registers[PARAMETER_ADDRESS['pr_status']] |= 0x0002
+    
+    def _refresh_status(self):
+        """Recompute the status registers from the motion model."""
+        regs = self.registers
+        position = int(round(self._position)) & 0xFFFFFFFF
+        target = int(round(self._target)) & 0xFFFFFFFF
+        rpm = int(round(self._velocity * 60.0 / self.COUNTS_PER_REV))
+        moving = self._motion is not None
+        alarm = self.alarm
+        
+        for name, value in (('command_position_cmd_unit', target),
+                            ('motor_position_cmd_unit', position),
+                            ('command_position', target),
+                            ('encoder_position', position),
+                            ('pr_current_position', position)):
+            address = PARAMETER_ADDRESS[name]
+            regs[address] = value >> 16
+            regs[address + 1] = value & 0xFFFF
+            
+        # PAB.25 (0x0B1E/0x0B1F) carries the alarm; alarm_code is its low word
+        regs[0x0B1E], regs[0x0B1F] = (alarm >> 16) & 0xFFFF, alarm & 0xFFFF
+        
+        regs[PARAMETER_ADDRESS['position_error']] = 0
+        regs[PARAMETER_ADDRESS['motor_speed']] = rpm & 0xFFFF
+        regs[PARAMETER_ADDRESS['torque_feedback']] = 30 if moving else 5
+        regs[PARAMETER_ADDRESS['pr_current_path']] = self._pr_path
+        
+        ready = not alarm
+        in_position = not moving and not self._settle_until
+        status = (ready and 0x0001) | (moving and 0x0002) | (bool(alarm) and 0x0004)
+        status |= (self._homed and 0x0008) | (in_position and 0x0010) | (moving and 0x0020)
+        regs[PARAMETER_ADDRESS['servo_status']] = status
+        
+        do_status = (ready and 0x0001) | (in_position and 0x0002) | (bool(alarm) and 0x0004)
+        do_status |= (moving and 0x0010)
+        regs[PARAMETER_ADDRESS['do_status']] = do_status
+
+
+Simulators = Union[L7Simulator, Iterable[L7Simulator]]
+
+
+def _slave_map(simulators: Simulators) -> Dict[int, L7Simulator]:
+    if isinstance(simulators, L7Simulator):
+        simulators = [simulators]
+    return {sim.slave_id: sim for sim in simulators}
+
+
+def _dispatch(slaves: Dict[int, L7Simulator], request: bytes) -> Tuple[Optional[bytes], float]:
+    """Send a request to its slave(s); return (response, turnaround delay)."""
+    if request[0] == 0:
+        for sim in slaves.values():
+            sim.process(request)
+        return None, 0.0
+    sim = slaves.get(request[0])
+    if sim is None:
+        return None, 0.0
+    return sim.process(request), sim.config.response_delay
+
+
+class _SimulatedPort:
+    """pyserial-like port object connected to simulated slaves."""
+    
+    def __init__(self, slaves: Dict[int, L7Simulator], baudrate: int, timeout: Optional[float],
+                 char_time: float, wire_timing: bool):
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.inter_byte_timeout: Optional[float] = None
+        self.is_open = True
+        self._slaves = slaves
+        self._char_time = char_time if wire_timing else 0.0
+        self._tx = bytearray()
+        self._rx = bytearray()
+        self._rx_ready: List[float] = []
+        self._line_free = 0.0
+    
+    def write(self, data: bytes) -> int:
+        now = time.perf_counter()
+        start = max(now, self._line_free)
+        self._line_free = start + len(data) * self._char_time
+        self._tx += data
+        
+        for request in split_requests(self._tx):
+            response, delay = _dispatch(self._slaves, request)
+            if response is None:
+                continue
+            begin = self._line_free + delay
+            self._rx += response
+            self._rx_ready.extend(
+                begin + (i + 1) * self._char_time for i in range(len(response))
+            )
+            self._line_free = self._rx_ready[-1]
+        return len(data)
+    
+    @property
+    def in_waiting(self) -> int:
+        return bisect_right(self._rx_ready, time.perf_counter())
+    
+    def read(self, size: int = 1) -> bytes:
+        deadline = None if self.timeout is None else time.perf_counter() + self.timeout
+        while True:
+            now = time.perf_counter()
+            ready = bisect_right(self._rx_ready, now)
+            # Line silent for inter_byte_timeout after the last byte
+            gap_end = None
+            if ready and self.inter_byte_timeout is not None:
+                gap_end = self._rx_ready[ready - 1] + self.inter_byte_timeout
+            if (ready >= size or (gap_end is not None and now >= gap_end)
+                    or (deadline is not None and now >= deadline)):
+                count = min(ready, size)
+                data = bytes(self._rx[:count])
+                del self._rx[:count]
+                del self._rx_ready[:count]
+                return data
+            wake = self._rx_ready[min(size, len(self._rx_ready)) - 1] if self._rx_ready else None
+            if wake is not None and wake <= now:
+                wake = None
+            for limit in (gap_end, deadline):
+                if limit is not None:
+                    wake = limit if wake is None else min(wake, limit)
+            time.sleep(max(0.0, wake - now) if wake is not None else 0.01)
+    
+    def flush(self):
+        pass
+    
+    def reset_input_buffer(self):
+        self._rx.clear()
+        self._rx_ready.clear()
+    
+    def reset_output_buffer(self):
+        self._tx.clear()
+    
+    def close(self):
+        self.is_open = False
+
+
+class SimulatorConnection(SerialConnection):
+    """
+    SerialConnection backed by in-process simulated slaves.
+    
+    Bytes are timed as on a real line at the configured baud rate, so
+    the normal locking and framing code runs unchanged.
+    
+    Parameters
+    ----------
+    simulators : Union[L7Simulator, Iterable[L7Simulator]]
+        Slaves on the simulated bus
+    baudrate : int
+        Simulated baud rate (default: 38400)
+    timeout : float
+        Read timeout in seconds (default: 1.0)
+    wire_timing : bool
+        Delay bytes by their transmission time at ``baudrate``
+    """
+    
+    def __init__(
+        self,
+        simulators: Simulators,
+        baudrate: int = DEFAULT_BAUDRATE,
+        timeout: float = DEFAULT_TIMEOUT,
+        wire_timing: bool = True,
+        **kwargs
+    ):
+        """Initialize simulated connection."""
+        super().__init__('sim://', baudrate, timeout, **kwargs)
+        self.slaves = _slave_map(simulators)
+        self.wire_timing = wire_timing
+    
+    def _open_port(self) -> _SimulatedPort:
+        return _SimulatedPort(
+            self.slaves, self.baudrate, self.timeout, self.char_time, self.wire_timing
+        )
+
+
+class SimulatorServer:
+    """
+    Simulated slaves behind a pseudo terminal.
+    
+    Programs open :attr:`port` like a serial device. Responses are
+    delayed by the slave turnaround and, with ``wire_timing``, by the
+    transmission time of request and response at ``baudrate``.
+    
+    Parameters
+    ----------
+    simulators : Union[L7Simulator, Iterable[L7Simulator]]
+        Slaves on the simulated bus
+    baudrate : int
+        Simulated baud rate (default: 38400)
+    wire_timing : bool
+        Delay responses by their transmission time at ``baudrate``
+    """
+    
+    def __init__(
+        self,
+        simulators: Simulators,
+        baudrate: int = DEFAULT_BAUDRATE,
+        wire_timing: bool = True
+    ):
+        """Initialize pty simulator server."""
+        self.slaves = _slave_map(simulators)
+        self.baudrate = baudrate
+        self.wire_timing = wire_timing
+        self.port: Optional[str] = None
+        
+        self._master: Optional[int] = None
+        self._slave_fd: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+    
+    @property
+    def char_time(self) -> float:
+        """Time to transmit one 8N1 character at the simulated baud rate."""
+        return 10.0 / self.baudrate if self.wire_timing else 0.0
+    
+    def start(self) -> str:
+        """
+        Open the pseudo terminal and start serving.
+        
+        Returns
+        -------
+        str
+            Device path of the pty (e.g. /dev/pts/3)
+        """
+        import pty
+        import tty
+        
+        if self._thread and self._thread.is_alive():
+            return self.port
+            
+        self._master, self._slave_fd = pty.openpty()
+        tty.setraw(self._master)
+        tty.setraw(self._slave_fd)
+        self.port = os.ttyname(self._slave_fd)
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        logger.info(f"L7 simulator listening on {self.port} (slaves {sorted(self.slaves)})")
+        return self.port
+    
+    def stop(self):
+        """Stop serving and close the pseudo terminal."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        for fd in (self._master, self._slave_fd):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave_fd = None
+    
+    def _serve(self):
+        """Read requests from the pty and answer them."""
+        buffer = bytearray()
+        while not self._stop_event.is_set():
+            readable, _, _ = select.select([self._master], [], [], 0.1)
+            if not readable:
+                continue
+            try:
+                buffer += os.read(self._master, 1024)
+            except OSError:
+                break
+                
+            for request in split_requests(buffer):
+                response, delay = _dispatch(self.slaves, request)
+                if response is None:
+                    continue
+                wait = delay + (len(request) + len(response)) * self.char_time
+                if wait > 0:
+                    time.sleep(wait)
+                os.write(self._master, response)
+    
+    def __enter__(self):
+        """Context manager entry."""
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point: serve simulated drives on a pty."""
+    parser = argparse.ArgumentParser(description="Virtual Leisai L7 servo on a pseudo terminal")
+    parser.add_argument('--slaves', type=int, nargs='+', default=[1], help="slave IDs")
+    parser.add_argument('--baudrate', type=int, default=DEFAULT_BAUDRATE)
+    parser.add_argument('--delay', type=float, default=0.001, help="slave turnaround (s)")
+    parser.add_argument('--drop', type=float, default=0.0, help="dropped response rate")
+    parser.add_argument('--crc-errors', type=float, default=0.0, help="corrupted response rate")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--no-wire-timing', action='store_true',
+                        help="answer without baud-rate transmission delays")
+    args = parser.parse_args(argv)
+    
+    simulators = [
+        L7Simulator(slave_id, SimulatorConfig(
+            response_delay=args.delay, drop_rate=args.drop,
+            crc_error_rate=args.crc_errors, seed=args.seed
+        ))
+        for slave_id in args.slaves
+    ]
+    server = SimulatorServer(simulators, args.baudrate, not args.no_wire_timing)
+    print(f"L7 simulator on {server.start()} (slaves {args.slaves}, {args.baudrate} baud)")
+    print("Press Ctrl+C to stop")
+    
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        
+    for sim in simulators:
+        print(f"slave {sim.slave_id}: {asdict(sim.stats)}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -51,6 +51,15 @@ setup(
     ],
     
     extras_require={
+        'speedups': [
+            'crcmod>=1.7',
+        ],
+        'asyncio': [
+            'pyserial-asyncio>=0.6',
+        ],
+        'scope': [
+            'numpy>=1.17',
+        ],
         'dev': [
             'pytest>=7.0',
             'pytest-cov>=4.0',
@@ -0,0 +1,24 @@
+"""
+Shared fixtures: simulated L7 drives served on a pseudo terminal.
+"""
+
+import sys
+
+import pytest
+
+from leisai.tools.simulator import L7Simulator, SimulatorServer
+
+
+@pytest.fixture
+def drive() -> L7Simulator:
+    """Simulated drive at slave ID 1."""
+    return L7Simulator(slave_id=1)
+
+
+@pytest.fixture
+def pty_port(drive):
+    """Device path of a pty with ``drive`` behind it."""
+    if sys.platform == 'win32':
+        pytest.skip("SimulatorServer needs a POSIX pseudo terminal")
+    with SimulatorServer(drive) as server:
+        yield server.port
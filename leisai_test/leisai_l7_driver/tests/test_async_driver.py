@@ -0,0 +1,130 @@
+"""
+AsyncL7Driver against a simulated drive on a pseudo terminal.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip('serial_asyncio')
+
+from leisai.core.async_driver import AsyncL7Driver
+from leisai.core.constants import AlarmCode, MAX_RETRIES, RETRY_DELAY
+from leisai.protocols.aio import AsyncSerialConnection
+
+
+def run(coro):
+    """Run a test scenario on a fresh event loop."""
+    return asyncio.run(coro)
+
+
+def test_connect(pty_port, drive):
+    async def scenario():
+        driver = AsyncL7Driver(pty_port)
+        assert await driver.connect()
+        assert driver.is_connected
+        assert await driver.get_temperature() == 35.0
+        await driver.disconnect()
+        assert not driver.is_connected
+    
+    run(scenario())
+    assert drive.stats.responses == 2
+
+
+def test_block_read_splits_around_missing_register(pty_port, drive):
+    """0x0B13 does not exist: the status block is split once, then read split."""
+    async def scenario():
+        async with AsyncL7Driver(pty_port) as driver:
+            first = await driver.get_status_snapshot()
+            rejected = drive.stats.exceptions
+            second = await driver.get_status_snapshot()
+            return driver._split_blocks, first, second, rejected
+    
+    split, first, second, rejected = run(scenario())
+    
+    assert rejected >= 1
+    assert drive.stats.exceptions == rejected
+    assert any(address <= 0x0B13 < address + count for address, count in split)
+    for status in (first, second):
+        assert None not in status.values()
+        assert status['bus_voltage'] == 3100
+        assert status['temperature'] == 350
+        assert status['alarm'] == 0
+
+
+def test_jog_keepalive(pty_port, drive):
+    """JOG keeps running past the drive's timeout until the keepalive stops."""
+    lapse = drive.config.jog_timeout * 3
+    
+    async def scenario():
+        async with AsyncL7Driver(pty_port) as driver:
+            assert await driver.jog(100)
+            await asyncio.sleep(lapse)
+            running = await driver.get_speed()
+            assert await driver.stop_jog()
+            stopped = await driver.get_speed()
+            
+            # Without the keepalive task the drive stops JOG by itself
+            assert await driver.jog(100)
+            await driver._cancel_jog()
+            await asyncio.sleep(lapse)
+            lapsed = await driver.get_speed()
+            return running, stopped, lapsed
+    
+    running, stopped, lapsed = run(scenario())
+    
+    assert running == 100
+    assert stopped == 0
+    assert lapsed == 0
+
+
+def test_monitor_callbacks(pty_port, drive):
+    alarm = AlarmCode.OVER_VOLTAGE.value
+    alarms, statuses = [], []
+    
+    async def scenario():
+        driver = AsyncL7Driver(pty_port)
+        driver.set_alarm_callback(alarms.append)
+        driver.set_status_callback(statuses.append)
+        
+        # Callbacks set before connect() start the monitor task
+        assert await driver.connect()
+        await asyncio.sleep(0.3)
+        drive.raise_alarm(alarm)
+        await asyncio.sleep(0.3)
+        await driver.disconnect()
+        return driver._monitor_task
+    
+    task = run(scenario())
+    
+    assert task is None
+    assert alarms == [0, alarm]
+    assert statuses
+    assert statuses[0]['alarm'] == 0
+    assert statuses[0]['bus_voltage'] == 3100
+
+
+def test_missing_slave_times_out(pty_port, drive):
+    timeout = 0.1
+    
+    async def scenario():
+        connection = AsyncSerialConnection(pty_port, timeout=timeout)
+        await connection.connect()
+        try:
+            missing = AsyncL7Driver(pty_port, slave_id=9, connection=connection)
+            start = time.monotonic()
+            connected = await missing.connect()
+            elapsed = time.monotonic() - start
+            
+            present = AsyncL7Driver(pty_port, slave_id=1, connection=connection)
+            return connected, elapsed, connection.is_connected, await present.connect()
+        finally:
+            await connection.disconnect()
+    
+    connected, elapsed, still_open, present = run(scenario())
+    
+    assert not connected
+    assert MAX_RETRIES * timeout <= elapsed < MAX_RETRIES * (timeout + RETRY_DELAY) + 0.5
+    assert still_open
+    assert present
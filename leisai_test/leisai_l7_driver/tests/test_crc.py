@@ -0,0 +1,43 @@
+"""
+Modbus CRC16 implementations agree on random frames.
+"""
+
+import pytest
+
+from leisai.protocols import modbus
+from leisai.tools.benchmark import random_frames
+
+
+@pytest.fixture(scope='module')
+def frames():
+    """Seeded random frames, plus the empty and single-byte edge cases."""
+    return [b'', b'\x00', b'\xff'] + random_frames(2000, min_length=1, max_length=256, seed=1234)
+
+
+def test_known_frame():
+    # Read 2 registers from 0x0B00 on slave 1: CRC bytes on the wire are C6 2F
+    assert modbus.calculate_crc16(bytes.fromhex('01030B000002')) == 0x2FC6
+
+
+def test_table_matches_bitwise(frames):
+    for frame in frames:
+        assert modbus._crc16_table(frame) == modbus._crc16_bitwise(frame), frame.hex()
+
+
+def test_calculate_crc16_matches_bitwise(frames):
+    for frame in frames:
+        assert modbus.calculate_crc16(frame) == modbus._crc16_bitwise(frame), frame.hex()
+
+
+def test_accepts_memoryview_and_bytearray(frames):
+    for frame in frames[:100]:
+        expected = modbus._crc16_bitwise(frame)
+        assert modbus.calculate_crc16(bytearray(frame)) == expected
+        assert modbus.calculate_crc16(memoryview(frame)) == expected
+
+
+def test_crcmod_matches_bitwise(frames):
+    crcmod = pytest.importorskip('crcmod.predefined')
+    native = crcmod.mkPredefinedCrcFun('modbus')
+    for frame in frames:
+        assert native(frame) == modbus._crc16_bitwise(frame), frame.hex()
@@ -0,0 +1,42 @@
+"""
+Split decisions for merged block reads.
+"""
+
+from leisai.core.exceptions import CommunicationError, ModbusError
+from leisai.core.planner import SplitBlocks, SPLIT_AFTER_FAILURES
+
+KEY = (0x0B00, 20)
+
+
+def test_illegal_address_splits_at_once():
+    blocks = SplitBlocks()
+    blocks.failed(KEY, ModbusError(0x02), halves_read=True)
+    assert KEY in blocks
+
+
+def test_glitch_does_not_split():
+    blocks = SplitBlocks()
+    blocks.failed(KEY, CommunicationError("CRC mismatch"), halves_read=True)
+    assert KEY not in blocks
+    
+    # A good merged read clears the failure streak
+    blocks.succeeded(KEY)
+    for _ in range(SPLIT_AFTER_FAILURES - 1):
+        blocks.failed(KEY, CommunicationError("timeout"), halves_read=True)
+    blocks.succeeded(KEY)
+    blocks.failed(KEY, CommunicationError("timeout"), halves_read=True)
+    assert KEY not in blocks
+
+
+def test_repeated_failures_split():
+    blocks = SplitBlocks()
+    for _ in range(SPLIT_AFTER_FAILURES):
+        blocks.failed(KEY, ModbusError(0x03), halves_read=True)
+    assert list(blocks) == [KEY]
+
+
+def test_unreadable_halves_do_not_count():
+    blocks = SplitBlocks()
+    for _ in range(SPLIT_AFTER_FAILURES * 2):
+        blocks.failed(KEY, CommunicationError("timeout"), halves_read=False)
+    assert KEY not in blocks
@@ -2,6 +2,7 @@
 极简PR触发工具（循环PR0→PR1→PR2）
  - 不做报警检测/模式切换/冗余校验
  - 直接通过寄存器0x6002触发PR与急停（等同串口调试助手帧）
+ - 轮询0x6002完成状态，上一段完成后立即触发下一段
 
 运行：
   自动循环触发 PR0 -> PR1 -> PR2 -> 重复
@@ -9,7 +10,7 @@
 """
 
 import time
-import sys
+import threading
 import msvcrt  # Windows 控制台按键检测
 from leisai_l7_driver.leisai.core.driver import L7Driver
 
@@ -35,43 +36,39 @@ def main():
             pass
         
         sequence = [0, 1]
-        idx = 0
-        while True:
-            # 检测按键：任意键急停退出
-            if msvcrt.kbhit():
-                _ = msvcrt.getch()
-                print("\n检测到按键，执行急停并退出...")
-                try:
-                    driver.stop_pr_motion()
-                except Exception:
-                    pass
-                break
+        runner = driver.pr_runner
+        stopped = threading.Event()
 
-            pr = sequence[idx % len(sequence)]
-            ok = driver.trigger_pr(pr)
-            
-            if ok:
+        # 按键监视线程：任意键立即急停并结束序列
+        def watch_keys():
+            while not stopped.is_set():
+                if msvcrt.kbhit():
+                    _ = msvcrt.getch()
+                    print("\n检测到按键，执行急停并退出...")
+                    try:
+                        runner.stop()
+                    except Exception:
+                        pass
+                    return
+                time.sleep(0.02)
+
+        def show(move):
+            if move.ok:
                 # 电机当前位置（指令单位）
                 motor_cmd_pos = driver.read_parameter('motor_position_cmd_unit')
                 motor_cmd_str = f"{motor_cmd_pos}" if motor_cmd_pos is not None else "读取失败"
-
-                # 读取PR路径配置的目标位置（指令单位），按文档：
-                # PR0 -> 0x6201/0x6202，PR1 -> 0x6209/0x620A
-                pr_target = driver.get_pr_configured_position(pr)
-                pr_target_str = f"{pr_target}" if pr_target is not None else "读取失败"
-
-                # 读取当前控制操作码（0x6002）
-                ctrl = driver.get_control_operation()
-                ctrl_str = f"0x{int(ctrl):04X}" if ctrl is not None else "读取失败"
-
-                print(f"触发PR{pr}: 成功 | 电机位置(指令单位): {motor_cmd_str} | PR配置目标(指令单位): {pr_target_str} | 控制操作: {ctrl_str}")
+                print(f"PR{move.path_id}: 完成 | 周期 {move.cycle_time * 1e3:.0f} ms "
+                      f"({move.polls} 次查询) | 电机位置(指令单位): {motor_cmd_str}")
             else:
-                print(f"触发PR{pr}: 失败")
-            
-            idx += 1
+                print(f"PR{move.path_id}: 失败 ({move.error})")
+
+        watcher = threading.Thread(target=watch_keys, daemon=True)
+        watcher.start()
 
-            # 小延时，避免过快触发
-            time.sleep(0.5)
+        # 上一段完成后立即触发下一段（轮询0x6002完成状态，不再固定延时）
+        report = driver.run_pr_sequence(sequence, repeat=0, on_move=show)
+        stopped.set()
+        print(report.summary())
     finally:
         try:
             driver.servo_off()